@@ -1,11 +1,17 @@
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from dateutil.relativedelta import relativedelta
 
+from django.db.models import Count, F
+from django.utils import timezone
 from django_filters import rest_framework as filters
+from django_filters.fields import MultipleChoiceField
 
 from apps.core.constants import LOADED_DAYS_IN_CALENDAR
 from apps.core.models import Gender
-from apps.psychologists.models import ProfilePsychologist, Theme, Approach
+from apps.psychologists import dictionaries
+from apps.psychologists.models import ProfilePsychologist
+from apps.psychologists.search import search_psychologists
+from apps.psychologists.selectors import annotate_nearest_slot
 from apps.session.models import Slot
 
 
@@ -26,10 +32,16 @@ class SlotFilter(filters.FilterSet):
         model = Slot
         fields = ("since",)
 
+    @staticmethod
+    def get_period(since: date) -> tuple[datetime, datetime]:
+        """Период календаря, начинающийся с даты since."""
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        return start, start + timedelta(days=LOADED_DAYS_IN_CALENDAR)
+
     def filter_dates(self, queryset, name, since):
-        until = since + timedelta(days=LOADED_DAYS_IN_CALENDAR)
+        start, until = self.get_period(since)
         return queryset.filter(
-            datetime_from__gte=since, datetime_from__lte=until
+            datetime_from__gte=start, datetime_from__lte=until
         )
 
 
@@ -54,24 +66,110 @@ def filter_property(queryset, value, field):
     return qs
 
 
+class TitleMultipleChoiceField(MultipleChoiceField):
+    """
+    Выбор названий справочника: название, неизвестное процессу,
+    проверяется по БД (TitleDictionary.get_ids).
+    """
+
+    def __init__(self, *args, dictionary, **kwargs):
+        self.dictionary = dictionary
+        super().__init__(*args, **kwargs)
+
+    def valid_value(self, value):
+        return super().valid_value(value) or self.dictionary.has_title(value)
+
+
+class TitleM2MFilter(filters.MultipleChoiceFilter):
+    """
+    Фильтр психологов по m2m-справочнику (темы, подходы).
+    Названия переводятся в id по кэшу справочника, отбор идет подзапросом
+    IN к промежуточной таблице без join-ов и дублей строк.
+    Режим match=all оставляет психологов со всеми выбранными значениями.
+    """
+
+    field_class = TitleMultipleChoiceField
+
+    def __init__(self, *args, dictionary, **kwargs):
+        self.dictionary = dictionary
+        kwargs.setdefault("choices", dictionary.choices)
+        kwargs["dictionary"] = dictionary
+        kwargs.setdefault("distinct", False)
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        ids = set(self.dictionary.get_ids(value))
+        field = qs.model._meta.get_field(self.field_name)
+        owner = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        rows = field.remote_field.through.objects.filter(
+            **{f"{target}__in": ids}
+        )
+        if self.parent.form.cleaned_data.get("match") == "all":
+            rows = (
+                rows.values(owner)
+                .annotate(matched=Count(target))
+                .filter(matched=len(ids))
+            )
+        return qs.filter(pk__in=rows.values(owner))
+
+
+class PsychoOrdering:
+    """Варианты сортировки каталога психологов."""
+
+    CHOICES = (
+        ("price", "Сначала дешевле"),
+        ("-price", "Сначала дороже"),
+        ("experience", "Сначала с меньшим опытом"),
+        ("-experience", "Сначала с большим опытом"),
+        ("nearest_slot", "Сначала с ближайшим свободным окном"),
+    )
+    FIELDS = {
+        "price": ("min_price",),
+        "-price": ("-min_price",),
+        "experience": ("-started_working",),
+        "-experience": ("started_working",),
+        "nearest_slot": (F("nearest_slot").asc(nulls_last=True),),
+    }
+
+
 class PsychoFilter(filters.FilterSet):
     gender = filters.ChoiceFilter(choices=Gender.choices)
-    themes = filters.ModelMultipleChoiceFilter(
-        field_name="themes__title",
-        to_field_name="title",
-        queryset=Theme.objects.all(),
+    themes = TitleM2MFilter(
+        field_name="themes", dictionary=dictionaries.themes
+    )
+    approaches = TitleM2MFilter(
+        field_name="approaches", dictionary=dictionaries.approaches
     )
-    approaches = filters.ModelMultipleChoiceFilter(
-        field_name="approaches__title",
-        to_field_name="title",
-        queryset=Approach.objects.all(),
+    match = filters.ChoiceFilter(
+        choices=(("any", "Любое из значений"), ("all", "Все значения")),
+        method="filter_match",
     )
     age = filters.RangeFilter(method="filter_age")
     experience = filters.RangeFilter(method="filter_experience")
+    price_min = filters.NumberFilter(field_name="min_price", lookup_expr="gte")
+    price_max = filters.NumberFilter(field_name="min_price", lookup_expr="lte")
+    search = filters.CharFilter(method="filter_search")
+    ordering = filters.ChoiceFilter(
+        choices=PsychoOrdering.CHOICES, method="filter_ordering"
+    )
 
     class Meta:
         model = ProfilePsychologist
-        fields = ("gender", "themes", "approaches", "age", "experience")
+        fields = (
+            "gender",
+            "themes",
+            "approaches",
+            "match",
+            "age",
+            "experience",
+            "price_min",
+            "price_max",
+            "search",
+            "ordering",
+        )
 
     def filter_age(self, queryset, name, value):
         if value:
@@ -82,3 +180,16 @@ class PsychoFilter(filters.FilterSet):
         if value:
             queryset = filter_property(queryset, value, "started_working")
         return queryset
+
+    def filter_match(self, queryset, name, value):
+        # режим учитывается в фильтрах themes и approaches
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        # сортировка по релевантности, если не задан параметр ordering
+        return search_psychologists(queryset, value.strip())
+
+    def filter_ordering(self, queryset, name, value):
+        if value == "nearest_slot":
+            queryset = annotate_nearest_slot(queryset)
+        return queryset.order_by(*PsychoOrdering.FIELDS[value], "id")
@@ -1,10 +1,173 @@
+import asyncio
+import hashlib
+import json
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
+from django.utils.cache import parse_etags
+from django.utils.decorators import classonlymethod
+from rest_framework import status
+from django_filters.utils import translate_validation
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
 
+from apps.core.constants import IDEMPOTENCY_KEY_TIMEOUT
 from apps.psychologists.models import ProfilePsychologist
 
 
+def is_not_modified(request, etag: str) -> bool:
+    """
+    Совпадает ли ETag с одним из If-None-Match: список через запятую,
+    '*' и слабое сравнение (префикс W/), как в django.utils.cache.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == etag for tag in etags)
+
+
+class RequestInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Запрос с этим ключом идемпотентности еще выполняется."
+    default_code = "request_in_progress"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "Ключ идемпотентности уже использован для запроса с другим телом."
+    )
+    default_code = "idempotency_key_reused"
+
+
 class PsychoBasedMixin:
     def get_psychologist(self):
         return get_object_or_404(
             ProfilePsychologist, id=self.kwargs.get('psychologist_id')
         )
+
+
+class IdempotentCreateMixin:
+    """
+    Повтор POST с тем же заголовком Idempotency-Key возвращает сохраненный
+    ответ первого успешного запроса без повторного создания объекта.
+    Повтор ключа с другим телом запроса отклоняется (422).
+    """
+
+    idempotency_header = 'Idempotency-Key'
+    idempotency_in_progress = 'in_progress'
+
+    def get_idempotency_cache_key(self, request, key):
+        return f'idempotency:{type(self).__name__}:{request.user.pk}:{key}'
+
+    @staticmethod
+    def get_request_hash(request):
+        body = json.dumps(request.data, sort_keys=True, default=str)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        cache_key = self.get_idempotency_cache_key(request, key)
+        cached = cache.get(cache_key)
+        if cached == self.idempotency_in_progress:
+            raise RequestInProgress()
+        request_hash = self.get_request_hash(request)
+        if cached is not None:
+            if cached['hash'] != request_hash:
+                raise IdempotencyKeyReused()
+            return Response(cached['data'], status=cached['status'])
+        if not cache.add(
+            cache_key, self.idempotency_in_progress, IDEMPOTENCY_KEY_TIMEOUT
+        ):
+            raise RequestInProgress()
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        cache.set(
+            cache_key,
+            {
+                'data': dict(response.data),
+                'status': response.status_code,
+                'hash': request_hash,
+            },
+            IDEMPOTENCY_KEY_TIMEOUT,
+        )
+        return response
+
+
+class DictionaryListMixin:
+    """
+    Список справочника из кэша процесса (apps.psychologists.dictionaries)
+    без запросов к БД. ETag - версия справочника: при совпадении
+    с If-None-Match ответ 304 без тела.
+    """
+
+    dictionary = None
+
+    def list(self, request, *args, **kwargs):
+        etag = self.dictionary.get_etag()
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if is_not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.get_queryset()
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        params = {
+            name: value
+            for name, value in filterset.form.cleaned_data.items()
+            if value not in (None, '')
+        }
+        return Response(self.dictionary.filter(**params), headers=headers)
+
+
+class AsyncAPIViewMixin:
+    """
+    Асинхронный dispatch для APIView и ViewSet под ASGI. Аутентификация,
+    права и синхронные обработчики выполняются через sync_to_async,
+    асинхронные обработчики (async def get) - в цикле событий.
+    """
+
+    @classonlymethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        # ViewSet не отмечает представление асинхронным сам
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            if not asyncio.iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
@@ -1,7 +1,69 @@
-from rest_framework.pagination import PageNumberPagination
+from collections import OrderedDict
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class CustomPagination(PageNumberPagination):
     page_query_param = 'page'
     page_size = 10
     page_size_query_param = 'limit'
+
+
+class CatalogCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по стабильной сортировке id: без COUNT и OFFSET,
+    стоимость глубоких страниц равна стоимости первой.
+    Общее количество считается только по запросу count=true.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'limit'
+    ordering = 'id'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = OrderedDict(
+                [('count', self.count)] + list(response.data.items())
+            )
+        return response
+
+
+class CatalogPagination(CustomPagination):
+    """
+    Пагинация каталога: постраничная по умолчанию, курсорная -
+    с параметром pagination=cursor или при переданном cursor.
+    В курсорном режиме сортировка каталога фиксирована по id.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_class = CatalogCursorPagination
+
+    def get_cursor_paginator(self, request):
+        cursor_class = self.cursor_class
+        params = request.query_params
+        has_cursor = cursor_class.cursor_query_param in params
+        if params.get(self.mode_query_param) == 'cursor' or has_cursor:
+            return cursor_class()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = self.get_cursor_paginator(request)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -311,3 +311,12 @@ class FullPsychoCardSerializer(ShortPsychoCardSerializer):
             many=True,
         )
         return serializer.data
+
+
+class PsychoCardProfileSerializer(FullPsychoCardSerializer):
+    """
+    Данные полной карточки психолога без слотов для кэширования:
+    слоты меняются часто и кэшируются отдельно.
+    """
+
+    slots = None
@@ -1,11 +1,20 @@
-from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from django.db.models import Q
+from django.conf import settings
 from django.utils import timezone
 from rest_framework import serializers
 
-from apps.session.models import Session, Slot
-from apps.session.services import create_session
+from apps.core.constants import MAX_BULK_SLOTS, MAX_SLOT_RULE_DAYS
+from apps.psychologists.models import ProfilePsychologist
+from apps.session.models import AvailabilityTemplate, Session, Slot
+from apps.session.selectors import get_overlapping_slots, get_template_slot
+from apps.session.services import (
+    SLOT_IN_PAST_ERROR,
+    SLOT_OVERLAP_ERROR,
+    create_session,
+    create_template,
+    expand_weekly_rule,
+)
 from apps.clients.models import Client
 
 
@@ -47,29 +56,147 @@ class SlotSerializer(serializers.ModelSerializer):
 
     def validate_datetime_from(self, start_time):
         user = self.context["request"].user
-        up_limit = start_time + timedelta(hours=1)
-        low_limit = start_time - timedelta(hours=1)
-        if Slot.objects.filter(
-            Q(datetime_from__lt=up_limit) & Q(datetime_from__gt=low_limit),
-            psychologist__user=user,
-        ).exists():
+        if get_overlapping_slots(user, start_time).exists():
+            raise serializers.ValidationError(SLOT_OVERLAP_ERROR)
+        if start_time < timezone.now():
+            raise serializers.ValidationError(SLOT_IN_PAST_ERROR)
+
+        return super().validate(start_time)
+
+
+class WeeklyRuleSerializer(serializers.Serializer):
+    """
+    Правило повторения слотов: дни недели (0 - пн) и время начала
+    в часовом поясе tz (по умолчанию - TIME_ZONE проекта, UTC).
+    """
+
+    since = serializers.DateField()
+    until = serializers.DateField()
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+    )
+    times = serializers.ListField(
+        child=serializers.TimeField(), allow_empty=False
+    )
+    tz = serializers.CharField(
+        default=settings.TIME_ZONE,
+        help_text="Часовой пояс времени начала, например Europe/Moscow.",
+    )
+
+    def validate_tz(self, value):
+        try:
+            return ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
             raise serializers.ValidationError(
-                "Окно записи пересекается с другими окнами специалиста."
+                f"Неизвестный часовой пояс '{value}'."
             )
-        if start_time < timezone.now():
+
+    def validate(self, attrs):
+        days = (attrs["until"] - attrs["since"]).days
+        if days < 0:
             raise serializers.ValidationError(
-                "Время начала сессии не может быть меньше текущего времени."
+                "Дата окончания правила раньше даты начала."
             )
+        if days > MAX_SLOT_RULE_DAYS:
+            raise serializers.ValidationError(
+                f"Правило можно задать не более чем на {MAX_SLOT_RULE_DAYS} "
+                "дней."
+            )
+        return attrs
 
-        return super().validate(start_time)
+
+class BulkSlotSerializer(serializers.Serializer):
+    """
+    Массовое создание слотов: список дат начала или правило повторения.
+    """
+
+    datetimes = serializers.ListField(
+        child=serializers.DateTimeField(), required=False, allow_empty=False
+    )
+    rule = WeeklyRuleSerializer(required=False)
+
+    def validate(self, attrs):
+        if ("datetimes" in attrs) == ("rule" in attrs):
+            raise serializers.ValidationError(
+                "Передайте либо список datetimes, либо правило rule."
+            )
+        if "rule" in attrs:
+            starts = expand_weekly_rule(**attrs["rule"])
+        else:
+            starts = attrs["datetimes"]
+        if not starts:
+            raise serializers.ValidationError(
+                "По правилу не получено ни одного окна записи."
+            )
+        if len(starts) > MAX_BULK_SLOTS:
+            raise serializers.ValidationError(
+                f"За один запрос можно создать не более {MAX_BULK_SLOTS} окон."
+            )
+        return {"starts": starts}
+
+
+class BulkSlotErrorSerializer(serializers.Serializer):
+    """Ошибка создания отдельного слота."""
+
+    datetime_from = serializers.DateTimeField()
+    error = serializers.CharField()
+
+
+class CreatedSlotSerializer(serializers.ModelSerializer):
+    """Новый слот без данных о сессии: у созданных окон их нет."""
+
+    class Meta:
+        fields = ("id", "date", "datetime_from", "datetime_to", "is_free")
+        model = Slot
+
+
+class BulkSlotResultSerializer(serializers.Serializer):
+    """Результат массового создания слотов."""
+
+    created = CreatedSlotSerializer(many=True)
+    errors = BulkSlotErrorSerializer(many=True)
+
+
+class AvailabilityTemplateSerializer(serializers.ModelSerializer):
+    """Сериализация шаблона окна записи психолога."""
+
+    class Meta:
+        fields = ("id", "weekday", "time_from", "valid_from", "valid_until")
+        model = AvailabilityTemplate
+
+    def validate(self, attrs):
+        valid_until = attrs.get("valid_until")
+        if valid_until is not None and valid_until < attrs["valid_from"]:
+            raise serializers.ValidationError(
+                "Дата окончания действия шаблона раньше даты начала."
+            )
+        return attrs
+
+    def create(self, validated_data):
+        return create_template(**validated_data)
 
 
 class CreateSessionSerializer(serializers.ModelSerializer):
-    """Сериализация данных при создании сессии."""
+    """
+    Сериализация данных при создании сессии. Запись на слот по шаблону
+    (без id) - по полям psychologist и datetime_from.
+    """
+
+    psychologist = serializers.PrimaryKeyRelatedField(
+        queryset=ProfilePsychologist.objects.all(),
+        required=False,
+        write_only=True,
+    )
+    datetime_from = serializers.DateTimeField(
+        required=False, write_only=True
+    )
 
     class Meta:
-        fields = ("id", "slot")
+        fields = ("id", "slot", "psychologist", "datetime_from")
         model = Session
+        # занятость слота проверяет create_session и отвечает 409
+        extra_kwargs = {"slot": {"required": False, "validators": []}}
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -82,10 +209,28 @@ class CreateSessionSerializer(serializers.ModelSerializer):
             )
         return slot
 
+    def validate_template_slot(self, attrs):
+        psychologist = attrs.pop("psychologist", None)
+        datetime_from = attrs.pop("datetime_from", None)
+        if "slot" in attrs:
+            return attrs
+        if psychologist is None or datetime_from is None:
+            raise serializers.ValidationError(
+                "Укажите слот или психолога и время начала сессии."
+            )
+        slot = get_template_slot(psychologist, datetime_from)
+        if slot is None:
+            raise serializers.ValidationError(
+                {"datetime_from": "Окно записи недоступно."}
+            )
+        attrs["slot"] = self.validate_slot(slot)
+        return attrs
+
     def validate(self, attrs):
+        attrs = self.validate_template_slot(attrs)
         user = self.context.get("request").user
         if user.client.sessions.filter(
-            slot__datetime_from__gte=timezone.now()
+            datetime_from__gte=timezone.now()
         ).exists():
             raise serializers.ValidationError(
                 "Вы можете иметь только 1 запланированную сессию."
@@ -1,34 +1,36 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .views import psychologist, psychologist_async
 from .views.clients import ClientView, CreateClientView
 from .views.custom_user import CustomUserViewSet
 from .views.psychologist import (
-    ApproacheViewSet,
     CreatePsychologistView,
-    FreeSlotsView,
-    InstituteViewSet,
-    PsychoCardCatalogView,
-    PsychoListCatalogView,
     PsychologistProfileView,
     ShortPsychoCardCatalogView,
-    ThemeViewSet,
     UploadFileView,
 )
 from .views.sessions import (
+    BulkCreateSlotView,
     CancelSessionView,
     CreateSessionView,
     DeleteSlotView,
+    DeleteTemplateView,
     ListCreateSlotView,
+    ListCreateTemplateView,
 )
 
+# под ASGI каталог и справочники обслуживают асинхронные представления
+views = psychologist_async if settings.ASYNC_VIEWS else psychologist
+
 router_v1 = DefaultRouter()
 router_v1.register("users", CustomUserViewSet, basename="users")
 
 router_v1_1 = DefaultRouter()
-router_v1_1.register("themes", ThemeViewSet)
-router_v1_1.register("approaches", ApproacheViewSet)
-router_v1_1.register("institutes", InstituteViewSet)
+router_v1_1.register("themes", views.ThemeViewSet)
+router_v1_1.register("approaches", views.ApproacheViewSet)
+router_v1_1.register("institutes", views.InstituteViewSet)
 
 
 urlpatterns = [
@@ -42,11 +44,26 @@ urlpatterns = [
         DeleteSlotView.as_view(),
         name="delete_slot",
     ),
+    path(
+        "auth/psychologists/slots/bulk/",
+        BulkCreateSlotView.as_view(),
+        name="bulk_create_slots",
+    ),
     path(
         "auth/psychologists/slots/",
         ListCreateSlotView.as_view(),
         name="add_and_list_psycho_slots",
     ),
+    path(
+        "auth/psychologists/templates/<int:pk>/",
+        DeleteTemplateView.as_view(),
+        name="delete_template",
+    ),
+    path(
+        "auth/psychologists/templates/",
+        ListCreateTemplateView.as_view(),
+        name="add_and_list_psycho_templates",
+    ),
     path(
         "auth/psychologists/me/",
         PsychologistProfileView.as_view(),
@@ -74,15 +91,19 @@ urlpatterns = [
     ),
     path(
         "psychologists/<uuid:id>/free_slots/",
-        FreeSlotsView.as_view(),
+        views.FreeSlotsView.as_view(),
         name="free_slots",
     ),
     path(
         "psychologists/<uuid:id>/",
-        PsychoCardCatalogView.as_view(),
+        views.PsychoCardCatalogView.as_view(),
         name="psycho_card",
     ),
-    path("psychologists/", PsychoListCatalogView.as_view(), name="catalog"),
+    path(
+        "psychologists/",
+        views.PsychoListCatalogView.as_view(),
+        name="catalog",
+    ),
     # Вспомогательные поинты
     path("file/upload/", UploadFileView.as_view(), name="file_upload"),
     path("", include(router_v1_1.urls)),
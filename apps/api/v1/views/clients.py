@@ -3,6 +3,8 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
 
+from apps.clients.selectors import get_cabinet_client
+
 from ..permissions import IsClientOnly
 from ..serializers.clients import (
     ClientSerializer,
@@ -35,4 +37,4 @@ class ClientView(generics.RetrieveUpdateAPIView):
     http_method_names = ["get", "patch"]
 
     def get_object(self):
-        return self.request.user.client
+        return get_cabinet_client(self.request.user)
@@ -10,7 +10,6 @@ from djoser.permissions import CurrentUserOrAdmin
 from djoser.compat import get_user_email
 from djoser import utils
 from djoser.serializers import (
-    UserCreateSerializer,
     ActivationSerializer,
     SendEmailResetSerializer,
     PasswordResetConfirmSerializer,
@@ -18,8 +17,11 @@ from djoser.serializers import (
 )
 from drf_yasg.utils import swagger_auto_schema
 
+from apps.api.v1.mixins import is_not_modified
 from apps.api.v1.serializers.custom_user import CustomUserMeSerializer
 from apps.core import email
+from apps.users import cache
+from apps.users.selectors import get_user_with_profile
 from config import settings
 
 User = get_user_model()
@@ -52,9 +54,21 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         serializer_class=CustomUserMeSerializer,
     )
     def me(self, request, *args, **kwargs):
-        """Общая информация о пользователе для формирования ЛК."""
-        serializer = self.get_serializer(request.user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        Общая информация о пользователе для формирования ЛК.
+        Ответ кэшируется до изменения пользователя или профиля;
+        при совпадении ETag с If-None-Match - 304 без тела.
+        """
+        me = cache.get_me(request.user.pk)
+        if me is None:
+            user = get_user_with_profile(request.user.pk)
+            me = cache.set_me(user.pk, self.get_serializer(user).data)
+        headers = {"ETag": me["etag"], "Cache-Control": "private, no-cache"}
+        if is_not_modified(request, me["etag"]):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        return Response(me["data"], status=status.HTTP_200_OK, headers=headers)
 
     @action(
         ["post"],
@@ -1,6 +1,7 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, parsers, status, views, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
@@ -10,14 +11,16 @@ from apps.api.v1.filters import (
     SlotFilter,
     TitleFilter,
 )
-from apps.api.v1.pagination import CustomPagination
+from apps.api.v1.mixins import DictionaryListMixin
+from apps.api.v1.pagination import CatalogPagination
 from apps.api.v1.permissions import IsPsychologistOnly
 from apps.api.v1.serializers import psychologist as psycho
 from apps.core.services import create_file
-from apps.psychologists import models
+from apps.psychologists import cache, dictionaries, models
 from apps.psychologists.selectors import (
     get_all_free_slots,
     get_all_verified_psychologists,
+    get_free_slots,
     get_psychologist,
     get_psychologist_for_card,
     get_psychologist_with_services,
@@ -26,6 +29,7 @@ from apps.psychologists.services import (
     create_psychologist,
     update_psychologist,
 )
+from apps.session.models import Slot
 
 
 class CreatePsychologistView(views.APIView):
@@ -55,7 +59,8 @@ class CreatePsychologistView(views.APIView):
         )
 
 
-class ThemeViewSet(viewsets.ReadOnlyModelViewSet):
+class ThemeViewSet(DictionaryListMixin, viewsets.ReadOnlyModelViewSet):
+    dictionary = dictionaries.themes
     queryset = models.Theme.objects.all()
     serializer_class = psycho.CommonInfoSerializer
     filter_backends = (DjangoFilterBackend,)
@@ -64,7 +69,8 @@ class ThemeViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
 
-class ApproacheViewSet(viewsets.ReadOnlyModelViewSet):
+class ApproacheViewSet(DictionaryListMixin, viewsets.ReadOnlyModelViewSet):
+    dictionary = dictionaries.approaches
     queryset = models.Approach.objects.all()
     serializer_class = psycho.CommonInfoSerializer
     filter_backends = (DjangoFilterBackend,)
@@ -73,7 +79,8 @@ class ApproacheViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
 
-class InstituteViewSet(viewsets.ReadOnlyModelViewSet):
+class InstituteViewSet(DictionaryListMixin, viewsets.ReadOnlyModelViewSet):
+    dictionary = dictionaries.institutes
     queryset = models.Institute.objects.all()
     serializer_class = psycho.InstituteSerializer
     permission_classes = (AllowAny,)
@@ -115,10 +122,9 @@ class PsychologistProfileView(views.APIView):
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        psychologist = update_psychologist(
-            psychologist,
-            serializer.validated_data
-        )
+        update_psychologist(psychologist, serializer.validated_data)
+        # перечитываем профиль: загруженное ранее образование устарело
+        psychologist = get_psychologist(request.user)
         return Response(
             psycho.PsychologistSerializer(
                 psychologist, context={"request": request, "view": self}
@@ -136,7 +142,7 @@ class PsychoListCatalogView(generics.ListAPIView):
     serializer_class = psycho.ShortPsychoCardSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = PsychoFilter
-    pagination_class = CustomPagination
+    pagination_class = CatalogPagination
 
     def get_queryset(self):
         return get_all_verified_psychologists()
@@ -144,21 +150,42 @@ class PsychoListCatalogView(generics.ListAPIView):
 
 class PsychoCardCatalogView(views.APIView):
     """
-    Отображение карточки психолога в каталоге
+    Отображение карточки психолога в каталоге.
+    Профиль и свободные слоты кэшируются раздельно: у слотов короткое
+    время жизни, их изменение не сбрасывает кэш профиля.
     """
 
     permission_classes = (AllowAny,)
 
     @swagger_auto_schema(responses={200: psycho.FullPsychoCardSerializer()})
     def get(self, request, id=None):
-        psychologist = get_psychologist_for_card(id)
-        return Response(
-            psycho.FullPsychoCardSerializer(
-                psychologist,
-                context={"request": request, "view": self},
-            ).data,
-            status=status.HTTP_200_OK,
-        )
+        psychologist = None
+        card = cache.get_card(id)
+        if card is None:
+            psychologist = get_psychologist_for_card(id)
+            card = self.cache_card(id, psychologist)
+
+        slots = cache.get_card_slots(id)
+        if slots is None:
+            slots = self.cache_slots(id, get_free_slots(psychologist or id))
+
+        return Response(self.get_data(card, slots), status=status.HTTP_200_OK)
+
+    def cache_card(self, id, psychologist) -> dict:
+        card = psycho.PsychoCardProfileSerializer(psychologist).data
+        cache.set_card(id, card)
+        return card
+
+    def cache_slots(self, id, slots) -> list:
+        data = psycho.SlotPsychoSerializer(slots, many=True).data
+        cache.set_card_slots(id, data)
+        return data
+
+    def get_data(self, card: dict, slots: list) -> dict:
+        data = dict(card, slots=slots)
+        if data["avatar"]:
+            data["avatar"] = self.request.build_absolute_uri(data["avatar"])
+        return data
 
 
 class ShortPsychoCardCatalogView(views.APIView):
@@ -184,14 +211,24 @@ class FreeSlotsView(generics.ListAPIView):
     """
     Список свободных слотов на странице создания сессии.
     Фильтр 'since=DD.MM.YYYY' отдает слоты в диапазоне 14 дней с даты.
+    Слоты по шаблонам психолога приходят без id: для записи на них
+    передается psychologist и datetime_from.
     """
 
     permission_classes = (AllowAny,)
     serializer_class = psycho.SlotPsychoSerializer
     filterset_class = SlotFilter
 
-    def get_queryset(self):
-        return get_all_free_slots(self.kwargs.get("id"))
+    def list(self, request, *args, **kwargs):
+        filterset = SlotFilter(
+            request.query_params, queryset=Slot.objects.none()
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        since = filterset.form.cleaned_data["since"]
+        start, until = SlotFilter.get_period(since)
+        slots = get_all_free_slots(self.kwargs.get("id"), start, until)
+        return Response(self.get_serializer(slots, many=True).data)
 
 
 class UploadFileView(views.APIView):
@@ -0,0 +1,119 @@
+"""
+Асинхронные представления каталога для запуска под ASGI (ASYNC_VIEWS).
+Независимые запросы к БД выполняются параллельно в потоках.
+"""
+import asyncio
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.api.v1.filters import SlotFilter
+from apps.api.v1.mixins import AsyncAPIViewMixin
+from apps.core.utils import in_thread
+from apps.psychologists import cache
+from apps.psychologists.selectors import (
+    aget_all_free_slots,
+    aget_free_slots,
+    aprefetch_free_slots,
+    get_psychologist_for_card,
+    get_verified_psychologists,
+)
+from apps.session.models import Slot
+
+from .psychologist import (
+    ApproacheViewSet,
+    FreeSlotsView,
+    InstituteViewSet,
+    PsychoCardCatalogView,
+    PsychoListCatalogView,
+    ThemeViewSet,
+)
+
+
+class AsyncPsychoListCatalogView(AsyncAPIViewMixin, PsychoListCatalogView):
+    """
+    Каталог психологов: страница выборки, затем слоты и шаблоны окон
+    записи страницы - параллельно.
+    """
+
+    def get_queryset(self):
+        return get_verified_psychologists()
+
+    def get_page(self) -> list:
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.paginate_queryset(queryset)
+
+    async def get(self, request, *args, **kwargs):
+        page = await in_thread(self.get_page)
+        await aprefetch_free_slots(page)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class AsyncPsychoCardCatalogView(AsyncAPIViewMixin, PsychoCardCatalogView):
+    """
+    Карточка психолога: профиль с образованием, слоты и шаблоны окон
+    записи читаются параллельно, если их нет в кэше.
+    """
+
+    async def get(self, request, id=None):
+        card, slots = await asyncio.gather(
+            in_thread(cache.get_card, id), in_thread(cache.get_card_slots, id)
+        )
+        psychologist, free_slots = await asyncio.gather(
+            self.load(card, get_psychologist_for_card, id, slots=False),
+            self.load(slots, aget_free_slots, id),
+        )
+        if card is None:
+            card = await in_thread(self.cache_card, id, psychologist)
+        if slots is None:
+            slots = await in_thread(self.cache_slots, id, free_slots)
+        return Response(self.get_data(card, slots), status=status.HTTP_200_OK)
+
+    @staticmethod
+    async def load(cached, func, *args, **kwargs):
+        """Загрузка из БД, только если данных нет в кэше."""
+        if cached is not None:
+            return None
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await in_thread(func, *args, **kwargs)
+
+
+class AsyncFreeSlotsView(AsyncAPIViewMixin, FreeSlotsView):
+    """Свободные слоты: проверка психолога, слоты и шаблоны - параллельно."""
+
+    async def get(self, request, *args, **kwargs):
+        filterset = SlotFilter(
+            request.query_params, queryset=Slot.objects.none()
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        since = filterset.form.cleaned_data["since"]
+        start, until = SlotFilter.get_period(since)
+        slots = await aget_all_free_slots(self.kwargs.get("id"), start, until)
+        return Response(self.get_serializer(slots, many=True).data)
+
+
+# справочники отдаются из памяти процесса: асинхронный dispatch лишь
+# выносит проверку версии в общем кэше из цикла событий
+class AsyncThemeViewSet(AsyncAPIViewMixin, ThemeViewSet):
+    pass
+
+
+class AsyncApproacheViewSet(AsyncAPIViewMixin, ApproacheViewSet):
+    pass
+
+
+class AsyncInstituteViewSet(AsyncAPIViewMixin, InstituteViewSet):
+    pass
+
+
+# имена синхронного модуля: urls выбирает модуль целиком по ASYNC_VIEWS
+PsychoListCatalogView = AsyncPsychoListCatalogView
+PsychoCardCatalogView = AsyncPsychoCardCatalogView
+FreeSlotsView = AsyncFreeSlotsView
+ThemeViewSet = AsyncThemeViewSet
+ApproacheViewSet = AsyncApproacheViewSet
+InstituteViewSet = AsyncInstituteViewSet
@@ -1,12 +1,27 @@
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status, views
 from rest_framework.response import Response
 
-from apps.session.selectors import get_all_slots_by_user
-from apps.session.services import cancel_session, delete_user_slot
+from apps.session.selectors import (
+    get_all_slots_by_user,
+    get_templates_by_user,
+)
+from apps.session.services import (
+    bulk_create_slots,
+    cancel_session,
+    delete_user_slot,
+)
 
 from ..filters import SlotFilter
+from ..mixins import IdempotentCreateMixin
 from ..permissions import IsClientOnly, IsParticipant, IsPsychologistOnly
-from ..serializers.sessions import CreateSessionSerializer, SlotSerializer
+from ..serializers.sessions import (
+    AvailabilityTemplateSerializer,
+    BulkSlotResultSerializer,
+    BulkSlotSerializer,
+    CreateSessionSerializer,
+    SlotSerializer,
+)
 
 
 class ListCreateSlotView(generics.ListCreateAPIView):
@@ -26,8 +41,68 @@ class ListCreateSlotView(generics.ListCreateAPIView):
         serializer.save(psychologist=self.request.user.psychologists)
 
 
+class BulkCreateSlotView(views.APIView):
+    """
+    Массовое создание слотов в ЛК психолога: список дат начала
+    или правило повторения по дням недели. Ошибки - по каждому окну.
+    """
+
+    permission_classes = (IsPsychologistOnly,)
+
+    @swagger_auto_schema(
+        request_body=BulkSlotSerializer(),
+        responses={201: BulkSlotResultSerializer(), 400: "Bad request"},
+    )
+    def post(self, request, format=None):
+        serializer = BulkSlotSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        slots, errors = bulk_create_slots(
+            request.user.psychologists, serializer.validated_data["starts"]
+        )
+        result = BulkSlotResultSerializer(
+            {"created": slots, "errors": errors},
+            context={"request": request, "view": self},
+        )
+        return Response(
+            result.data,
+            status=(
+                status.HTTP_201_CREATED if slots
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
+class ListCreateTemplateView(generics.ListCreateAPIView):
+    """
+    Создание и список шаблонов окон записи психолога в ЛК.
+    По шаблонам клиентам показываются свободные слоты без создания строк
+    в БД; слот сохраняется при записи клиента.
+    """
+
+    permission_classes = (IsPsychologistOnly,)
+    serializer_class = AvailabilityTemplateSerializer
+
+    def get_queryset(self):
+        return get_templates_by_user(self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(psychologist=self.request.user.psychologists)
+
+
+class DeleteTemplateView(generics.DestroyAPIView):
+    """Удаление шаблона окон записи. Записанные сессии сохраняются."""
+
+    permission_classes = (IsPsychologistOnly,)
+
+    def get_queryset(self):
+        return get_templates_by_user(self.request.user)
+
+
 class DeleteSlotView(views.APIView):
-    """Удаление слота из расписания в ЛК психолога."""
+    """
+    Удаление слота из расписания в ЛК психолога.
+    Слот, сохраненный по шаблону, после удаления снова строится по нему.
+    """
 
     permission_classes = (IsPsychologistOnly,)
 
@@ -36,8 +111,12 @@ class DeleteSlotView(views.APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CreateSessionView(generics.CreateAPIView):
-    """Создание сессии."""
+class CreateSessionView(IdempotentCreateMixin, generics.CreateAPIView):
+    """
+    Создание сессии. Занятый слот - ответ 409.
+    Повтор запроса с тем же заголовком Idempotency-Key возвращает
+    уже созданную сессию.
+    """
 
     permission_classes = (IsClientOnly,)
     serializer_class = CreateSessionSerializer
@@ -6,4 +6,5 @@ from .models import Client
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     list_display = ("user", "first_name", "last_name", "birthday")
+    readonly_fields = ("last_psychologist",)
     empty_value_display = "-пусто-"
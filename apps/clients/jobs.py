@@ -0,0 +1,12 @@
+from apps.core.email import ClientActivationEmail, send_email
+from apps.core.jobs import job
+from apps.users.models import CustomUser
+
+
+@job
+def send_client_activation_email(user_id: int, site: dict) -> None:
+    """Отправка письма клиенту для подтверждения электронной почты."""
+    user = CustomUser.objects.get(pk=user_id)
+    send_email(
+        ClientActivationEmail(context={"user": user, **site}), [user.email]
+    )
@@ -0,0 +1,37 @@
+# Generated by Django 4.1 on 2026-10-18 19:09
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_last_psychologist(apps, schema_editor):
+    Client = apps.get_model("clients", "Client")
+    Session = apps.get_model("session", "Session")
+    psychologists = (
+        Session.objects.filter(
+            client=OuterRef("pk"), slot__datetime_to__lte=timezone.now()
+        )
+        .order_by("-slot__datetime_from")
+        .values("slot__psychologist")[:1]
+    )
+    Client.objects.update(last_psychologist=Subquery(psychologists))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('psychologists', '0017_search_indexes'),
+        ('clients', '0003_remove_client_name_client_avatar_client_first_name_and_more'),
+        ('session', '0009_slot_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='last_psychologist',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='psychologists.profilepsychologist', verbose_name='Психолог последней сессии'),
+        ),
+        migrations.RunPython(fill_last_psychologist, migrations.RunPython.noop),
+    ]
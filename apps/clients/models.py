@@ -55,6 +55,16 @@ class Client(models.Model):
         blank=True,
         null=True,
     )
+    # денормализация: психолог последней завершенной сессии для ЛК,
+    # обновляется задачей очереди по окончании сессии
+    last_psychologist = models.ForeignKey(
+        "psychologists.ProfilePsychologist",
+        verbose_name="Психолог последней сессии",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
 
     class Meta:
         verbose_name = "Профиль клиента"
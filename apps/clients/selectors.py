@@ -1,4 +1,3 @@
-from django.db.models import Min, Value
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
@@ -14,6 +13,13 @@ def get_client(user: CustomUser) -> Client:
     return get_object_or_404(Client, user=user)
 
 
+def get_cabinet_client(user: CustomUser) -> Client:
+    """Профиль клиента для ЛК вместе с психологом последней сессии."""
+    return get_object_or_404(
+        Client.objects.select_related("last_psychologist"), user=user
+    )
+
+
 def get_next_session(client: Client) -> Session:
     """Возвращает ближайшую сессию клиента с допуском в 30 минут."""
     now = timezone.now()
@@ -23,26 +29,23 @@ def get_next_session(client: Client) -> Session:
     return (
         Session.objects.
         filter(
-            slot__datetime_from__gte=now,
+            datetime_from__gte=now,
             status=Session.Status.PAID,
             client=client,
         ).
-        order_by('slot__datetime_from').
+        order_by('datetime_from').
         select_related('slot', 'slot__psychologist').
         first()
     )
 
 
 def get_my_psychologist(client: Client) -> ProfilePsychologist:
-    """Возвращает психолога из последней прошедшей сессии."""
-    now = timezone.now()
-    return (
-        ProfilePsychologist.objects.
-        filter(slots__session__client=client, slots__datetime_from__lt=now).
-        order_by('slots__datetime_from').
-        annotate(
-            price=Min('services__price'),
-            duration=Value(SESSION_DURATION),
-        ).
-        last()
-    )
+    """
+    Возвращает психолога из последней завершенной сессии.
+    Без запросов к БД для клиента из get_cabinet_client.
+    """
+    psychologist = client.last_psychologist
+    if psychologist is not None:
+        psychologist.price = psychologist.min_price
+        psychologist.duration = SESSION_DURATION
+    return psychologist
@@ -1,10 +1,12 @@
 from django.db.transaction import atomic
 from django.http import HttpRequest
 
+from apps.core.email import get_site_context
+from apps.core.jobs import enqueue
 from apps.users.models import CustomUser
 
+from .jobs import send_client_activation_email
 from .models import Client
-from .threads import ClientActivationEmailThread
 
 
 def parse_data(data: dict) -> tuple[dict, dict]:
@@ -30,6 +32,10 @@ def create_client(
     user = CustomUser.objects.create_user(**user_data)
     client = Client.objects.create(user=user, **client_data)
 
-    ClientActivationEmailThread(request, user).start()
+    enqueue(
+        send_client_activation_email,
+        user_id=user.pk,
+        site=get_site_context(request),
+    )
 
     return client
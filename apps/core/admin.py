@@ -1,9 +1,26 @@
 from django.contrib import admin
+from django.utils import timezone
 
-from .models import UploadFile
+from .models import Job, UploadFile
 
 
 @admin.register(UploadFile)
 class UploadFileAdmin(admin.ModelAdmin):
     list_display = ('id', 'path')
     empty_value_display = '-пусто-'
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'run_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_at', 'locked_at', 'last_error')
+    actions = ('retry',)
+
+    @admin.action(description='Повторить выбранные задачи')
+    def retry(self, request, queryset):
+        queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.PENDING,
+            attempts=0,
+            run_at=timezone.now(),
+        )
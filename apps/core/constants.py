@@ -31,3 +31,33 @@ NON_PENALTY_PERIOD = 12
 # Количество дней для верхней границы выгрузки слотов
 # в каталоге психологов
 LOADED_DAYS_FOR_SLOTS = 7
+
+# Время хранения в кэше карточки психолога (без слотов), сек
+CARD_CACHE_TIMEOUT = 60 * 60
+
+# Время хранения в кэше свободных слотов карточки психолога, сек
+CARD_SLOTS_CACHE_TIMEOUT = 60
+
+# Время хранения в кэше общей информации о пользователе (/auth/users/me/), сек
+ME_CACHE_TIMEOUT = 60 * 60
+
+# Максимальное количество слотов в одном запросе на массовое создание
+MAX_BULK_SLOTS = 500
+
+# Максимальный период правила повторения слотов, дней
+MAX_SLOT_RULE_DAYS = 92
+
+# Время хранения результата запроса с заголовком Idempotency-Key, сек
+IDEMPOTENCY_KEY_TIMEOUT = 60 * 60 * 24
+
+# Максимальное количество попыток выполнения фоновой задачи
+JOB_MAX_ATTEMPTS = 5
+
+# Задержка перед повтором фоновой задачи (удваивается с каждой попыткой), сек
+JOB_RETRY_DELAY = 30
+
+# Время, после которого зависшая задача снова выдается исполнителю, сек
+JOB_LOCK_TIMEOUT = 60 * 10
+
+# Запас до истечения токена Zoom, после которого он запрашивается заново, сек
+ZOOM_TOKEN_LEEWAY = 60
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+
+# пулы процесса по алиасу БД; создаются при первом подключении,
+# то есть уже в процессе воркера, а не в мастере gunicorn до fork
+pools = {}
+pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Пул соединений процесса: одновременно выдано не больше max_size,
+    поток ждет освободившееся соединение до timeout секунд. Возвращенные
+    соединения хранятся (до max_size) и проверяются запросом, только если
+    простаивали дольше check_after секунд (None - без проверки).
+    """
+
+    def __init__(self, conn_params, max_size, timeout, check_after=None):
+        self.conn_params = conn_params
+        self.timeout = timeout
+        self.check_after = check_after
+        self._slots = threading.BoundedSemaphore(max_size)
+        # свободные соединения и время возврата; выдаются последние
+        # вернувшиеся, реже всего требующие проверки
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise psycopg2.OperationalError(
+                f"Нет свободного соединения в пуле за {self.timeout} с."
+            )
+        try:
+            return self._get_idle() or psycopg2.connect(**self.conn_params)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection) -> None:
+        try:
+            if not connection.closed and self._reset(connection):
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            else:
+                connection.close()
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Закрытие свободных соединений пула."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            connection.close()
+
+    def _get_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+            if connection.closed:
+                continue
+            idle = time.monotonic() - returned_at
+            if self.check_after is None or idle < self.check_after:
+                return connection
+            if ping(connection):
+                return connection
+            connection.close()
+
+    @staticmethod
+    def _reset(connection) -> bool:
+        """Откат незавершенной транзакции; False - соединение негодно."""
+        status = connection.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+
+def close_pools() -> None:
+    """
+    Закрытие и удаление пулов процесса: мастер gunicorn вызывает перед
+    fork, чтобы воркеры не унаследовали его соединения общими сокетами.
+    """
+    with pools_lock:
+        for pool in pools.values():
+            pool.close()
+        pools.clear()
+
+
+def ping(connection) -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if not connection.autocommit:
+            connection.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL с пулом соединений в памяти процесса для потоковых воркеров.
+    По окончании запроса соединение возвращается в пул, а не закрывается.
+    Одновременно открыто не больше POOL_MAX_SIZE (не меньше числа потоков
+    воркера), сверх него запрос ждет соединение до POOL_TIMEOUT секунд.
+    """
+
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        with pools_lock:
+            if self.alias not in pools:
+                settings_dict = self.settings_dict
+                pools[self.alias] = ConnectionPool(
+                    conn_params,
+                    settings_dict["POOL_MAX_SIZE"],
+                    settings_dict["POOL_TIMEOUT"],
+                    (
+                        settings_dict["POOL_CHECK_AFTER"]
+                        if settings_dict["CONN_HEALTH_CHECKS"]
+                        else None
+                    ),
+                )
+            return pools[self.alias]
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        connection = self.get_pool(conn_params).getconn()
+
+        # как в базовом классе: уровень изоляции и загрузка jsonb
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    @async_unsafe
+    def _close(self):
+        if self.connection is None:
+            return
+        # пул откатывает незавершенную транзакцию и закрывает
+        # соединение с потерянной связью
+        with self.wrap_database_errors:
+            pools[self.alias].putconn(self.connection)
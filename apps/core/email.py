@@ -1,11 +1,69 @@
+import smtplib
+import threading
+import time
+import weakref
+from typing import Iterable
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.mail import get_connection
+from django.http import HttpRequest
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.loader_tags import BlockNode
 from templated_mail.mail import BaseEmailMessage
 
 from .utils import encode_uid
 
 
-class ClientActivationEmail(BaseEmailMessage):
+def get_site_context(request: HttpRequest) -> dict:
+    """
+    Адрес сайта для писем, вычисленный по запросу так же, как в
+    BaseEmailMessage: фоновая задача выполняется уже без запроса.
+    """
+    site = get_current_site(request)
+    return {
+        "domain": getattr(settings, "DOMAIN", "") or site.domain,
+        "protocol": "https" if request.is_secure() else "http",
+        "site_name": getattr(settings, "SITE_NAME", "") or site.name,
+    }
+
+
+# скомпилированные шаблоны писем процесса: имя -> (шаблон, блоки)
+compiled_templates = {}
+
+
+def get_compiled_template(template_name: str):
+    """
+    Шаблон письма компилируется один раз на процесс; блоки subject,
+    text_body и html_body находятся заранее, а не обходом при каждой отправке.
+    """
+    compiled = compiled_templates.get(template_name)
+    if compiled is None:
+        template = get_template(template_name).template
+        blocks = {
+            BaseEmailMessage._node_map[node.name]: node
+            for node in template.nodelist.get_nodes_by_type(BlockNode)
+            if node.name in BaseEmailMessage._node_map
+        }
+        compiled = compiled_templates[template_name] = (template, blocks)
+    return compiled
+
+
+class CompiledEmailMessage(BaseEmailMessage):
+    """Письмо, при отправке которого меняется только контекст шаблона."""
+
+    def render(self):
+        template, blocks = get_compiled_template(self.template_name)
+        context = make_context(self.get_context_data(), request=self.request)
+        with context.bind_template(template):
+            for attr, node in blocks.items():
+                setattr(self, attr, node.render(context).strip())
+        self._attach_body()
+
+
+class ClientActivationEmail(CompiledEmailMessage):
     template_name = "email/client_activation.html"
 
     def get_context_data(self):
@@ -18,7 +76,7 @@ class ClientActivationEmail(BaseEmailMessage):
         return context
 
 
-class PsychoActivationEmail(BaseEmailMessage):
+class PsychoActivationEmail(CompiledEmailMessage):
     template_name = "email/psycho_activation.html"
 
     def get_context_data(self):
@@ -33,7 +91,7 @@ class PsychoActivationEmail(BaseEmailMessage):
         return context
 
 
-class PsychoConfirmationFormEmail(BaseEmailMessage):
+class PsychoConfirmationFormEmail(CompiledEmailMessage):
     template_name = "email/psycho_confirm_form.html"
 
     def get_context_data(self):
@@ -43,11 +101,11 @@ class PsychoConfirmationFormEmail(BaseEmailMessage):
         return context
 
 
-class ConfirmationEmail(BaseEmailMessage):
+class ConfirmationEmail(CompiledEmailMessage):
     template_name = "email/client_confirmation.html"
 
 
-class PasswordResetEmail(BaseEmailMessage):
+class PasswordResetEmail(CompiledEmailMessage):
     template_name = "email/password_reset_custom.html"
 
     def get_context_data(self):
@@ -60,21 +118,134 @@ class PasswordResetEmail(BaseEmailMessage):
         return context
 
 
-class PasswordChangedConfirmationEmail(BaseEmailMessage):
+class PasswordChangedConfirmationEmail(CompiledEmailMessage):
     template_name = "email/password_changed_confirm.html"
 
 
-class ClientSessionCancellationEmail(BaseEmailMessage):
+class ClientSessionCancellationEmail(CompiledEmailMessage):
     template_name = "email/session_cancelled_client.html"
 
 
-class PsychoSessionCancellationEmail(BaseEmailMessage):
+class PsychoSessionCancellationEmail(CompiledEmailMessage):
     template_name = "email/session_cancelled_psycho.html"
 
 
-class ClientNewSessionEmail(BaseEmailMessage):
+class ClientNewSessionEmail(CompiledEmailMessage):
     template_name = "email/session_created_client.html"
 
 
-class PsychoNewSessionEmail(BaseEmailMessage):
+class PsychoNewSessionEmail(CompiledEmailMessage):
     template_name = "email/session_created_psycho.html"
+
+
+class ClientSessionReminderEmail(CompiledEmailMessage):
+    template_name = "email/session_reminder_client.html"
+
+
+class PsychoSessionReminderEmail(CompiledEmailMessage):
+    template_name = "email/session_reminder_psycho.html"
+
+
+class MailConnection:
+    """Соединение потока с почтовым сервером и время его простоя."""
+
+    def __init__(self) -> None:
+        self.connection = None
+        self.last_used = 0.0
+        # отправляет только поток-владелец, закрывать может и другой
+        self.lock = threading.Lock()
+
+    def send(self, messages: Iterable[tuple[BaseEmailMessage, list]]) -> None:
+        with self.lock:
+            for message, to in messages:
+                try:
+                    self._send(message, to)
+                except smtplib.SMTPServerDisconnected:
+                    # сервер закрыл простаивавшее соединение
+                    self._close()
+                    self._send(message, to)
+
+    def close(self, idle: float = 0.0, blocking: bool = True) -> None:
+        """Закрытие соединения, простаивающего дольше idle секунд."""
+        if not self.lock.acquire(blocking=blocking):
+            return
+        try:
+            if time.monotonic() - self.last_used >= idle:
+                self._close()
+        finally:
+            self.lock.release()
+
+    def _send(self, message: BaseEmailMessage, to: list) -> None:
+        idle = time.monotonic() - self.last_used
+        if idle > settings.EMAIL_CONNECTION_REUSE:
+            self._close()
+        if self.connection is None:
+            self.connection = get_connection()
+            self.connection.open()
+        message.connection = self.connection
+        message.send(to=to)
+        self.last_used = time.monotonic()
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            finally:
+                self.connection = None
+
+
+class MailDispatcher:
+    """
+    Отправка писем через соединение потока с почтовым сервером: пачка писем
+    уходит за одно подключение, потоки исполнителя задач отправляют
+    параллельно. Соединение переиспользуется следующими отправками потока,
+    пока простаивает не дольше EMAIL_CONNECTION_REUSE; простаивающие
+    дольше закрывает close_idle.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def send(self, messages: Iterable[tuple[BaseEmailMessage, list]]) -> None:
+        """Отправка пар (письмо, получатели) одной пачкой."""
+        self._get_connection().send(messages)
+
+    def close_idle(self) -> None:
+        """
+        Закрытие соединений, простаивающих дольше окна переиспользования.
+        Занятые отправкой соединения пропускаются.
+        """
+        for connection in self._get_connections():
+            connection.close(settings.EMAIL_CONNECTION_REUSE, blocking=False)
+
+    def close(self) -> None:
+        for connection in self._get_connections():
+            connection.close()
+
+    def _get_connection(self) -> MailConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = MailConnection()
+            with self._lock:
+                self._connections.add(connection)
+        return connection
+
+    def _get_connections(self) -> list[MailConnection]:
+        with self._lock:
+            return list(self._connections)
+
+
+dispatcher = MailDispatcher()
+
+
+def preload_email_templates() -> None:
+    """Компиляция шаблонов всех писем при запуске процесса."""
+    for email_class in CompiledEmailMessage.__subclasses__():
+        get_compiled_template(email_class.template_name)
+
+
+def send_email(message: BaseEmailMessage, to: list) -> None:
+    """Отправка письма через соединение текущего потока."""
+    dispatcher.send([(message, to)])
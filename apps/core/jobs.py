@@ -0,0 +1,123 @@
+import json
+import logging
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.constants import (
+    JOB_LOCK_TIMEOUT,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY,
+)
+from apps.core.models import Job
+
+logger = logging.getLogger(__name__)
+
+registry: dict[str, Callable] = {}
+
+
+def job(func: Callable) -> Callable:
+    """
+    Регистрирует функцию как фоновую задачу.
+    Аргументы задачи хранятся в JSON, поэтому передаются id, а не объекты.
+    """
+    registry[get_job_name(func)] = func
+    return func
+
+
+def get_job_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__name__}"
+
+
+def enqueue(
+    func: Callable, run_at: Optional[datetime] = None, **payload
+) -> Optional[Job]:
+    """
+    Ставит задачу в очередь; строка создается в текущей транзакции и
+    становится видна исполнителю только после ее фиксации.
+    При JOBS_ALWAYS_EAGER задача к сроку выполняется сразу в этом же потоке.
+    """
+    name = get_job_name(func)
+    if name not in registry:
+        raise LookupError(f"Задача {name} не зарегистрирована.")
+    if settings.JOBS_ALWAYS_EAGER and (
+        run_at is None or run_at <= timezone.now()
+    ):
+        # аргументы проходят через JSON так же, как при записи в очередь
+        func(**json.loads(json.dumps(payload, cls=DjangoJSONEncoder)))
+        return None
+    return Job.objects.create(
+        name=name, payload=payload, run_at=run_at or timezone.now()
+    )
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(seconds=JOB_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim_jobs(limit: int) -> list[Job]:
+    """
+    Захват пачки задач к выполнению. SKIP LOCKED позволяет нескольким
+    исполнителям разбирать очередь, не блокируя друг друга.
+    Задачи упавшего исполнителя выдаются снова после JOB_LOCK_TIMEOUT.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=JOB_LOCK_TIMEOUT)
+    with transaction.atomic():
+        Job.objects.filter(
+            status=Job.Status.RUNNING,
+            locked_at__lt=stale,
+            attempts__gte=JOB_MAX_ATTEMPTS,
+        ).update(
+            status=Job.Status.DEAD,
+            locked_at=None,
+            last_error="Превышено время выполнения.",
+        )
+        due = Q(status=Job.Status.PENDING, run_at__lte=now)
+        stalled = Q(status=Job.Status.RUNNING, locked_at__lt=stale)
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(due | stalled)
+            .order_by("run_at")[:limit]
+        )
+        Job.objects.filter(pk__in=[item.pk for item in jobs]).update(
+            status=Job.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+    for item in jobs:
+        item.status = Job.Status.RUNNING
+        item.locked_at = now
+        item.attempts += 1
+    return jobs
+
+
+def run_job(item: Job) -> None:
+    """
+    Выполнение захваченной задачи. При ошибке задача возвращается в очередь
+    с задержкой, после JOB_MAX_ATTEMPTS попыток переходит в статус dead.
+    """
+    try:
+        func = registry.get(item.name)
+        if func is None:
+            raise LookupError(f"Задача {item.name} не зарегистрирована.")
+        func(**item.payload)
+    except Exception:
+        logger.exception("Ошибка фоновой задачи %s", item)
+        item.last_error = traceback.format_exc()
+        if item.attempts >= JOB_MAX_ATTEMPTS:
+            item.status = Job.Status.DEAD
+        else:
+            item.status = Job.Status.PENDING
+            item.run_at = timezone.now() + get_retry_delay(item.attempts)
+    else:
+        item.status = Job.Status.DONE
+    item.locked_at = None
+    item.save(update_fields=("status", "run_at", "locked_at", "last_error"))
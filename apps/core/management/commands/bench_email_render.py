@@ -0,0 +1,46 @@
+import time
+from datetime import date, time as time_
+
+from django.core.management.base import BaseCommand
+from templated_mail.mail import BaseEmailMessage
+
+from apps.core.email import ClientNewSessionEmail
+
+CONTEXT = {
+    "client_name": "Клиент",
+    "psycho_name": "Психолог",
+    "date": date(2030, 1, 1),
+    "time": time_(10, 0),
+    "domain": "sharewithme.site",
+    "protocol": "https",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга письма: поиск шаблона и блоков "
+        "на каждое письмо и скомпилированный шаблон со сменой контекста"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n", "--number", type=int, default=2000,
+            help="Количество писем в замере",
+        )
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        baseline = self.measure(number, BaseEmailMessage.render)
+        compiled = self.measure(number, ClientNewSessionEmail.render)
+        self.stdout.write(f"Поиск шаблона и блоков: {baseline:.1f} мкс")
+        self.stdout.write(f"Скомпилированный шаблон: {compiled:.1f} мкс")
+        self.stdout.write(
+            self.style.SUCCESS(f"Ускорение: {baseline / compiled:.2f}x")
+        )
+
+    def measure(self, number: int, render) -> float:
+        render(ClientNewSessionEmail(context=dict(CONTEXT)))
+        started = time.perf_counter()
+        for _ in range(number):
+            render(ClientNewSessionEmail(context=dict(CONTEXT)))
+        return (time.perf_counter() - started) / number * 1e6
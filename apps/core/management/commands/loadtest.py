@@ -0,0 +1,141 @@
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_URL = "http://localhost:8000/api/v1/psychologists/"
+# адрес, на котором запускается gunicorn при переборе конфигураций
+SWEEP_BIND = "127.0.0.1:8765"
+# ожидание запуска gunicorn, сек
+SWEEP_START_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный замер эндпоинта запущенного сервера: запросы в секунду "
+        "и перцентили времени ответа. Режимы соединений с БД сравниваются "
+        "запуском сервера с разными DB_CONN_MAX_AGE / DB_POOL, "
+        "конфигурации gunicorn - перебором --gunicorn"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=DEFAULT_URL)
+        parser.add_argument(
+            "-n", "--requests", type=int, default=1000,
+            help="Количество запросов в замере",
+        )
+        parser.add_argument(
+            "-c", "--concurrency", type=int, default=10,
+            help="Количество одновременных клиентов",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=50,
+            help="Запросы для прогрева перед замером",
+        )
+        parser.add_argument(
+            "--gunicorn",
+            help=(
+                "Перебор конфигураций gunicorn (config/gunicorn.conf.py) "
+                "в формате воркеры:потоки через запятую, например 3:1,3:4; "
+                "сервер запускается локально для каждой из них"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.local = threading.local()
+        if options["gunicorn"]:
+            return self.sweep(options)
+        self.url = options["url"]
+        rps, p50, p99, errors = self.run(options)
+        self.stdout.write(f"Запросов в секунду: {rps:.1f}")
+        self.stdout.write(f"p50: {p50:.1f} мс")
+        self.stdout.write(f"p99: {p99:.1f} мс")
+        style = self.style.ERROR if errors else self.style.SUCCESS
+        self.stdout.write(style(f"Ошибок: {errors}"))
+
+    def run(self, options) -> tuple[float, float, float, int]:
+        """Прогрев и замер: запросы в секунду, p50 и p99 в мс, ошибки."""
+        self.measure(options["warmup"], options["concurrency"])
+        rps, timings, errors = self.measure(
+            options["requests"], options["concurrency"]
+        )
+        if not timings:
+            raise CommandError(f"Нет успешных ответов от {self.url}")
+        percentiles = statistics.quantiles(timings, n=100)
+        return rps, percentiles[49] * 1000, percentiles[98] * 1000, errors
+
+    def sweep(self, options):
+        path = urlsplit(options["url"]).path
+        self.url = f"http://{SWEEP_BIND}{path}"
+        self.stdout.write("воркеры:потоки  rps  p50, мс  p99, мс  ошибки")
+        for config in options["gunicorn"].split(","):
+            workers, threads = config.split(":")
+            server = self.start_gunicorn(workers, threads)
+            try:
+                rps, p50, p99, errors = self.run(options)
+            finally:
+                server.terminate()
+                server.wait()
+            self.stdout.write(
+                f"{config:>14}  {rps:.1f}  {p50:.1f}  {p99:.1f}  {errors}"
+            )
+
+    def start_gunicorn(self, workers: str, threads: str) -> subprocess.Popen:
+        env = dict(
+            os.environ,
+            GUNICORN_BIND=SWEEP_BIND,
+            GUNICORN_WORKERS=workers,
+            GUNICORN_THREADS=threads,
+            GUNICORN_ACCESS_LOG="/dev/null",
+        )
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn",
+                "-c", str(settings.BASE_DIR / "config" / "gunicorn.conf.py"),
+                "config.wsgi:application",
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + SWEEP_START_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                requests.get(self.url, timeout=1)
+                return server
+            except requests.RequestException:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("gunicorn не запустился")
+
+    def measure(
+        self, number: int, concurrency: int
+    ) -> tuple[float, list[float], int]:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self.request, range(number)))
+        elapsed = time.perf_counter() - started
+        timings = [timing for timing in results if timing is not None]
+        return number / elapsed, timings, number - len(timings)
+
+    def request(self, _) -> Optional[float]:
+        # keep-alive соединение на поток клиента
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = self.local.session.get(self.url, timeout=30)
+        except requests.RequestException:
+            return None
+        if not response.ok:
+            return None
+        return time.perf_counter() - started
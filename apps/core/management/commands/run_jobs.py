@@ -0,0 +1,83 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils.module_loading import autodiscover_modules
+
+from apps.core.email import dispatcher
+from apps.core.jobs import claim_jobs, run_job
+from apps.core.models import Job
+
+
+class Command(BaseCommand):
+    help = "Исполнитель фоновых задач из очереди в БД"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOBS_CONCURRENCY,
+            help="Количество задач, выполняемых одновременно",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Пауза между опросами пустой очереди, сек",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить задачи к сроку и завершить работу",
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules("jobs")
+        self.stopped = False
+        handlers = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            processed = self.work(
+                options["concurrency"], options["sleep"], options["once"]
+            )
+        finally:
+            dispatcher.close()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(
+            self.style.SUCCESS(f"Обработано задач: {processed}")
+        )
+
+    def work(self, concurrency: int, sleep: float, once: bool) -> int:
+        processed = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while not self.stopped:
+                # соединения потоков с почтой не переживают окно простоя
+                dispatcher.close_idle()
+                jobs = claim_jobs(concurrency)
+                if not jobs:
+                    if once:
+                        break
+                    time.sleep(sleep)
+                    continue
+                # пачка дорабатывается целиком и при остановке
+                list(executor.map(self.run, jobs))
+                processed += len(jobs)
+        return processed
+
+    def run(self, job: Job) -> None:
+        # как запрос в Django: соединение потока с БД переиспользуется
+        # в пределах CONN_MAX_AGE, оборванное или устаревшее закрывается
+        close_old_connections()
+        try:
+            run_job(job)
+        finally:
+            close_old_connections()
+
+    def stop(self, signum, frame):
+        self.stopped = True
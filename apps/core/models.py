@@ -1,6 +1,8 @@
 import uuid
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 
 class Gender(models.TextChoices):
@@ -29,3 +31,74 @@ class UploadFile(models.Model):
     class Meta:
         verbose_name = 'Документ'
         verbose_name_plural = 'Документы'
+
+
+class Job(models.Model):
+    """
+    Фоновая задача (письма, встречи Zoom) в очереди на базе БД.
+    Выполняется командой run_jobs; при ошибке повторяется с задержкой,
+    после исчерпания попыток остается в статусе dead.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'в очереди'
+        RUNNING = 'running', 'выполняется'
+        DONE = 'done', 'выполнена'
+        DEAD = 'dead', 'не выполнена'
+
+    name = models.CharField(
+        verbose_name='Задача',
+        max_length=100,
+    )
+    payload = models.JSONField(
+        verbose_name='Аргументы',
+        default=dict,
+        encoder=DjangoJSONEncoder,
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0,
+    )
+    run_at = models.DateTimeField(
+        verbose_name='Время запуска',
+        default=timezone.now,
+    )
+    locked_at = models.DateTimeField(
+        verbose_name='Время захвата исполнителем',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Время создания',
+        auto_now_add=True,
+    )
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            models.Index(
+                fields=('run_at',),
+                name='core_job_pending_index',
+                condition=models.Q(status='pending'),
+            ),
+            # зависшие задачи ищутся только среди выполняемых
+            models.Index(
+                fields=('locked_at',),
+                name='core_job_running_index',
+                condition=models.Q(status='running'),
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
@@ -1,6 +1,40 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.db import close_old_connections
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_encode
 
+# кэши, содержимое которых не видно другим процессам
+PROCESS_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
 
 def encode_uid(pk):
     return force_str(urlsafe_base64_encode(force_bytes(pk)))
+
+
+async def in_thread(func, *args, **kwargs):
+    """
+    Синхронный вызов (запрос к БД) в отдельном потоке: независимые запросы
+    асинхронного представления выполняются параллельно. Соединение потока
+    с БД закрывается по правилам CONN_MAX_AGE, как по окончании запроса.
+    """
+
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+def is_shared_cache(alias: str = DEFAULT_CACHE_ALIAS) -> bool:
+    """
+    Общий ли кэш для процессов: версии справочников, сброс кэша карточек,
+    ключи идемпотентности и отзыв токенов видны всем воркерам только в нем.
+    """
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_CACHE_BACKENDS
@@ -1,64 +1,129 @@
-import requests
+import threading
+import time
 from http import HTTPStatus
 from datetime import datetime
+from typing import Optional
 
+import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from rest_framework.exceptions import APIException
 
-from apps.core.constants import SESSION_DURATION
+from apps.core.constants import SESSION_DURATION, ZOOM_TOKEN_LEEWAY
+
+
+class ZoomClient:
+    """
+    Клиент API Zoom. Токен кэшируется до момента незадолго до истечения
+    и общий для всех потоков; запросы идут через пул keep-alive соединений.
+    """
+
+    def __init__(
+        self,
+        auth_url: Optional[str] = None,
+        api_url: Optional[str] = None,
+        timeout: Optional[tuple[float, float]] = None,
+    ) -> None:
+        self.auth_url = auth_url or settings.ZOOM_AUTH_URL
+        self.api_url = api_url or settings.ZOOM_API_URL
+        self.timeout = timeout or (
+            settings.ZOOM_CONNECT_TIMEOUT,
+            settings.ZOOM_READ_TIMEOUT,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.ZOOM_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self) -> str:
+        """Получение zoom-токена из кэша или от сервера авторизации."""
+        with self._lock:
+            if self._token is None or time.monotonic() >= self._expires_at:
+                self._token, expires_in = self._fetch_token()
+                self._expires_at = (
+                    time.monotonic() + expires_in - ZOOM_TOKEN_LEEWAY
+                )
+            return self._token
+
+    def reset_token(self) -> None:
+        with self._lock:
+            self._token = None
+
+    def _fetch_token(self) -> tuple[str, int]:
+        data = {
+            "grant_type": "account_credentials",
+            "account_id": settings.ZOOM_ACCOUNT_ID,
+            "client_secret": settings.ZOOM_CLIENT_SECRET,
+        }
+        response = self._post(
+            self.auth_url,
+            auth=(settings.ZOOM_CLIENT_ID, settings.ZOOM_CLIENT_SECRET),
+            data=data,
+        )
+
+        if response.status_code != HTTPStatus.OK:
+            raise APIException("Нет доступа к API Zoom.")
+
+        response_data = response.json()
+        return response_data["access_token"], response_data["expires_in"]
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        try:
+            return self.session.post(url, timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            raise APIException("API Zoom недоступен.")
+
+    def create_meeting(
+        self, start_time: datetime, duration: int = SESSION_DURATION
+    ) -> tuple[str, str]:
+        """
+        Создание встречи Zoom. Возвращает 2 ссылки: для клиента и психолога.
+        Отозванный раньше срока токен запрашивается заново один раз.
+        """
+        payload = {
+            "topic": 'Сеанс психолога',
+            "duration": duration,
+            'start_time': start_time.strftime('%Y-%m-%dT%H:%M:00Z'),
+            "type": 2,
+        }
+
+        for _ in range(2):
+            response = self._post(
+                f"{self.api_url}/users/me/meetings",
+                headers={"Authorization": f"Bearer {self.get_token()}"},
+                json=payload,
+            )
+            if response.status_code != HTTPStatus.UNAUTHORIZED:
+                break
+            self.reset_token()
+
+        if response.status_code != HTTPStatus.CREATED:
+            raise APIException('Zoom не смог сформировать ссылку на встречу')
+
+        response_data = response.json()
 
-AUTH_TOKEN_URL = "https://zoom.us/oauth/token"
-API_BASE_URL = "https://api.zoom.us/v2"
+        client_url = response_data["join_url"]
+        psychologist_url = response_data["start_url"]
+        return client_url, psychologist_url
 
 
-def get_token() -> str:
-    """Получение zoom-токена."""
-    data = {
-        "grant_type": "account_credentials",
-        "account_id": settings.ZOOM_ACCOUNT_ID,
-        "client_secret": settings.ZOOM_CLIENT_SECRET,
-    }
-    response = requests.post(
-        url=AUTH_TOKEN_URL,
-        auth=(settings.ZOOM_CLIENT_ID, settings.ZOOM_CLIENT_SECRET),
-        data=data
-    )
+_client = None
+_client_lock = threading.Lock()
 
-    if response.status_code != HTTPStatus.OK:
-        raise APIException("Нет доступа к API Zoom.")
 
-    response_data = response.json()
-    return response_data["access_token"]
+def get_client() -> ZoomClient:
+    """Общий для процесса клиент Zoom."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ZoomClient()
+        return _client
 
 
 def create_meeting(start_time: datetime,
                    duration: int = SESSION_DURATION) -> tuple[str, str]:
     """Создание встречи Zoom. Возвращает 2 ссылки: для клиента и психолога."""
-    access_token = get_token()
-
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "topic": 'Сеанс психолога',
-        "duration": duration,
-        'start_time': start_time.strftime('%Y-%m-%dT%H:%M:00Z'),
-        "type": 2,
-    }
-
-    response = requests.post(
-        url=f"{API_BASE_URL}/users/me/meetings",
-        headers=headers,
-        json=payload,
-    )
-
-    if response.status_code != HTTPStatus.CREATED:
-        raise APIException('Zoom не смог сформировать ссылку на встречу')
-
-    response_data = response.json()
-
-    client_url = response_data["join_url"]
-    psychologist_url = response_data["start_url"]
-    return client_url, psychologist_url
+    return get_client().create_meeting(start_time, duration)
@@ -1,13 +1,14 @@
 from django.contrib import admin
 
 from apps.psychologists import models
+from apps.psychologists.services import update_min_price
 
 
 @admin.register(models.Institute)
 class InstituteAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "is_higher")
     empty_value_display = "-пусто-"
-    search_fields = ("title__startswith",)
+    search_fields = ("title",)
 
 
 @admin.register(models.Theme)
@@ -17,7 +18,7 @@ class ThemeAdmin(admin.ModelAdmin):
         "title",
     )
     empty_value_display = "-пусто-"
-    search_fields = ("title__startswith",)
+    search_fields = ("title",)
 
 
 @admin.register(models.Approach)
@@ -27,7 +28,7 @@ class ApproachAdmin(admin.ModelAdmin):
         "title",
     )
     empty_value_display = "-пусто-"
-    search_fields = ("title__startswith",)
+    search_fields = ("title",)
 
 
 class PsychoEducationInline(admin.TabularInline):
@@ -73,7 +74,7 @@ class ProfilePsychologistAdmin(admin.ModelAdmin):
     )
     empty_value_display = "-пусто-"
     list_filter = ("is_verified",)
-    search_fields = ("last_name__startswith", "user__email__icontains")
+    search_fields = ("last_name", "user__email")
     actions = ("send_activation_email",)
     autocomplete_fields = ("themes", "approaches")
 
@@ -82,3 +83,7 @@ class ProfilePsychologistAdmin(admin.ModelAdmin):
             obj.save(update_fields=["is_verified"])
         else:
             obj.save()
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        update_min_price(form.instance)
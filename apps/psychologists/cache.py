@@ -0,0 +1,40 @@
+from typing import Optional
+
+from django.core.cache import cache
+
+from apps.core.constants import CARD_CACHE_TIMEOUT, CARD_SLOTS_CACHE_TIMEOUT
+
+CARD_KEY = "psycho_card:{}"
+CARD_SLOTS_KEY = "psycho_card_slots:{}"
+
+
+def get_card(psychologist_id) -> Optional[dict]:
+    """Данные карточки психолога без слотов."""
+    return cache.get(CARD_KEY.format(psychologist_id))
+
+
+def set_card(psychologist_id, data: dict) -> None:
+    cache.set(CARD_KEY.format(psychologist_id), data, CARD_CACHE_TIMEOUT)
+
+
+def get_card_slots(psychologist_id) -> Optional[list]:
+    """Свободные слоты карточки психолога."""
+    return cache.get(CARD_SLOTS_KEY.format(psychologist_id))
+
+
+def set_card_slots(psychologist_id, data: list) -> None:
+    cache.set(
+        CARD_SLOTS_KEY.format(psychologist_id), data, CARD_SLOTS_CACHE_TIMEOUT
+    )
+
+
+def invalidate_card(psychologist_id) -> None:
+    cache.delete(CARD_KEY.format(psychologist_id))
+
+
+def invalidate_cards(psychologist_ids) -> None:
+    cache.delete_many([CARD_KEY.format(pk) for pk in psychologist_ids])
+
+
+def invalidate_card_slots(psychologist_id) -> None:
+    cache.delete(CARD_SLOTS_KEY.format(psychologist_id))
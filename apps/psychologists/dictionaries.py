@@ -0,0 +1,112 @@
+from typing import Optional
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.psychologists.models import Approach, Institute, Theme
+
+VERSION_KEY = "dictionary_version:{}"
+
+
+class TitleDictionary:
+    """
+    Справочник title <-> id, закэшированный в памяти процесса.
+    Версия справочника хранится в общем кэше и меняется сигналами при
+    изменении записей: процесс перечитывает справочник, увидев новую версию.
+    """
+
+    def __init__(self, model, fields: tuple[str, ...] = ("id", "title")):
+        self.model = model
+        self.fields = fields
+        self.version_key = VERSION_KEY.format(model._meta.label_lower)
+        self._version = None
+        self._rows = None
+        self._ids = None
+        self._titles = None
+
+    def __deepcopy__(self, memo):
+        # фильтры копируются для каждого запроса, кэш должен быть общим
+        return self
+
+    def get_version(self) -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def refresh(self) -> None:
+        """Перечитывает справочник, если в общем кэше новая версия."""
+        version = self.get_version()
+        if version == self._version:
+            return
+        rows = list(self.model.objects.order_by("id").values(*self.fields))
+        self._ids = {row["title"]: row["id"] for row in rows}
+        self._titles = {row["id"]: row["title"] for row in rows}
+        self._rows = rows
+        self._version = version
+
+    def invalidate(self) -> None:
+        # повтор после фиксации транзакции: процесс, перечитавший
+        # справочник до нее, не останется со старыми данными
+        self._bump()
+        transaction.on_commit(self._bump)
+
+    def _bump(self) -> None:
+        self._version = None
+        cache.set(self.version_key, uuid4().hex, None)
+
+    def load(self) -> dict[str, int]:
+        self.refresh()
+        return self._ids
+
+    def titles(self) -> dict[int, str]:
+        self.refresh()
+        return self._titles
+
+    def reload(self) -> None:
+        """Перечитывает справочник независимо от версии в кэше."""
+        self._version = None
+        self.refresh()
+
+    def get_ids(self, titles) -> list[int]:
+        """
+        id по названиям. Названия, которых нет в памяти процесса, ищутся
+        в БД по уникальному индексу: новая версия могла до процесса
+        не дойти (кэш не общий, запись вытеснена). Справочник перечитывается
+        целиком, только если название нашлось.
+        """
+        titles = list(titles)
+        ids = self.load()
+        missing = {title for title in titles if title not in ids}
+        if missing and self.model.objects.filter(title__in=missing).exists():
+            self.reload()
+            ids = self._ids
+        return [ids[title] for title in titles if title in ids]
+
+    def has_title(self, title: str) -> bool:
+        return bool(self.get_ids([title]))
+
+    def choices(self) -> list[tuple[str, str]]:
+        return [(title, title) for title in self.load()]
+
+    def get_etag(self) -> str:
+        self.refresh()
+        return f'"{self._version}"'
+
+    def filter(self, title: Optional[str] = None, **fields) -> list[dict]:
+        """Записи справочника: подстрока названия и точные значения полей."""
+        self.refresh()
+        rows = self._rows
+        if title:
+            title = title.casefold()
+            rows = [row for row in rows if title in row["title"].casefold()]
+        for field, value in fields.items():
+            rows = [row for row in rows if row[field] == value]
+        return rows
+
+
+themes = TitleDictionary(Theme)
+approaches = TitleDictionary(Approach)
+institutes = TitleDictionary(Institute, ("id", "title", "is_higher"))
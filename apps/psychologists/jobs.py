@@ -0,0 +1,24 @@
+from apps.core.email import (
+    PsychoActivationEmail,
+    PsychoConfirmationFormEmail,
+    send_email,
+)
+from apps.core.jobs import job
+from apps.users.models import CustomUser
+
+
+@job
+def send_psycho_activation_email(user_id: int) -> None:
+    """Отправка письма психологу для активации аккаунта"""
+    user = CustomUser.objects.get(pk=user_id)
+    send_email(PsychoActivationEmail(context={"user": user}), [user.email])
+
+
+@job
+def send_psycho_confirmation_form_email(user_id: int, site: dict) -> None:
+    """Отправка письма психологу, что анкета получена"""
+    user = CustomUser.objects.get(pk=user_id)
+    send_email(
+        PsychoConfirmationFormEmail(context={"user": user, **site}),
+        [user.email],
+    )
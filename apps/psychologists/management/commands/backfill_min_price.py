@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.psychologists.services import backfill_min_price
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает минимальную цену услуг для всех психологов"
+
+    def handle(self, *args, **options):
+        updated = backfill_min_price()
+        self.stdout.write(
+            self.style.SUCCESS(f"Обновлено профилей психологов: {updated}")
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 4.1 on 2026-10-18 18:29
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def fill_min_price(apps, schema_editor):
+    ProfilePsychologist = apps.get_model("psychologists", "ProfilePsychologist")
+    Service = apps.get_model("psychologists", "Service")
+    prices = (
+        Service.objects.filter(psychologist=OuterRef("pk"))
+        .values("psychologist")
+        .annotate(min_price=Min("price"))
+        .values("min_price")
+    )
+    ProfilePsychologist.objects.update(min_price=Subquery(prices))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('psychologists', '0014_remove_psychoeducation_unique_education_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profilepsychologist',
+            name='min_price',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Минимальная цена'),
+        ),
+        migrations.RunPython(fill_min_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1 on 2026-10-18 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('psychologists', '0015_profilepsychologist_min_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profilepsychologist',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['min_price', 'id'], name='psycho_min_price_index'),
+        ),
+        migrations.AddIndex(
+            model_name='profilepsychologist',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['started_working', 'id'], name='psycho_started_working_index'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+from django.db.models.functions import Upper
+
+TITLE_MODELS = ("Theme", "Approach", "Institute")
+NAME_FIELDS = ("last_name", "first_name")
+
+
+def get_indexes(apps):
+    """
+    Индексы поиска PostgreSQL: триграммные по UPPER(поле) - для icontains,
+    полнотекстовый - по вектору из apps.psychologists.search.
+    """
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.contrib.postgres.search import SearchVector
+
+    indexes = [
+        (
+            apps.get_model("psychologists", model_name),
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name=f"{model_name.lower()}_title_trgm_index",
+            ),
+        )
+        for model_name in TITLE_MODELS
+    ]
+    profile = apps.get_model("psychologists", "ProfilePsychologist")
+    indexes += [
+        (
+            profile,
+            GinIndex(
+                OpClass(Upper(field), name="gin_trgm_ops"),
+                name=f"psycho_{field}_trgm_index",
+            ),
+        )
+        for field in NAME_FIELDS
+    ]
+    indexes.append(
+        (
+            profile,
+            GinIndex(
+                SearchVector(
+                    "last_name", "first_name", weight="A", config="russian"
+                )
+                + SearchVector("about", weight="B", config="russian"),
+                name="psycho_search_index",
+            ),
+        )
+    )
+    return indexes
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model, index in get_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in get_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('psychologists', '0016_profilepsychologist_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -145,11 +145,29 @@ class ProfilePsychologist(models.Model):
         verbose_name="Верификация",
         default=False,
     )
+    min_price = models.PositiveIntegerField(
+        verbose_name="Минимальная цена",
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = "Профиль психолога"
         verbose_name_plural = "Профили психолога"
         default_related_name = "psychologists"
+        indexes = [
+            models.Index(
+                fields=("min_price", "id"),
+                name="psycho_min_price_index",
+                condition=models.Q(is_verified=True),
+            ),
+            models.Index(
+                fields=("started_working", "id"),
+                name="psycho_started_working_index",
+                condition=models.Q(is_verified=True),
+            ),
+        ]
 
     @property
     def age(self):
@@ -0,0 +1,59 @@
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+
+from apps.psychologists.models import ProfilePsychologist
+
+# конфигурация полнотекстового поиска PostgreSQL
+SEARCH_CONFIG = "russian"
+
+
+def get_search_vector():
+    """
+    Вектор поиска по профилю: имя важнее текста «о себе».
+    Выражение совпадает с индексом psycho_search_index (миграция 0017),
+    иначе PostgreSQL не сможет его использовать.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(
+        "last_name", "first_name", weight="A", config=SEARCH_CONFIG
+    ) + SearchVector("about", weight="B", config=SEARCH_CONFIG)
+
+
+def get_titles_condition(text: str) -> Q:
+    """
+    Психологи с темой или подходом, в названии которых есть text:
+    подзапрос по промежуточной таблице, без дублей строк каталога.
+    """
+    condition = Q()
+    for name in ("themes", "approaches"):
+        field = ProfilePsychologist._meta.get_field(name)
+        rows = field.remote_field.through.objects.filter(
+            **{f"{field.m2m_reverse_field_name()}__title__icontains": text}
+        )
+        condition |= Q(pk__in=rows.values(field.m2m_field_name()))
+    return condition
+
+
+def search_psychologists(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Поиск психологов по имени, тексту «о себе», темам и подходам.
+    PostgreSQL: полнотекстовый поиск с сортировкой по релевантности,
+    подстроки имени и названий - по триграммным индексам.
+    Другие СУБД (тесты, локальный запуск): icontains без ранжирования.
+    """
+    name = Q(last_name__icontains=text) | Q(first_name__icontains=text)
+    condition = name | get_titles_condition(text)
+    if connection.vendor != "postgresql":
+        return queryset.filter(condition | Q(about__icontains=text))
+
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    vector = get_search_vector()
+    return (
+        queryset.alias(search=vector)
+        .annotate(search_rank=SearchRank(vector, query))
+        .filter(condition | Q(search=query))
+        .order_by(F("search_rank").desc(), "id")
+    )
@@ -1,17 +1,46 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
 from dateutil.relativedelta import relativedelta
 
-from django.db.models import Prefetch, QuerySet
+from django.db.models import (
+    Case,
+    DateTimeField,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Least
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
 from apps.core.constants import LOADED_DAYS_FOR_SLOTS
-from apps.psychologists.models import (
-    ProfilePsychologist,
-    PsychoEducation,
-    Service,
-)
+from apps.core.utils import in_thread
+from apps.psychologists.models import ProfilePsychologist, PsychoEducation
 from apps.users.models import CustomUser
 from apps.session.models import Slot
+from apps.session.selectors import (
+    SLOT_GAP,
+    aget_window_free_slots,
+    generate_template_slots,
+    get_active_templates,
+    get_window_free_slots,
+)
+
+
+def get_education_prefetch() -> Prefetch:
+    """Все образование психолога с институтами и документами одним запросом."""
+    return Prefetch(
+        "psychoeducation",
+        queryset=PsychoEducation.objects.select_related(
+            "institute", "document"
+        ),
+    )
 
 
 def get_psychologist(user: CustomUser) -> ProfilePsychologist:
@@ -21,35 +50,156 @@ def get_psychologist(user: CustomUser) -> ProfilePsychologist:
         .prefetch_related(
             Prefetch("themes"),
             Prefetch("approaches"),
-            Prefetch("education"),
+            get_education_prefetch(),
         )
     )
     return get_object_or_404(queryset, user=user)
 
 
-def get_all_verified_psychologists() -> list[ProfilePsychologist]:
+def get_slots_period() -> tuple[datetime, datetime]:
+    """Период выгрузки свободных слотов в каталоге."""
+    now = timezone.now()
+    return now, now + relativedelta(days=+LOADED_DAYS_FOR_SLOTS)
+
+
+def get_free_slots_querysets() -> tuple[QuerySet, QuerySet]:
+    """Слоты и шаблоны окон записи на ближайшие LOADED_DAYS_FOR_SLOTS дней."""
+    start, finish = get_slots_period()
     return (
-        ProfilePsychologist.objects.filter(is_verified=True)
-        .prefetch_related(
-            Prefetch("slots"),
-            Prefetch("services"),
-        )
-        .order_by("id")
+        Slot.objects.filter(
+            datetime_from__gt=start - SLOT_GAP,
+            datetime_from__lt=finish + SLOT_GAP,
+        ),
+        get_active_templates(start.date()),
+    )
+
+
+def get_free_slots_prefetch() -> tuple[Prefetch, Prefetch]:
+    """
+    Слоты и шаблоны окон записи на ближайшие LOADED_DAYS_FOR_SLOTS дней
+    для всех психологов выборки: по одному запросу на страницу.
+    Результат в атрибутах window_slots и active_templates.
+    """
+    slots, templates = get_free_slots_querysets()
+    return (
+        Prefetch("slots", queryset=slots, to_attr="window_slots"),
+        Prefetch(
+            "availability_templates",
+            queryset=templates,
+            to_attr="active_templates",
+        ),
+    )
+
+
+async def aprefetch_free_slots(
+    psychologists: list[ProfilePsychologist],
+) -> None:
+    """
+    Асинхронный аналог get_free_slots_prefetch для загруженной страницы:
+    слоты и шаблоны читаются параллельно, результат в тех же атрибутах.
+    """
+    ids = [psychologist.pk for psychologist in psychologists]
+    slots, templates = get_free_slots_querysets()
+    slots, templates = await asyncio.gather(
+        in_thread(list, slots.filter(psychologist__in=ids)),
+        in_thread(list, templates.filter(psychologist__in=ids)),
+    )
+    window_slots, active_templates = defaultdict(list), defaultdict(list)
+    for slot in slots:
+        window_slots[slot.psychologist_id].append(slot)
+    for template in templates:
+        active_templates[template.psychologist_id].append(template)
+    for psychologist in psychologists:
+        psychologist.window_slots = window_slots[psychologist.pk]
+        psychologist.active_templates = active_templates[psychologist.pk]
+
+
+def get_verified_psychologists() -> QuerySet:
+    return ProfilePsychologist.objects.filter(is_verified=True).order_by("id")
+
+
+def get_all_verified_psychologists() -> list[ProfilePsychologist]:
+    return get_verified_psychologists().prefetch_related(
+        *get_free_slots_prefetch()
     )
 
 
-def get_psychologist_for_card(id) -> ProfilePsychologist:
+def get_nearest_template_slots(queryset: QuerySet) -> dict[int, datetime]:
+    """
+    Время ближайшего свободного слота по шаблонам на LOADED_DAYS_FOR_SLOTS
+    дней для психологов выборки, как в карточках каталога: шаблоны
+    и окна из БД загружаются двумя запросами.
+    """
+    start, finish = get_slots_period()
+    slots, templates = get_free_slots_querysets()
+    templates_by_psychologist = defaultdict(list)
+    for template in templates.filter(psychologist__in=queryset.values("pk")):
+        templates_by_psychologist[template.psychologist_id].append(template)
+    if not templates_by_psychologist:
+        return {}
+    taken = defaultdict(list)
+    rows = slots.filter(psychologist__in=list(templates_by_psychologist))
+    for psychologist_id, datetime_from in rows.values_list(
+        "psychologist_id", "datetime_from"
+    ):
+        taken[psychologist_id].append(datetime_from)
+    nearest = {}
+    for psychologist_id, templates in templates_by_psychologist.items():
+        generated = generate_template_slots(
+            templates, taken[psychologist_id], start, finish
+        )
+        if generated:
+            nearest[psychologist_id] = min(
+                slot.datetime_from for slot in generated
+            )
+    return nearest
+
+
+def annotate_nearest_slot(queryset: QuerySet) -> QuerySet:
+    """
+    Добавляет nearest_slot - время ближайшего свободного слота психолога,
+    сохраненного или по шаблону. Подзапрос идет по частичному индексу
+    свободных слотов slot_free_index, слоты по шаблонам вычисляются
+    get_nearest_template_slots и подставляются в запрос значениями.
+    """
+    slots = Slot.objects.filter(
+        psychologist=OuterRef("pk"),
+        is_free=True,
+        datetime_from__gt=timezone.now(),
+    ).order_by("datetime_from")
+    nearest_slot = Subquery(slots.values("datetime_from")[:1])
+    nearest_template_slots = get_nearest_template_slots(queryset)
+    if nearest_template_slots:
+        template_slot = Case(
+            *(
+                When(pk=psychologist_id, then=Value(datetime_from))
+                for psychologist_id, datetime_from in (
+                    nearest_template_slots.items()
+                )
+            ),
+            output_field=DateTimeField(),
+        )
+        # NULL в LEAST на SQLite дает NULL, на PostgreSQL пропускается
+        nearest_slot = Least(
+            Coalesce(nearest_slot, template_slot),
+            Coalesce(template_slot, nearest_slot),
+        )
+    return queryset.annotate(nearest_slot=nearest_slot)
+
+
+def get_psychologist_for_card(id, slots: bool = True) -> ProfilePsychologist:
+    """Профиль для карточки; slots=False - без загрузки окон записи."""
     queryset = (
         ProfilePsychologist.objects.all()
         .select_related("user")
         .prefetch_related(
             Prefetch("themes"),
             Prefetch("approaches"),
-            Prefetch("education"),
-            Prefetch("slots"),
-            Prefetch("services"),
+            get_education_prefetch(),
         )
     )
+    if slots:
+        queryset = queryset.prefetch_related(*get_free_slots_prefetch())
     return get_object_or_404(queryset, id=id)
 
 
@@ -64,33 +214,77 @@ def get_psychologist_with_services(id: int) -> ProfilePsychologist:
 def get_education(
     user: ProfilePsychologist, flag: bool
 ) -> list[PsychoEducation]:
-    return PsychoEducation.objects.filter(
-        psychologist=user, institute__is_higher=flag
-    ).select_related("document")
+    """
+    Высшее образование (flag=True) или курсы психолога.
+    Делит в памяти образование, загруженное get_education_prefetch;
+    без него загружает образование с институтами одним запросом.
+    """
+    educations = user.psychoeducation.all()
+    if "psychoeducation" not in getattr(user, "_prefetched_objects_cache", {}):
+        educations = educations.select_related("institute", "document")
+    return [
+        education
+        for education in educations
+        if education.institute.is_higher is flag
+    ]
 
 
-def get_price(psychologist: ProfilePsychologist) -> Service:
-    prices = Service.objects.filter(psychologist=psychologist).values_list(
-        "price", flat=True)
-    if prices:
-        return min(prices)
+def get_price(psychologist: ProfilePsychologist) -> int:
+    """Минимальная цена услуг психолога без обращения к Service."""
+    if psychologist.min_price is not None:
+        return psychologist.min_price
     return 1
 
 
-def get_free_slots(psychologist: ProfilePsychologist) -> Slot:
-    now = timezone.now()
-    finish = now + relativedelta(days=+LOADED_DAYS_FOR_SLOTS)
-    slots = Slot.objects.filter(
-        psychologist=psychologist,
-        is_free=True,
-        datetime_from__gt=now,
-        datetime_to__lte=finish,
-    )
-    return slots
+def get_free_slots(psychologist: ProfilePsychologist) -> list[Slot]:
+    """
+    Свободные слоты психолога для каталога, включая слоты по шаблонам.
+    Использует данные get_free_slots_prefetch, если они загружены.
+    """
+    start, finish = get_slots_period()
+    if hasattr(psychologist, "window_slots"):
+        return get_window_free_slots(
+            psychologist.pk,
+            start,
+            finish,
+            slots=psychologist.window_slots,
+            templates=psychologist.active_templates,
+        )
+    return get_window_free_slots(psychologist, start, finish)
+
 
+async def aget_free_slots(psychologist_id) -> list[Slot]:
+    """Асинхронный get_free_slots по id психолога."""
+    start, finish = get_slots_period()
+    return await aget_window_free_slots(psychologist_id, start, finish)
 
-def get_all_free_slots(psychologist_id: int) -> QuerySet:
-    """Возвращает все свободные слоты психолога с текущего момента."""
+
+def get_all_free_slots(
+    psychologist_id: int, since: datetime, until: datetime
+) -> list[Slot]:
+    """
+    Возвращает свободные слоты психолога в периоде, не раньше текущего
+    момента, включая слоты по шаблонам.
+    """
     psycho = get_object_or_404(ProfilePsychologist, pk=psychologist_id)
-    now = timezone.now()
-    return psycho.slots.filter(datetime_from__gte=now, is_free=True)
+    return get_window_free_slots(psycho.pk, max(since, timezone.now()), until)
+
+
+async def aget_all_free_slots(
+    psychologist_id: int, since: datetime, until: datetime
+) -> list[Slot]:
+    """
+    Асинхронный get_all_free_slots: проверка психолога, слоты и шаблоны
+    читаются параллельно.
+    """
+    exists, slots = await asyncio.gather(
+        in_thread(
+            ProfilePsychologist.objects.filter(pk=psychologist_id).exists
+        ),
+        aget_window_free_slots(
+            psychologist_id, max(since, timezone.now()), until
+        ),
+    )
+    if not exists:
+        raise Http404
+    return slots
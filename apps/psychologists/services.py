@@ -2,23 +2,23 @@ from datetime import date
 from typing import OrderedDict
 
 from django.db import transaction
-from django.core.exceptions import (
-    ValidationError as DjangoValidationError,
-    ObjectDoesNotExist,
-)
+from django.db.models import Exists, Min, OuterRef, Subquery
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.utils import IntegrityError
 from django.http import HttpRequest
 from rest_framework import exceptions
 
+from apps.core.email import get_site_context
+from apps.core.jobs import enqueue
 from apps.core.models import UploadFile
+from apps.psychologists import cache, dictionaries
+from apps.psychologists.dictionaries import TitleDictionary
 from apps.psychologists.models import (
     ProfilePsychologist,
-    Institute,
+    PsychoEducation,
     Service,
-    Theme,
-    Approach,
 )
-from apps.psychologists.threads import PsychoConfirmationFormEmailThread
+from apps.psychologists.jobs import send_psycho_confirmation_form_email
 from apps.users.models import CustomUser
 
 
@@ -53,7 +53,11 @@ def create_psychologist(
     )
     psychologist = create_profile(user, validated_data)
 
-    PsychoConfirmationFormEmailThread(request, user).start()
+    enqueue(
+        send_psycho_confirmation_form_email,
+        user_id=user.pk,
+        site=get_site_context(request),
+    )
 
     return (user, psychologist)
 
@@ -92,19 +96,7 @@ def create_profile(
 
     psychologist.themes.add(*themes)
     psychologist.approaches.add(*approaches)
-    for data in institutes + courses:
-        education = data.pop("institute")
-        try:
-            psychologist.education.add(education, through_defaults=data)
-        except IntegrityError:
-            raise exceptions.ValidationError(
-                {
-                    "document": (
-                        f"Документ с UUID '{data['document'].id}' "
-                        "принадлежит другому пользователю"
-                    )
-                }
-            )
+    add_education(psychologist, institutes + courses)
 
     create_service(psychologist, price)
 
@@ -138,9 +130,7 @@ def update_psychologist(
         setattr(instance, key, value)
     instance.save()
 
-    for data in institutes + courses:
-        education = data.pop("institute")
-        instance.education.add(education, through_defaults=data)
+    add_education(instance, institutes + courses)
 
     return instance
 
@@ -154,28 +144,47 @@ def count_started_working(experience: int) -> date:
     return date(year, 1, 1)
 
 
-def get_themes(iterable: list[OrderedDict]) -> list[Theme]:
+def get_themes(iterable: list[OrderedDict]) -> list[int]:
     """
     ("themes"): [{"title": str}].
+    id тем по справочнику в памяти процесса, без запросов к БД.
     """
-    output = []
-    for data in iterable:
-        try:
-            obj = Theme.objects.get(title=data["title"])
-            output.append(obj)
-        except ObjectDoesNotExist:
-            pass
-    return output
+    return dictionaries.themes.get_ids(data["title"] for data in iterable)
+
+
+def get_or_create_titles(
+    dictionary: TitleDictionary, titles: list[str], **fields
+) -> dict[str, int]:
+    """
+    id записей справочника по названиям. Известные берутся из справочника
+    в памяти процесса, новые создаются одним запросом и перечитываются
+    вторым: ignore_conflicts не возвращает id, а запись с тем же названием
+    могла появиться в параллельной транзакции.
+    """
+    known = dictionary.load()
+    ids = {title: known[title] for title in titles if title in known}
+    missing = sorted(set(titles) - ids.keys())
+    if missing:
+        model = dictionary.model
+        model.objects.bulk_create(
+            [model(title=title, **fields) for title in missing],
+            ignore_conflicts=True,
+        )
+        ids.update(
+            model.objects.filter(title__in=missing).values_list("title", "id")
+        )
+        dictionary.invalidate()
+    return ids
 
 
-def get_or_create_approaches(iterable: list[OrderedDict]) -> list[Approach]:
+def get_or_create_approaches(iterable: list[OrderedDict]) -> list[int]:
     """
     ("approaches"): [{"title": str}].
+    Известные подходы берутся из справочника, новые создаются пачкой.
     """
-    for i, data in enumerate(iterable):
-        obj, _ = Approach.objects.get_or_create(title=data["title"])
-        iterable[i] = obj
-    return iterable
+    titles = [data["title"] for data in iterable]
+    ids = get_or_create_titles(dictionaries.approaches, titles)
+    return [ids[title] for title in titles]
 
 
 def get_or_create_education(
@@ -190,23 +199,88 @@ def get_or_create_education(
             "document":  str,
             }
         ]
+    Название заменяется на id института; новые создаются пачкой с
+    признаком flag, существующие берутся независимо от признака.
+    """
+    titles = [data["title"] for data in iterable]
+    ids = get_or_create_titles(dictionaries.institutes, titles, is_higher=flag)
+    for data in iterable:
+        data["institute"] = ids[data.pop("title")]
+    return iterable
+
+
+def add_education(
+    psychologist: ProfilePsychologist, iterable: list[OrderedDict]
+) -> list[PsychoEducation]:
+    """
+    Добавляет образование психологу: документы проверяются одним запросом,
+    записи создаются одним запросом. Уже добавленное психологу образование
+    (тот же документ или то же обучение) пропускается, как при
+    education.add(). bulk_create не отправляет сигналы, поэтому кэш
+    карточки сбрасывается явно.
     """
+    if not iterable:
+        return []
+    fields = ("institute", "speciality", "graduation_year")
+    added = PsychoEducation.objects.filter(
+        psychologist=psychologist
+    ).values_list(*fields, "document")
+    added_keys = {row[:3] for row in added}
+    added_documents = {row[3] for row in added}
+    pending = []
     for data in iterable:
-        title = data.pop("title")
-        education, _ = Institute.objects.get_or_create(
-            title=title,
-            is_higher=flag,
+        key = tuple(data[field] for field in fields)
+        if key not in added_keys and data["document"] not in added_documents:
+            pending.append(data)
+    iterable = pending
+    if not iterable:
+        return []
+    documents = (
+        UploadFile.objects.filter(id__in=[d["document"] for d in iterable])
+        .annotate(
+            used=Exists(
+                PsychoEducation.objects.filter(document=OuterRef("pk"))
+            )
         )
-        data["institute"] = education
-        document = data.pop("document")
-        try:
-            file = UploadFile.objects.get(id=document)
-            data["document"] = file
-        except ObjectDoesNotExist:
+        .in_bulk()
+    )
+    seen = set()
+    for data in iterable:
+        document = data["document"]
+        if document not in documents:
             raise exceptions.ValidationError(
                 {"document": f"Документ с UUID '{document}' не найден"}
             )
-    return iterable
+        if documents[document].used or document in seen:
+            raise exceptions.ValidationError(
+                {
+                    "document": (
+                        f"Документ с UUID '{document}' "
+                        "принадлежит другому пользователю"
+                    )
+                }
+            )
+        seen.add(document)
+
+    try:
+        education = PsychoEducation.objects.bulk_create(
+            [
+                PsychoEducation(
+                    psychologist=psychologist,
+                    institute_id=data["institute"],
+                    speciality=data["speciality"],
+                    graduation_year=data["graduation_year"],
+                    document_id=data["document"],
+                )
+                for data in iterable
+            ]
+        )
+    except IntegrityError:
+        raise exceptions.ValidationError(
+            {"education": "Такое образование уже добавлено"}
+        )
+    cache.invalidate_card(psychologist.pk)
+    return education
 
 
 def create_service(
@@ -224,6 +298,7 @@ def create_service(
         type=type,
         format=format,
     )
+    update_min_price(psychologist)
     return service
 
 
@@ -243,4 +318,32 @@ def update_service(
     )
     service.price = price
     service.save()
+    update_min_price(psychologist)
     return service
+
+
+def update_min_price(psychologist: ProfilePsychologist) -> None:
+    """
+    Пересчитывает денормализованную минимальную цену услуг психолога.
+    """
+    min_price = Service.objects.filter(psychologist=psychologist).aggregate(
+        min_price=Min("price")
+    )["min_price"]
+    ProfilePsychologist.objects.filter(pk=psychologist.pk).update(
+        min_price=min_price
+    )
+    psychologist.min_price = min_price
+
+
+def backfill_min_price() -> int:
+    """
+    Пересчитывает минимальную цену для всех психологов одним запросом.
+    Возвращает количество обновленных профилей.
+    """
+    prices = (
+        Service.objects.filter(psychologist=OuterRef("pk"))
+        .values("psychologist")
+        .annotate(min_price=Min("price"))
+        .values("min_price")
+    )
+    return ProfilePsychologist.objects.update(min_price=Subquery(prices))
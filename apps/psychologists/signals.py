@@ -1,12 +1,109 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
 
-from apps.psychologists.models import ProfilePsychologist
-from apps.psychologists.threads import PsychoActivationEmailThread
+from apps.core.jobs import enqueue
+from apps.psychologists import cache, dictionaries
+from apps.psychologists.jobs import send_psycho_activation_email
+from apps.psychologists.models import (
+    Approach,
+    Institute,
+    ProfilePsychologist,
+    PsychoEducation,
+    Service,
+    Theme,
+)
+from apps.session.models import AvailabilityTemplate, Slot
 
 
 @receiver(post_save, sender=ProfilePsychologist)
 def send_psycho_email(sender, instance, created, update_fields, **kwargs):
     if not created and update_fields is not None:
         if ("is_verified" in update_fields) and (instance.is_verified is True):
-            PsychoActivationEmailThread(instance).start()
+            enqueue(send_psycho_activation_email, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+def invalidate_themes(sender, **kwargs):
+    dictionaries.themes.invalidate()
+
+
+@receiver(post_save, sender=Approach)
+@receiver(post_delete, sender=Approach)
+def invalidate_approaches(sender, **kwargs):
+    dictionaries.approaches.invalidate()
+
+
+@receiver(post_save, sender=Institute)
+@receiver(post_delete, sender=Institute)
+def invalidate_institutes(sender, **kwargs):
+    dictionaries.institutes.invalidate()
+
+
+@receiver(post_save, sender=ProfilePsychologist)
+@receiver(post_delete, sender=ProfilePsychologist)
+def invalidate_card(sender, instance, **kwargs):
+    cache.invalidate_card(instance.pk)
+
+
+@receiver(post_save, sender=PsychoEducation)
+@receiver(post_delete, sender=PsychoEducation)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_card_by_relation(sender, instance, **kwargs):
+    cache.invalidate_card(instance.psychologist_id)
+
+
+@receiver(m2m_changed, sender=ProfilePsychologist.education.through)
+@receiver(m2m_changed, sender=ProfilePsychologist.themes.through)
+@receiver(m2m_changed, sender=ProfilePsychologist.approaches.through)
+def invalidate_card_by_m2m(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        cache.invalidate_card(instance.pk)
+    elif pk_set:
+        for psychologist_id in pk_set:
+            cache.invalidate_card(psychologist_id)
+
+
+# поле профиля, по которому название справочника попадает в карточку
+TITLE_FIELDS = {
+    Theme: "themes",
+    Approach: "approaches",
+    Institute: "education",
+}
+
+
+@receiver(post_save, sender=Theme)
+@receiver(pre_delete, sender=Theme)
+@receiver(post_save, sender=Approach)
+@receiver(pre_delete, sender=Approach)
+@receiver(post_save, sender=Institute)
+@receiver(pre_delete, sender=Institute)
+def invalidate_cards_by_title(sender, instance, **kwargs):
+    """
+    Переименование или удаление темы, подхода или вуза сбрасывает
+    карточки с ним. При удалении - до него, пока связи еще есть.
+    """
+    if kwargs.get("created"):
+        return
+    psychologist_ids = ProfilePsychologist.objects.filter(
+        **{TITLE_FIELDS[sender]: instance}
+    ).values_list("pk", flat=True)
+    cache.invalidate_cards(list(psychologist_ids))
+
+
+@receiver(post_save, sender=Slot)
+@receiver(post_delete, sender=Slot)
+@receiver(post_save, sender=AvailabilityTemplate)
+@receiver(post_delete, sender=AvailabilityTemplate)
+def invalidate_card_slots(sender, instance, **kwargs):
+    cache.invalidate_card_slots(instance.psychologist_id)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Session, Slot
+from .models import AvailabilityTemplate, Session, Slot
 
 
 @admin.register(Session)
@@ -24,3 +24,16 @@ class SlotAdmin(admin.ModelAdmin):
         'datetime_to',
         'is_free'
     )
+
+
+@admin.register(AvailabilityTemplate)
+class AvailabilityTemplateAdmin(admin.ModelAdmin):
+    """Настройка шаблона окон записи для админки"""
+    list_display = (
+        'id',
+        'psychologist',
+        'weekday',
+        'time_from',
+        'valid_from',
+        'valid_until'
+    )
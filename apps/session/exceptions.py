@@ -0,0 +1,10 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SlotAlreadyBooked(APIException):
+    """Окно записи занято другим клиентом."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Это окно записи уже занято, выберите другое время."
+    default_code = "slot_already_booked"
@@ -0,0 +1,135 @@
+from datetime import date, time, timedelta
+
+from django.db.models import Exists
+from django.utils import timezone
+
+from apps.clients.models import Client
+from apps.core.email import (
+    ClientNewSessionEmail,
+    ClientSessionCancellationEmail,
+    ClientSessionReminderEmail,
+    PsychoNewSessionEmail,
+    PsychoSessionCancellationEmail,
+    PsychoSessionReminderEmail,
+    dispatcher,
+)
+from apps.core.jobs import job
+from apps.core.zoom import create_meeting
+
+from .models import Session
+
+# письмо: (класс письма, ключ адреса получателя в контексте)
+SESSION_EMAILS = {
+    "client_created": (ClientNewSessionEmail, "client_email"),
+    "psycho_created": (PsychoNewSessionEmail, "psychologist_email"),
+    "client_cancelled": (ClientSessionCancellationEmail, "client_email"),
+    "psycho_cancelled": (PsychoSessionCancellationEmail, "psychologist_email"),
+}
+
+
+def get_session_context(session: Session) -> dict:
+    """Формирование контекста для отправки писем о новой сессии."""
+    moscow_datetime = session.slot.datetime_from + timedelta(hours=3)
+    return {
+        "client_name": session.client.get_full_name(),
+        "psycho_name": session.slot.psychologist.get_full_name(),
+        "date": moscow_datetime.date(),
+        "time": moscow_datetime.time(),
+        "client_email": session.client.user.email,
+        "psychologist_email": session.slot.psychologist.user.email,
+    }
+
+
+@job
+def send_session_emails(emails: list[str], context: dict, site: dict) -> None:
+    """
+    Отправка писем участникам сессии одной пачкой через одно соединение
+    с почтовым сервером.
+    """
+    # дата и время приходят из JSON строками
+    context["date"] = date.fromisoformat(context["date"])
+    context["time"] = time.fromisoformat(context["time"])
+    messages = []
+    for email in emails:
+        email_class, recipient = SESSION_EMAILS[email]
+        messages.append(
+            (email_class(context={**context, **site}), [context[recipient]])
+        )
+    dispatcher.send(messages)
+
+
+@job
+def arrange_zoom_meeting(session_id: int) -> None:
+    """
+    Получение ссылок на встречу Zoom. Ошибка API Zoom приводит к повтору
+    задачи; после исчерпания попыток ссылку готовят вручную.
+    """
+    session = (
+        Session.objects.select_related("slot").filter(pk=session_id).first()
+    )
+    if session is None:
+        # сессию успели отменить
+        return
+    client_url, psycho_url = create_meeting(session.slot.datetime_from)
+    session.client_link = client_url
+    session.psycho_link = psycho_url
+    session.save(update_fields=("client_link", "psycho_link"))
+
+
+@job
+def send_session_reminder(session_id: int, site: dict) -> None:
+    """
+    Напоминание участникам о предстоящей сессии со ссылками на встречу.
+    Оба письма уходят одной пачкой через одно соединение. Напоминание,
+    задержанное до начала сессии (простой исполнителя), не отправляется.
+    """
+    session = (
+        Session.objects.select_related(
+            "client__user", "slot__psychologist__user"
+        )
+        .filter(pk=session_id)
+        .first()
+    )
+    if session is None or session.datetime_from <= timezone.now():
+        # сессию успели отменить или она уже началась
+        return
+    context = {**get_session_context(session), **site}
+    dispatcher.send(
+        [
+            (
+                ClientSessionReminderEmail(
+                    context={**context, "link": session.client_link}
+                ),
+                [context["client_email"]],
+            ),
+            (
+                PsychoSessionReminderEmail(
+                    context={**context, "link": session.psycho_link}
+                ),
+                [context["psychologist_email"]],
+            ),
+        ]
+    )
+
+
+@job
+def complete_session(session_id: int) -> None:
+    """
+    Окончание сессии: психолог сессии становится психологом клиента в ЛК.
+    Задача, выполненная с опозданием, не затирает психолога более поздней
+    завершенной сессии.
+    """
+    session = (
+        Session.objects.select_related("slot").filter(pk=session_id).first()
+    )
+    if session is None:
+        # сессию успели отменить
+        return
+    later = Session.objects.filter(
+        client=session.client_id,
+        datetime_from__gt=session.datetime_from,
+        slot__datetime_to__lte=timezone.now(),
+    )
+    Client.objects.filter(pk=session.client_id).exclude(Exists(later)).update(
+        last_psychologist=session.slot.psychologist_id
+    )
@@ -0,0 +1,138 @@
+import re
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.api.v1.filters import SlotFilter
+from apps.psychologists.models import ProfilePsychologist
+from apps.psychologists.selectors import (
+    annotate_nearest_slot,
+    get_all_verified_psychologists,
+    get_free_slots_prefetch,
+    get_slots_period,
+)
+from apps.session.models import Slot
+from apps.session.selectors import (
+    get_all_free_slots_by_user,
+    get_all_slots_by_user,
+    get_overlapping_slots,
+    get_window_slots,
+)
+from apps.users.models import CustomUser
+
+# полный просмотр таблицы слотов в плане PostgreSQL и SQLite (в подзапросах
+# SQLite показывает псевдоним U0; полный проход по индексу - тоже просмотр)
+FULL_SCAN = re.compile(
+    r"Seq Scan on session_slot\b"
+    r"|\bSCAN (session_slot|U\d+)$"
+    r"|\bSCAN \S+ USING (COVERING )?INDEX "
+    r"(slot_|session_slot|sqlite_autoindex_session_slot)",
+    re.MULTILINE,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет EXPLAIN для запросов слотов на сгенерированных данных "
+        "и завершается ошибкой, если какой-то из них читает таблицу "
+        "слотов целиком. Данные создаются в транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--psychologists", type=int, default=200,
+            help="Количество психологов в наборе данных",
+        )
+        parser.add_argument(
+            "--slots", type=int, default=200,
+            help="Количество слотов у каждого психолога",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            psychologist = self.generate(
+                options["psychologists"], options["slots"]
+            )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            failed = []
+            for name, queryset in self.get_queries(psychologist):
+                plan = queryset.explain()
+                self.stdout.write(f"{name}:\n{plan}\n")
+                if FULL_SCAN.search(plan):
+                    failed.append(name)
+            transaction.set_rollback(True)
+        if failed:
+            raise CommandError(
+                "Полный просмотр таблицы слотов: " + ", ".join(failed)
+            )
+        self.stdout.write(self.style.SUCCESS("Все запросы идут по индексам"))
+
+    def generate(self, number: int, slots: int) -> ProfilePsychologist:
+        """Психологи с прошедшими занятыми и будущими свободными слотами."""
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                email=f"explain_{index}@unexistingmail.ru",
+                is_client=False,
+                is_psychologists=True,
+            )
+            for index in range(number)
+        )
+        psychologists = ProfilePsychologist.objects.bulk_create(
+            ProfilePsychologist(
+                user=user,
+                first_name="Психолог",
+                last_name="Психологов",
+                birthday=date(1980, 1, 1),
+                gender="female",
+                started_working=date(2010, 1, 1),
+                about="О себе",
+                is_verified=True,
+            )
+            for user in users
+        )
+        start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        start -= timedelta(hours=slots)
+        for psychologist in psychologists:
+            Slot.objects.bulk_create(
+                (
+                    Slot(
+                        psychologist=psychologist,
+                        datetime_from=start + timedelta(hours=2 * hour),
+                        datetime_to=start + timedelta(hours=2 * hour + 1),
+                        is_free=hour >= slots // 2,
+                    )
+                    for hour in range(slots)
+                ),
+                batch_size=500,
+            )
+        return psychologists[0]
+
+    def get_queries(
+        self, psychologist: ProfilePsychologist
+    ) -> list[tuple[str, QuerySet]]:
+        user = psychologist.user
+        start, finish = get_slots_period()
+        page = get_all_verified_psychologists().values("pk")[:10]
+        window = get_free_slots_prefetch()[0].queryset
+        calendar = SlotFilter(
+            {"since": timezone.localdate().isoformat()},
+            queryset=get_all_slots_by_user(user),
+        )
+        return [
+            (
+                "get_free_slots",
+                get_window_slots(psychologist.pk, start, finish),
+            ),
+            ("get_free_slots_prefetch", window.filter(psychologist__in=page)),
+            ("get_all_free_slots_by_user", get_all_free_slots_by_user(user)),
+            ("SlotFilter.filter_dates", calendar.qs),
+            ("validate_datetime_from", get_overlapping_slots(user, finish)),
+            (
+                "annotate_nearest_slot",
+                annotate_nearest_slot(get_all_verified_psychologists()),
+            ),
+        ]
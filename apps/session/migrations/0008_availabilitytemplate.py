@@ -0,0 +1,40 @@
+# Generated by Django 4.1 on 2026-10-18 18:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('psychologists', '0016_profilepsychologist_catalog_indexes'),
+        ('session', '0007_alter_slot_datetime_from'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'понедельник'), (1, 'вторник'), (2, 'среда'), (3, 'четверг'), (4, 'пятница'), (5, 'суббота'), (6, 'воскресенье')], verbose_name='День недели')),
+                ('time_from', models.TimeField(verbose_name='Время начала сессии')),
+                ('valid_from', models.DateField(verbose_name='Действует с')),
+                ('valid_until', models.DateField(blank=True, null=True, verbose_name='Действует по')),
+                ('psychologist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_templates', to='psychologists.profilepsychologist', verbose_name='Специалист')),
+            ],
+            options={
+                'verbose_name': 'Шаблон окна записи',
+                'verbose_name_plural': 'Шаблоны окон записи',
+                'ordering': ('weekday', 'time_from'),
+            },
+        ),
+        migrations.AddField(
+            model_name='slot',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='slots', to='session.availabilitytemplate', verbose_name='Шаблон'),
+        ),
+        migrations.AddConstraint(
+            model_name='availabilitytemplate',
+            constraint=models.UniqueConstraint(fields=('psychologist', 'weekday', 'time_from', 'valid_from'), name='unique_availability_templates'),
+        ),
+    ]
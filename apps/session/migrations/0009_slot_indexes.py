@@ -0,0 +1,21 @@
+# Generated by Django 4.1 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('session', '0008_availabilitytemplate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['psychologist', 'is_free', 'datetime_from'], name='slot_psycho_free_index'),
+        ),
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(condition=models.Q(('is_free', True)), fields=['psychologist', 'datetime_from'], name='slot_free_index'),
+        ),
+    ]
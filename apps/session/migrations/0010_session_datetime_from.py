@@ -0,0 +1,39 @@
+# Generated by Django 4.1 on 2026-10-18 19:50
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_datetime_from(apps, schema_editor):
+    Session = apps.get_model("session", "Session")
+    Slot = apps.get_model("session", "Slot")
+    Session.objects.update(
+        datetime_from=Subquery(
+            Slot.objects.filter(pk=OuterRef("slot")).values("datetime_from")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('session', '0009_slot_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='datetime_from',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Начало сессии'),
+        ),
+        migrations.RunPython(fill_datetime_from, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='session',
+            name='datetime_from',
+            field=models.DateTimeField(editable=False, verbose_name='Начало сессии'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('status', 'paid')), fields=['client', 'datetime_from'], name='session_client_paid_index'),
+        ),
+    ]
@@ -8,6 +8,62 @@ from apps.core.constants import SESSION_DURATION
 from apps.psychologists.models import ProfilePsychologist
 
 
+class AvailabilityTemplate(models.Model):
+    """
+    Регулярное окно записи: день недели и время начала в период действия.
+    Слоты по шаблону строятся на лету и сохраняются только при записи.
+    """
+
+    class Weekday(models.IntegerChoices):
+        MONDAY = 0, "понедельник"
+        TUESDAY = 1, "вторник"
+        WEDNESDAY = 2, "среда"
+        THURSDAY = 3, "четверг"
+        FRIDAY = 4, "пятница"
+        SATURDAY = 5, "суббота"
+        SUNDAY = 6, "воскресенье"
+
+    psychologist = models.ForeignKey(
+        ProfilePsychologist,
+        on_delete=models.CASCADE,
+        related_name="availability_templates",
+        verbose_name="Специалист",
+    )
+    weekday = models.PositiveSmallIntegerField(
+        verbose_name="День недели",
+        choices=Weekday.choices,
+    )
+    time_from = models.TimeField(verbose_name="Время начала сессии")
+    valid_from = models.DateField(verbose_name="Действует с")
+    valid_until = models.DateField(
+        verbose_name="Действует по",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ("weekday", "time_from")
+        verbose_name = "Шаблон окна записи"
+        verbose_name_plural = "Шаблоны окон записи"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["psychologist", "weekday", "time_from", "valid_from"],
+                name="unique_availability_templates",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.psychologist}: {self.get_weekday_display()} "
+            f"{self.time_from}"
+        )
+
+    def is_active(self, day) -> bool:
+        if day.weekday() != self.weekday or day < self.valid_from:
+            return False
+        return self.valid_until is None or day <= self.valid_until
+
+
 class Slot(models.Model):
     """Окно записи"""
 
@@ -17,6 +73,14 @@ class Slot(models.Model):
         related_name="slots",
         verbose_name="Специалист",
     )
+    template = models.ForeignKey(
+        AvailabilityTemplate,
+        on_delete=models.SET_NULL,
+        related_name="slots",
+        verbose_name="Шаблон",
+        null=True,
+        blank=True,
+    )
     datetime_from = models.DateTimeField(
         verbose_name="Начало сессии", db_index=True
     )
@@ -42,6 +106,20 @@ class Slot(models.Model):
                 fields=["psychologist", "datetime_from"], name="unique_slots"
             ),
         ]
+        indexes = [
+            # выборки окон психолога с фильтром по занятости
+            models.Index(
+                fields=["psychologist", "is_free", "datetime_from"],
+                name="slot_psycho_free_index",
+            ),
+            # только свободные окна: ближайший слот в каталоге, свободные
+            # слоты в ЛК; занятые окна с ростом истории сюда не попадают
+            models.Index(
+                fields=["psychologist", "datetime_from"],
+                name="slot_free_index",
+                condition=models.Q(is_free=True),
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -112,10 +190,31 @@ class Session(models.Model):
         verbose_name="Ссылка для психолога",
         null=True,
     )
+    # копия начала слота: ближайшая сессия клиента ищется по индексу
+    # без join со слотами
+    datetime_from = models.DateTimeField(
+        verbose_name="Начало сессии",
+        editable=False,
+    )
 
     class Meta:
         verbose_name = "Сессия"
         verbose_name_plural = "Сессии"
+        indexes = [
+            # ближайшая оплаченная сессия клиента в ЛК
+            models.Index(
+                fields=["client", "datetime_from"],
+                condition=models.Q(status="paid"),
+                name="session_client_paid_index",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.client}: {self.slot} - {self.status}"
+
+    def save(self, *args, **kwargs):
+        self.datetime_from = self.slot.datetime_from
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "slot" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "datetime_from"}
+        super().save(*args, **kwargs)
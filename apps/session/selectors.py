@@ -1,14 +1,36 @@
-from django.db.models import QuerySet
-from django.shortcuts import get_object_or_404
+import asyncio
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import Q, QuerySet
+from django.http import Http404
 from django.utils import timezone
 
+from apps.core.constants import SESSION_DURATION
+from apps.core.utils import in_thread
 from apps.psychologists.models import ProfilePsychologist
 from apps.users.models import CustomUser
 
+from .models import AvailabilityTemplate, Slot
+
+# Минимальный интервал между началами окон записи психолога
+SLOT_GAP = timedelta(hours=1)
+# Минут в неделе: время шаблона - минута недели по кругу
+WEEK_MINUTES = 7 * 24 * 60
+
+
+def get_psychologist_by_user(user: CustomUser) -> ProfilePsychologist:
+    """Профиль психолога: у пользователя из токена - без запроса к БД."""
+    try:
+        return user.psychologists
+    except ProfilePsychologist.DoesNotExist:
+        raise Http404
+
 
 def get_all_free_slots_by_user(user: CustomUser) -> QuerySet:
     """Возвращает все свободные слоты психолога."""
-    psycho = get_object_or_404(ProfilePsychologist, user=user)
+    psycho = get_psychologist_by_user(user)
     return psycho.slots.filter(is_free=True).select_related(
         "session", "session__client"
     )
@@ -16,5 +38,193 @@ def get_all_free_slots_by_user(user: CustomUser) -> QuerySet:
 
 def get_all_slots_by_user(user: CustomUser) -> QuerySet:
     """Возвращает все слоты психолога."""
-    psycho = get_object_or_404(ProfilePsychologist, user=user)
+    psycho = get_psychologist_by_user(user)
     return psycho.slots.select_related("session", "session__client")
+
+
+def get_overlapping_slots(user: CustomUser, start: datetime) -> QuerySet:
+    """Слоты психолога, с которыми пересекается окно, начинающееся в start."""
+    return Slot.objects.filter(
+        psychologist__user=user,
+        datetime_from__gt=start - SLOT_GAP,
+        datetime_from__lt=start + SLOT_GAP,
+    )
+
+
+def get_window_slots(
+    psychologist_id, start: datetime, finish: datetime
+) -> QuerySet:
+    """Слоты психолога в [start, finish) с запасом SLOT_GAP в обе стороны."""
+    return Slot.objects.filter(
+        psychologist=psychologist_id,
+        datetime_from__gt=start - SLOT_GAP,
+        datetime_from__lt=finish + SLOT_GAP,
+    )
+
+
+def get_templates_by_user(user: CustomUser) -> QuerySet:
+    """Возвращает шаблоны окон записи психолога."""
+    return AvailabilityTemplate.objects.filter(psychologist__user=user)
+
+
+def get_active_templates(since: date) -> QuerySet:
+    """Шаблоны, действующие с даты since и позже."""
+    return AvailabilityTemplate.objects.filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=since)
+    )
+
+
+def is_overlapping(taken: list[datetime], start: datetime) -> bool:
+    """Пересекается ли слот с отсортированным списком начал слотов."""
+    index = bisect_left(taken, start)
+    if index < len(taken) and taken[index] < start + SLOT_GAP:
+        return True
+    return index > 0 and taken[index - 1] > start - SLOT_GAP
+
+
+def get_week_minute(weekday: int, moment: time) -> int:
+    return (weekday * 24 + moment.hour) * 60 + moment.minute
+
+
+def is_week_overlapping(first: int, second: int) -> bool:
+    """Пересекаются ли окна, начинающиеся в минуты недели first и second."""
+    distance = abs(first - second) % WEEK_MINUTES
+    gap = SLOT_GAP.total_seconds() // 60
+    return min(distance, WEEK_MINUTES - distance) < gap
+
+
+def get_template_overlaps(
+    template: AvailabilityTemplate, since: datetime
+) -> tuple[list[AvailabilityTemplate], list[datetime]]:
+    """
+    Шаблоны и окна из БД (начиная с since) психолога, пересекающиеся
+    с шаблоном template по дню недели и времени в период его действия.
+    """
+    minute = get_week_minute(template.weekday, template.time_from)
+    start = timezone.make_aware(datetime.combine(template.valid_from, time()))
+    templates = get_active_templates(template.valid_from).filter(
+        psychologist=template.psychologist_id
+    )
+    slots = Slot.objects.filter(
+        psychologist=template.psychologist_id,
+        datetime_from__gt=max(since, start) - SLOT_GAP,
+    )
+    if template.valid_until is not None:
+        finish = timezone.make_aware(
+            datetime.combine(template.valid_until, time.max)
+        )
+        templates = templates.filter(valid_from__lte=template.valid_until)
+        slots = slots.filter(datetime_from__lt=finish + SLOT_GAP)
+    overlapping = [
+        other
+        for other in templates.exclude(pk=template.pk)
+        if is_week_overlapping(
+            minute, get_week_minute(other.weekday, other.time_from)
+        )
+    ]
+    taken = []
+    for datetime_from in slots.values_list("datetime_from", flat=True):
+        local = timezone.localtime(datetime_from)
+        if is_week_overlapping(
+            minute, get_week_minute(local.weekday(), local.time())
+        ):
+            taken.append(datetime_from)
+    return overlapping, taken
+
+
+def generate_template_slots(
+    templates: Iterable[AvailabilityTemplate],
+    taken: Iterable[datetime],
+    start: datetime,
+    finish: datetime,
+) -> list[Slot]:
+    """
+    Несохраненные слоты по шаблонам, начинающиеся в [start, finish).
+    Пропускаются времена, пересекающиеся с окнами из БД (taken).
+    """
+    taken = sorted(taken)
+    duration = timedelta(minutes=SESSION_DURATION)
+    slots = []
+    day = timezone.localdate(start)
+    while day <= timezone.localdate(finish):
+        for template in templates:
+            if not template.is_active(day):
+                continue
+            datetime_from = timezone.make_aware(
+                datetime.combine(day, template.time_from)
+            )
+            if start <= datetime_from < finish and not is_overlapping(
+                taken, datetime_from
+            ):
+                slots.append(
+                    Slot(
+                        psychologist_id=template.psychologist_id,
+                        template=template,
+                        datetime_from=datetime_from,
+                        datetime_to=datetime_from + duration,
+                    )
+                )
+        day += timedelta(days=1)
+    return slots
+
+
+def get_window_free_slots(
+    psychologist_id,
+    start: datetime,
+    finish: datetime,
+    slots: Optional[Iterable[Slot]] = None,
+    templates: Optional[Iterable[AvailabilityTemplate]] = None,
+) -> list[Slot]:
+    """
+    Свободные слоты психолога, начинающиеся в [start, finish): сохраненные
+    в БД и построенные по шаблонам. slots и templates можно передать
+    заранее загруженными (prefetch), иначе они читаются из БД;
+    slots должны покрывать окно с запасом SLOT_GAP в обе стороны.
+    """
+    if slots is None:
+        slots = get_window_slots(psychologist_id, start, finish)
+    if templates is None:
+        templates = get_active_templates(timezone.localdate(start)).filter(
+            psychologist=psychologist_id
+        )
+    slots = list(slots)
+    free = [
+        slot
+        for slot in slots
+        if slot.is_free and start <= slot.datetime_from < finish
+    ]
+    free += generate_template_slots(
+        templates, [slot.datetime_from for slot in slots], start, finish
+    )
+    return sorted(free, key=lambda slot: slot.datetime_from)
+
+
+def get_template_slot(
+    psychologist: ProfilePsychologist, datetime_from: datetime
+) -> Optional[Slot]:
+    """Несохраненный слот по шаблону на указанное время, если он свободен."""
+    slots = get_window_free_slots(
+        psychologist.pk, datetime_from, datetime_from + timedelta(seconds=1)
+    )
+    for slot in slots:
+        if slot.pk is None and slot.datetime_from == datetime_from:
+            return slot
+    return None
+
+
+async def aget_window_free_slots(
+    psychologist_id, start: datetime, finish: datetime
+) -> list[Slot]:
+    """Асинхронный get_window_free_slots: слоты и шаблоны - параллельно."""
+    slots, templates = await asyncio.gather(
+        in_thread(list, get_window_slots(psychologist_id, start, finish)),
+        in_thread(
+            list,
+            get_active_templates(timezone.localdate(start)).filter(
+                psychologist=psychologist_id
+            ),
+        ),
+    )
+    return get_window_free_slots(
+        psychologist_id, start, finish, slots=slots, templates=templates
+    )
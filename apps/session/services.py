@@ -1,28 +1,43 @@
-from datetime import datetime, timedelta
+from bisect import insort
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Optional
 
+from django.conf import settings
+from django.db import IntegrityError
 from django.db.transaction import atomic
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from rest_framework import exceptions
 
-from apps.core.constants import NON_PENALTY_PERIOD
+from apps.core.constants import NON_PENALTY_PERIOD, SESSION_DURATION
+from apps.core.email import get_site_context
+from apps.core.jobs import enqueue
+from apps.psychologists.cache import invalidate_card_slots
+from apps.psychologists.models import ProfilePsychologist
 from apps.users.models import CustomUser
 
-from .models import Session, Slot
-from .threads import ArrangeZoomSendEmailThread, SessionCancelEmailThread
+from .exceptions import SlotAlreadyBooked
+from .jobs import (
+    arrange_zoom_meeting,
+    complete_session,
+    get_session_context,
+    send_session_emails,
+    send_session_reminder,
+)
+from .models import AvailabilityTemplate, Session, Slot
+from .selectors import SLOT_GAP, get_template_overlaps, is_overlapping
 
-
-def get_session_context(session: Session) -> dict:
-    """Формирование контекста для отправки писем о новой сессии."""
-    moscow_datetime = session.slot.datetime_from + timedelta(hours=3)
-    return {
-        "client_name": session.client.get_full_name(),
-        "psycho_name": session.slot.psychologist.get_full_name(),
-        "date": moscow_datetime.date(),
-        "time": moscow_datetime.time(),
-        "client_email": session.client.user.email,
-        "psychologist_email": session.slot.psychologist.user.email,
-    }
+SLOT_OVERLAP_ERROR = "Окно записи пересекается с другими окнами специалиста."
+SLOT_IN_PAST_ERROR = (
+    "Время начала сессии не может быть меньше текущего времени."
+)
+TEMPLATE_OVERLAP_ERROR = (
+    "Шаблон пересекается с шаблоном специалиста: {weekday} {time_from}."
+)
+TEMPLATE_SLOT_OVERLAP_ERROR = (
+    "Шаблон пересекается с окнами записи специалиста: {datetimes}."
+)
 
 
 def get_cancel_session_context(session: Session, refund: str) -> dict:
@@ -32,6 +47,39 @@ def get_cancel_session_context(session: Session, refund: str) -> dict:
     return context
 
 
+def notify_participants(
+    request: HttpRequest, context: dict, emails: tuple[str, ...]
+) -> None:
+    """
+    Постановка в очередь писем участникам сессии одной задачей:
+    письма пары уходят через одно соединение с почтовым сервером.
+    """
+    enqueue(
+        send_session_emails,
+        emails=emails,
+        context=context,
+        site=get_site_context(request),
+    )
+
+
+def schedule_reminders(request: HttpRequest, session: Session) -> None:
+    """
+    Напоминания участникам за SESSION_REMINDER_OFFSETS часов до начала -
+    отложенные задачи очереди; прошедшие сроки пропускаются.
+    """
+    now = timezone.now()
+    site = get_site_context(request)
+    for hours in settings.SESSION_REMINDER_OFFSETS:
+        run_at = session.slot.datetime_from - timedelta(hours=hours)
+        if run_at > now:
+            enqueue(
+                send_session_reminder,
+                run_at=run_at,
+                session_id=session.pk,
+                site=site,
+            )
+
+
 def check_if_late(start: datetime) -> bool:
     """Проверка поздней отмены сессии клиентом."""
     now = timezone.now()
@@ -53,27 +101,54 @@ def get_refund_text(user: CustomUser, late_cancel: bool = False) -> str:
     return refund
 
 
+def reserve_slot(slot: Slot) -> None:
+    """
+    Занимает слот условным UPDATE ... WHERE is_free: из параллельных
+    запросов на один слот строку обновит только один, остальные получат 409.
+    Слот по шаблону (без id) сохраняется; повтор времени - тоже 409.
+    """
+    slot.is_free = False
+    if slot.pk is None:
+        try:
+            with atomic():
+                slot.save()
+        except IntegrityError:
+            raise SlotAlreadyBooked()
+        return
+    updated = Slot.objects.filter(pk=slot.pk, is_free=True).update(
+        is_free=False
+    )
+    if not updated:
+        raise SlotAlreadyBooked()
+
+
 def create_session(request: HttpRequest, slot: Slot) -> Session:
     """
-    Создание сессии;
-    В отдельном потоке: получение ссылок и рассылка эл.писем участникам.
+    Создание сессии; слот по шаблону (без id) сохраняется при записи.
+    Фоновые задачи: получение ссылок Zoom, рассылка эл.писем участникам,
+    напоминания и обновление психолога клиента по окончании сессии.
     """
     user = request.user
     with atomic():
+        reserve_slot(slot)
         # пока используется только один сервис; впоследствии изменим логику
         price = slot.psychologist.services.first().price
-        slot.is_free = False
-        slot.save()
         session = Session.objects.create(
             client=user.client,
             slot=slot,
             price=price,
         )
-
-    context = get_session_context(session=session)
-    ArrangeZoomSendEmailThread(
-        slot=slot, context=context, request=request
-    ).start()
+        enqueue(arrange_zoom_meeting, session_id=session.pk)
+        notify_participants(
+            request,
+            get_session_context(session=session),
+            ("client_created", "psycho_created"),
+        )
+        schedule_reminders(request, session)
+        enqueue(
+            complete_session, run_at=slot.datetime_to, session_id=session.pk
+        )
+    invalidate_card_slots(slot.psychologist_id)
     return session
 
 
@@ -91,17 +166,22 @@ def cancel_session(request: HttpRequest, session_id: int) -> dict:
     with atomic():
         session = get_object_or_404(queryset, id=session_id)
         slot = session.slot
-        slot.is_free = True
-        slot.save()
 
         start = slot.datetime_from
         late_cancel = False if user.is_psychologists else check_if_late(start)
         refund = get_refund_text(user, late_cancel)
         context = get_cancel_session_context(session, refund)
 
-        session.delete()
-
-    SessionCancelEmailThread(request=request, context=context).start()
+        if slot.template_id:
+            # слот снова строится по шаблону, строка в БД не нужна
+            slot.delete()
+        else:
+            slot.is_free = True
+            slot.save()
+            session.delete()
+        notify_participants(
+            request, context, ("client_cancelled", "psycho_cancelled")
+        )
     return {"details": refund}
 
 
@@ -118,7 +198,113 @@ def delete_user_slot(request: HttpRequest, pk: int) -> None:
         context = get_cancel_session_context(
             session=slot.session, refund=refund
         )
-        SessionCancelEmailThread(request=request, context=context).start()
+        notify_participants(
+            request, context, ("client_cancelled", "psycho_cancelled")
+        )
 
     slot.delete()
     return None
+
+
+def expand_weekly_rule(
+    since: date,
+    until: date,
+    weekdays: list[int],
+    times: list[time],
+    tz: Optional[tzinfo] = None,
+) -> list[datetime]:
+    """
+    Даты начала слотов по правилу: дни недели (0 - пн) и время
+    в часовом поясе tz (по умолчанию - TIME_ZONE проекта, UTC).
+    """
+    starts = []
+    day = since
+    while day <= until:
+        if day.weekday() in weekdays:
+            starts.extend(
+                timezone.make_aware(datetime.combine(day, start), tz)
+                for start in times
+            )
+        day += timedelta(days=1)
+    return starts
+
+
+def bulk_create_slots(
+    psychologist: ProfilePsychologist, starts: list[datetime]
+) -> tuple[list[Slot], list[dict]]:
+    """
+    Массовое создание слотов психолога в одной транзакции.
+    Пересечения проверяются в памяти по одному диапазонному запросу
+    существующих слотов. Возвращает созданные слоты и ошибки по элементам.
+    """
+    starts = sorted(starts)
+    now = timezone.now()
+    duration = timedelta(minutes=SESSION_DURATION)
+    slots, errors = [], []
+    with atomic():
+        # блокировка профиля сериализует параллельные пачки психолога
+        ProfilePsychologist.objects.select_for_update().get(
+            pk=psychologist.pk
+        )
+        taken = sorted(
+            Slot.objects.filter(
+                psychologist=psychologist,
+                datetime_from__gt=starts[0] - SLOT_GAP,
+                datetime_from__lt=starts[-1] + SLOT_GAP,
+            ).values_list("datetime_from", flat=True)
+        )
+        for start in starts:
+            if start < now:
+                errors.append(
+                    {"datetime_from": start, "error": SLOT_IN_PAST_ERROR}
+                )
+            elif is_overlapping(taken, start):
+                errors.append(
+                    {"datetime_from": start, "error": SLOT_OVERLAP_ERROR}
+                )
+            else:
+                insort(taken, start)
+                slots.append(
+                    Slot(
+                        psychologist=psychologist,
+                        datetime_from=start,
+                        datetime_to=start + duration,
+                    )
+                )
+        Slot.objects.bulk_create(slots)
+    invalidate_card_slots(psychologist.pk)
+    return slots, errors
+
+
+def create_template(
+    psychologist: ProfilePsychologist, **fields
+) -> AvailabilityTemplate:
+    """
+    Создание шаблона окон записи. Как и при массовом создании слотов,
+    шаблон не должен пересекаться с другими шаблонами и окнами из БД.
+    """
+    template = AvailabilityTemplate(psychologist=psychologist, **fields)
+    with atomic():
+        # блокировка профиля сериализует создание окон психолога
+        ProfilePsychologist.objects.select_for_update().get(
+            pk=psychologist.pk
+        )
+        templates, taken = get_template_overlaps(template, timezone.now())
+        if templates:
+            other = templates[0]
+            raise exceptions.ValidationError(
+                TEMPLATE_OVERLAP_ERROR.format(
+                    weekday=other.get_weekday_display(),
+                    time_from=other.time_from.strftime("%H:%M"),
+                )
+            )
+        if taken:
+            datetimes = ", ".join(
+                timezone.localtime(start).strftime("%d.%m.%Y %H:%M")
+                for start in taken[:5]
+            )
+            raise exceptions.ValidationError(
+                TEMPLATE_SLOT_OVERLAP_ERROR.format(datetimes=datetimes)
+            )
+        template.save()
+    return template
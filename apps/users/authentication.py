@@ -0,0 +1,139 @@
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from apps.clients.models import Client
+from apps.core.utils import is_shared_cache
+from apps.psychologists.models import ProfilePsychologist
+from apps.users.models import CustomUser
+
+# утверждение токена с id профиля клиента или психолога
+PROFILE_CLAIM = "profile_id"
+# поля пользователя, которые передаются в токене
+USER_CLAIMS = ("is_client", "is_psychologists")
+# момент отзыва токенов пользователя (сек): выданные раньше недействительны;
+# для нескольких процессов нужен общий кэш (CACHE_BACKEND)
+REVOKED_KEY = "jwt_revoked:{}"
+TOKEN_REVOKED_ERROR = "Токен отозван."
+USER_INACTIVE_ERROR = "Пользователь не найден или заблокирован."
+
+
+def get_profile_name(user: CustomUser) -> str:
+    """Связь пользователя с профилем по роли."""
+    return "client" if user.is_client else "psychologists"
+
+
+def add_user_claims(token: Token, user: CustomUser) -> Token:
+    """Роль и id профиля пользователя в токене."""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    try:
+        token[PROFILE_CLAIM] = str(getattr(user, get_profile_name(user)).pk)
+    except ObjectDoesNotExist:
+        token[PROFILE_CLAIM] = None
+    return token
+
+
+def revoke_user_tokens(user_id) -> None:
+    """
+    Отзыв всех выданных пользователю токенов: запись живет не дольше
+    самого долгоживущего токена. Вызывается сигналами apps.users.signals
+    при сохранении и удалении пользователя; не отзывают токены изменения
+    в обход save(): QuerySet.update(is_active=..., password=...),
+    bulk_update() и правка таблицы SQL - после них revoke_user_tokens
+    вызывается явно.
+    """
+    timeout = max(
+        api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME
+    )
+    # iat токена - целые секунды: токен, выданный в ту же секунду после
+    # отзыва (повторный вход после смены пароля), остается действительным
+    cache.set(
+        REVOKED_KEY.format(user_id), int(time.time()), timeout.total_seconds()
+    )
+
+
+def check_revoked(token: Token) -> None:
+    revoked_at = cache.get(
+        REVOKED_KEY.format(token.get(api_settings.USER_ID_CLAIM))
+    )
+    if revoked_at is not None and token.get("iat", 0) < revoked_at:
+        raise InvalidToken(TOKEN_REVOKED_ERROR)
+
+
+def get_token_user(token: Token) -> CustomUser:
+    """
+    Пользователь из утверждений токена без запроса к БД. Остальные поля
+    отложены и загружаются из БД при первом обращении; профиль клиента
+    или психолога - такой же отложенный объект с известным id.
+    """
+    db = router.db_for_read(CustomUser)
+    user_id = CustomUser._meta.pk.to_python(
+        token[api_settings.USER_ID_CLAIM]
+    )
+    user = CustomUser.from_db(
+        db,
+        ["id", *USER_CLAIMS],
+        [user_id, *(token[claim] for claim in USER_CLAIMS)],
+    )
+    profile_id = token.get(PROFILE_CLAIM)
+    if profile_id is not None:
+        model = Client if user.is_client else ProfilePsychologist
+        profile = model.from_db(
+            db,
+            ["id", "user_id"],
+            [model._meta.pk.to_python(profile_id), user_id],
+        )
+        # кэши связи один-к-одному в обе стороны
+        profile._state.fields_cache["user"] = user
+        user._state.fields_cache[get_profile_name(user)] = profile
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к БД: роль и id профиля
+    берутся из утверждений токена, отозванные токены отклоняются по записи
+    в кэше. Отзыв виден всем процессам только в общем кэше: с кэшем
+    в памяти процесса утверждения не используются и пользователь, как
+    и для токенов без утверждений, читается из БД с проверкой is_active.
+    """
+
+    def get_user(self, validated_token: Token) -> CustomUser:
+        check_revoked(validated_token)
+        if PROFILE_CLAIM not in validated_token or not is_shared_cache():
+            return super().get_user(validated_token)
+        return get_token_user(validated_token)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user: CustomUser) -> RefreshToken:
+        # утверждения refresh-токена копируются в выпущенные им access-токены
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление access-токена - с проверкой пользователя по БД:
+    заблокированный пользователь, отзыв токенов которого не дошел
+    до кэша, теряет доступ не позже чем через ACCESS_TOKEN_LIFETIME.
+    """
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        check_revoked(refresh)
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        if not CustomUser.objects.filter(pk=user_id, is_active=True).exists():
+            raise InvalidToken(USER_INACTIVE_ERROR)
+        return super().validate(attrs)
@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.constants import ME_CACHE_TIMEOUT
+
+ME_KEY = "user_me:{}"
+
+
+def get_me(user_id) -> Optional[dict]:
+    """Общая информация о пользователе: данные ответа и их ETag."""
+    return cache.get(ME_KEY.format(user_id))
+
+
+def set_me(user_id, data: dict) -> dict:
+    content = json.dumps(data, sort_keys=True, default=str)
+    me = {
+        "data": dict(data),
+        "etag": f'"{hashlib.md5(content.encode()).hexdigest()}"',
+    }
+    cache.set(ME_KEY.format(user_id), me, ME_CACHE_TIMEOUT)
+    return me
+
+
+def invalidate_me(user_id) -> None:
+    # повтор после фиксации транзакции: запрос, закэшировавший
+    # данные до нее, не оставит в кэше старые
+    cache.delete(ME_KEY.format(user_id))
+    transaction.on_commit(lambda: cache.delete(ME_KEY.format(user_id)))
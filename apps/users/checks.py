@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from apps.core.utils import is_shared_cache
+
+CLAIMS_AUTHENTICATION = "apps.users.authentication.ClaimsJWTAuthentication"
+
+
+@register(Tags.security, Tags.caches)
+def check_claims_cache(app_configs, **kwargs) -> list:
+    """
+    Аутентификация по утверждениям токена без общего кэша: отзыв токенов
+    не виден другим процессам, пользователь читается из БД.
+    """
+    classes = settings.REST_FRAMEWORK.get("DEFAULT_AUTHENTICATION_CLASSES", ())
+    if CLAIMS_AUTHENTICATION not in classes or is_shared_cache():
+        return []
+    return [
+        Warning(
+            "ClaimsJWTAuthentication работает без общего кэша.",
+            hint=(
+                "Задайте CACHE_BACKEND (например, RedisCache): иначе "
+                "пользователь каждого запроса читается из БД."
+            ),
+            id="users.W001",
+        )
+    ]
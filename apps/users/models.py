@@ -68,6 +68,14 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    def refresh_from_db(self, using=None, fields=None):
+        # пользователь из токена (apps.users.authentication) загружает
+        # отложенные поля одним запросом при первом обращении к любому
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields)
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
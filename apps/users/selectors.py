@@ -0,0 +1,11 @@
+from django.shortcuts import get_object_or_404
+
+from apps.users.models import CustomUser
+
+
+def get_user_with_profile(user_id) -> CustomUser:
+    """Пользователь с профилем клиента или психолога одним запросом."""
+    return get_object_or_404(
+        CustomUser.objects.select_related("client", "psychologists"),
+        pk=user_id,
+    )
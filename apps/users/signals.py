@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.clients.models import Client
+from apps.psychologists.models import ProfilePsychologist
+from apps.users import cache
+from apps.users.authentication import revoke_user_tokens
+from apps.users.models import CustomUser
+
+
+@receiver(pre_save, sender=CustomUser)
+def revoke_tokens_on_credentials_change(sender, instance, **kwargs):
+    """Смена пароля или блокировка пользователя отзывает его токены."""
+    if instance._state.adding:
+        return
+    fields = kwargs["update_fields"] or ("password", "is_active")
+    fields = [
+        field
+        for field in ("password", "is_active")
+        if field in fields and field not in instance.get_deferred_fields()
+    ]
+    if not fields:
+        return
+    saved = CustomUser.objects.filter(pk=instance.pk).values(*fields).first()
+    if saved and any(
+        saved[field] != getattr(instance, field) for field in fields
+    ):
+        transaction.on_commit(lambda: revoke_user_tokens(instance.pk))
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_me(sender, instance, **kwargs):
+    cache.invalidate_me(instance.pk)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=ProfilePsychologist)
+@receiver(post_delete, sender=ProfilePsychologist)
+def invalidate_me_by_profile(sender, instance, **kwargs):
+    cache.invalidate_me(instance.user_id)
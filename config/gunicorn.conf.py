@@ -0,0 +1,76 @@
+"""
+Настройки gunicorn, значения переопределяются переменными окружения:
+gunicorn -c config/gunicorn.conf.py config.wsgi:application
+
+По умолчанию - воркеры gthread: (2 x CPU + 1) процессов по 1 потоку,
+по замеру каталога (README): дополнительные потоки не прибавили
+пропускной способности и увеличили p99. Для конкретного сервера
+конфигурации сравниваются командой
+python manage.py loadtest --gunicorn 1:1,3:1,3:4,5:4,3:8
+Несколько воркеров требуют общего кэша (CACHE_BACKEND), иначе gunicorn
+не запустится.
+При DB_POOL=True размер пула не меньше числа потоков воркера.
+Под ASGI: GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+и приложение config.asgi:application (потоки не используются).
+"""
+import multiprocessing
+import os
+import sys
+
+bind = os.getenv("GUNICORN_BIND", default="0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", default="gthread")
+workers = int(
+    os.getenv("GUNICORN_WORKERS", default=multiprocessing.cpu_count() * 2 + 1)
+)
+threads = int(os.getenv("GUNICORN_THREADS", default=1))
+
+# приложение загружается в мастере до fork: код и шаблоны писем
+# разделяются воркерами через copy-on-write
+preload_app = os.getenv("GUNICORN_PRELOAD", default="True") == "True"
+
+# перезапуск воркера после max_requests запросов ограничивает рост памяти;
+# разброс не дает всем воркерам перезапуститься одновременно
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", default=1000))
+max_requests_jitter = int(
+    os.getenv("GUNICORN_MAX_REQUESTS_JITTER", default=100)
+)
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", default=30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", default=30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", default=5))
+
+# журнал запросов с временем ответа в мс (%(M)s)
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", default="-")
+errorlog = "-"
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(M)sms "%(a)s"'
+
+
+def on_starting(server):
+    # версии справочников, сброс кэша карточек, ключи идемпотентности
+    # и отзыв токенов видны всем воркерам только через общий кэш
+    if workers < 2:
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from apps.core.utils import is_shared_cache
+
+    if not is_shared_cache():
+        server.log.error(
+            "Кэш в памяти процесса при %s воркерах: задайте CACHE_BACKEND "
+            "(redis, memcached) или GUNICORN_WORKERS=1",
+            workers,
+        )
+        sys.exit(1)
+
+
+def pre_fork(server, worker):
+    # соединения с БД, открытые мастером при загрузке приложения,
+    # не должны достаться воркерам общими сокетами
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+        # пул (DB_POOL) при закрытии возвращает соединения себе,
+        # а не закрывает: закрываются и удаляются сами пулы
+        pool = sys.modules.get("apps.core.db.postgresql_pool.base")
+        if pool is not None:
+            pool.close_pools()
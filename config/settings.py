@@ -81,6 +81,41 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        # постоянные соединения: время жизни в секундах, 0 - закрывать
+        # после каждого запроса, None - без ограничения
+        "CONN_MAX_AGE": (
+            None
+            if os.getenv("DB_CONN_MAX_AGE") == "None"
+            else int(os.getenv("DB_CONN_MAX_AGE", default=60))
+        ),
+        "CONN_HEALTH_CHECKS": (
+            os.getenv("DB_CONN_HEALTH_CHECKS", default="True") == "True"
+        ),
+    }
+}
+
+# DB_POOL=True: пул соединений в памяти процесса для потоковых воркеров
+# (только PostgreSQL); соединение возвращается в пул после каждого запроса.
+# Сверх DB_POOL_MAX_SIZE запрос ждет соединение DB_POOL_TIMEOUT сек;
+# простоявшее дольше DB_POOL_CHECK_AFTER сек проверяется перед выдачей
+if os.getenv("DB_POOL", default="False") == "True":
+    DATABASES["default"].update(
+        ENGINE="apps.core.db.postgresql_pool",
+        CONN_MAX_AGE=0,
+        POOL_MAX_SIZE=int(os.getenv("DB_POOL_MAX_SIZE", default=10)),
+        POOL_TIMEOUT=float(os.getenv("DB_POOL_TIMEOUT", default=10)),
+        POOL_CHECK_AFTER=float(os.getenv("DB_POOL_CHECK_AFTER", default=30)),
+    )
+
+# По умолчанию кэш в памяти процесса; для общего кэша между процессами
+# задаются CACHE_BACKEND и CACHE_LOCATION (redis, memcached)
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", default=""),
     }
 }
 
@@ -91,7 +126,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -105,8 +140,24 @@ REST_FRAMEWORK = {
 AUTH_USER_MODEL = "users.CustomUser"
 
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
+    # срок жизни токенов (мин, дни); по умолчанию 7 дней, фронтенд
+    # не обновляет access-токен. Короткий срок (например, 30 мин)
+    # ограничивает действие отзыва, не дошедшего до кэша: refresh
+    # проверяет пользователя по БД
+    "ACCESS_TOKEN_LIFETIME": timedelta(
+        minutes=int(os.getenv("JWT_ACCESS_LIFETIME", default=7 * 24 * 60))
+    ),
+    "REFRESH_TOKEN_LIFETIME": timedelta(
+        days=int(os.getenv("JWT_REFRESH_LIFETIME", default=1))
+    ),
     "AUTH_HEADER_TYPES": ("JWT",),
+    # роль и id профиля в токене: запросы проходят без чтения пользователя
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "apps.users.authentication.ClaimsTokenObtainPairSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "apps.users.authentication.ClaimsTokenRefreshSerializer"
+    ),
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -165,8 +216,34 @@ EMAIL_PORT = os.getenv("EMAIL_PORT", default=587)
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", default=EMAIL_SENDER)
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", default="email_pass")
 DEFAULT_FROM_EMAIL = os.getenv("EMAIL_HOST_USER", default=EMAIL_SENDER)
+# время простоя, в течение которого соединение с почтовым сервером
+# переиспользуется следующими письмами, сек
+EMAIL_CONNECTION_REUSE = float(os.getenv("EMAIL_CONNECTION_REUSE", default=30))
 
 # Zoom settings
 ZOOM_CLIENT_ID = os.getenv("ZOOM_CLIENT_ID", default="client_id")
 ZOOM_ACCOUNT_ID = os.getenv("ZOOM_ACCOUNT_ID", default="account_id")
 ZOOM_CLIENT_SECRET = os.getenv("ZOOM_CLIENT_SECRET", default="client_secret")
+ZOOM_AUTH_URL = os.getenv("ZOOM_AUTH_URL", default="https://zoom.us/oauth/token")
+ZOOM_API_URL = os.getenv("ZOOM_API_URL", default="https://api.zoom.us/v2")
+# таймауты запросов к Zoom: установка соединения и ответ, сек
+ZOOM_CONNECT_TIMEOUT = float(os.getenv("ZOOM_CONNECT_TIMEOUT", default=3.05))
+ZOOM_READ_TIMEOUT = float(os.getenv("ZOOM_READ_TIMEOUT", default=10))
+# размер пула keep-alive соединений: не меньше числа потоков исполнителя
+ZOOM_POOL_SIZE = int(os.getenv("ZOOM_POOL_SIZE", default=10))
+
+# ASYNC_VIEWS=True: асинхронные представления каталога для запуска под
+# ASGI (uvicorn); под WSGI каждый такой запрос обходится дороже
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", default="False") == "True"
+
+# Фоновые задачи: исполнитель - команда run_jobs;
+# JOBS_ALWAYS_EAGER выполняет задачи сразу в потоке запроса (тесты, отладка)
+JOBS_ALWAYS_EAGER = os.getenv("JOBS_ALWAYS_EAGER", default="False") == "True"
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", default=4))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", default=1))
+
+# За сколько часов до начала сессии участникам отправляются напоминания
+SESSION_REMINDER_OFFSETS = [
+    int(hours)
+    for hours in os.getenv("SESSION_REMINDER_OFFSETS", default="24,1").split(",")
+]
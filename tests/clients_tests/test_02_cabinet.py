@@ -0,0 +1,102 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from apps.clients.selectors import get_next_session
+from apps.core.jobs import get_job_name
+from apps.core.models import Job
+from apps.session.jobs import complete_session
+from apps.session.models import Session, Slot
+
+
+def create_session(client, psychologist, datetime_from):
+    slot = Slot.objects.create(
+        psychologist=psychologist, datetime_from=datetime_from, is_free=False
+    )
+    return Session.objects.create(client=client, slot=slot, price=1000)
+
+
+@pytest.mark.django_db()
+class Test02Cabinet:
+    profile_url = reverse("client_profile")
+
+    def get_cabinet(self, client_client):
+        with CaptureQueriesContext(connection) as context:
+            response = client_client.get(self.profile_url)
+        assert response.status_code == HTTPStatus.OK
+        return response.data, len(context.captured_queries)
+
+    def test_01_constant_queries(
+        self, client_client, client_user, psychologists
+    ):
+        """Запросы ЛК клиента не зависят от длины истории сессий."""
+        client = client_user.client
+        now = timezone.now().replace(microsecond=0)
+        create_session(client, psychologists[0], now + timedelta(days=1))
+        last = create_session(
+            client, psychologists[1], now - timedelta(days=1)
+        )
+        _, short = self.get_cabinet(client_client)
+
+        for day in range(2, 12):
+            session = create_session(
+                client, psychologists[day], now - timedelta(days=day)
+            )
+            complete_session(session.pk)
+        complete_session(last.pk)
+        data, long = self.get_cabinet(client_client)
+        assert short == long
+        assert data["next_session"]["psychologist"]["id"] == str(
+            psychologists[0].pk
+        )
+        assert data["my_psychologist"]["id"] == str(psychologists[1].pk)
+        assert data["my_psychologist"]["price"] == psychologists[1].min_price
+
+    def test_02_complete_session(self, client_user, psychologists):
+        """Опоздавшая задача не затирает психолога более поздней сессии."""
+        client = client_user.client
+        now = timezone.now()
+        latest = create_session(
+            client, psychologists[0], now - timedelta(days=1)
+        )
+        earlier = create_session(
+            client, psychologists[1], now - timedelta(days=2)
+        )
+        complete_session(latest.pk)
+        complete_session(earlier.pk)
+        client.refresh_from_db()
+        assert client.last_psychologist == psychologists[0]
+
+    def test_03_scheduled(self, client_client, psychologist, zoom_stub):
+        """Запись на сессию ставит задачу на момент ее окончания."""
+        slot = psychologist.slots.first()
+        client_client.post(
+            reverse("create_session"), {"slot": slot.id}, format="json"
+        )
+        job = Job.objects.get(name=get_job_name(complete_session))
+        assert job.run_at == slot.datetime_to
+
+    def test_04_next_session(self, client_user, psychologists):
+        """Ближайшая оплаченная сессия ищется по началу в самой сессии."""
+        client = client_user.client
+        now = timezone.now().replace(microsecond=0)
+        create_session(client, psychologists[0], now + timedelta(days=3))
+        nearest = create_session(
+            client, psychologists[1], now + timedelta(days=2)
+        )
+        unpaid = create_session(
+            client, psychologists[2], now + timedelta(days=1)
+        )
+        Session.objects.filter(pk=unpaid.pk).update(
+            status=Session.Status.UNPAID
+        )
+        with CaptureQueriesContext(connection) as context:
+            assert get_next_session(client) == nearest
+        where = context.captured_queries[0]["sql"].split("WHERE")[1]
+        assert '"session_session"."datetime_from"' in where
+        assert '"session_slot"' not in where
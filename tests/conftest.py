@@ -1,4 +1,29 @@
+import pytest
+from django.conf import settings
+
 pytest_plugins = [
     "tests.users_tests.fixtures_users",
     "tests.clients_tests.fixtures_clients",
+    "tests.psychologists_tests.fixtures_psychologists",
+    "tests.sessions_tests.fixtures_sessions",
+    "tests.core_tests.fixtures_core",
 ]
+
+
+@pytest.fixture(autouse=True)
+def eager_jobs(settings):
+    """Фоновые задачи выполняются сразу, без исполнителя run_jobs."""
+    settings.JOBS_ALWAYS_EAGER = True
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(tmp_path_factory):
+    """
+    Тестовая SQLite-база в файле, а не в памяти: параллельные транзакции
+    в тестах на гонки ждут блокировку, а не падают с ошибкой.
+    """
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        database.setdefault("TEST", {})["NAME"] = str(
+            tmp_path_factory.mktemp("db") / "test.sqlite3"
+        )
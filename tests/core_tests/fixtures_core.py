@@ -0,0 +1,123 @@
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from apps.core.email import dispatcher
+
+
+class FakeZoomHandler(BaseHTTPRequestHandler):
+    """Сервер авторизации и API Zoom: выдает токен и создает встречи."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        if self.path == "/oauth/token":
+            server.token_requests += 1
+            token = f"token-{server.token_requests}"
+            server.tokens.add(token)
+            self.respond(
+                200,
+                {"access_token": token, "expires_in": server.expires_in},
+            )
+        elif self.headers["Authorization"][len("Bearer "):] in server.tokens:
+            server.meetings += 1
+            self.respond(
+                201,
+                {
+                    "join_url": f"https://zoom/j/{server.meetings}",
+                    "start_url": f"https://zoom/s/{server.meetings}",
+                },
+            )
+        else:
+            self.respond(401, {"message": "Invalid access token."})
+
+    def respond(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def zoom_server():
+    """Локальный сервер Zoom: счетчики токенов, встреч и TCP-соединений."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeZoomHandler)
+    server.daemon_threads = True
+    server.connections = server.token_requests = server.meetings = 0
+    server.tokens = set()
+    server.expires_in = 3600
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает письма, считает соединения."""
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost ESMTP")
+        while True:
+            line = self.rfile.readline().decode()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.messages += 1
+                self.reply("250 OK")
+                if self.server.drop_after_message:
+                    return
+            elif command == "QUIT":
+                self.server.quits += 1
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+    def reply(self, text):
+        self.wfile.write(f"{text}\r\n".encode())
+
+
+@pytest.fixture
+def smtp_server(settings):
+    """Локальный SMTP-сервер, на который настроена отправка писем."""
+    server = socketserver.ThreadingTCPServer(
+        ("127.0.0.1", 0), FakeSMTPHandler
+    )
+    server.daemon_threads = True
+    server.connections = server.messages = server.quits = 0
+    server.drop_after_message = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = "127.0.0.1"
+    settings.EMAIL_PORT = server.server_address[1]
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    dispatcher.close()
+    yield server
+    dispatcher.close()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.core.constants import JOB_MAX_ATTEMPTS
+from apps.core.jobs import claim_jobs, enqueue, job, run_job
+from apps.core.models import Job
+
+calls = []
+
+
+@job
+def remember(value: int) -> None:
+    calls.append(value)
+
+
+@job
+def fail() -> None:
+    raise RuntimeError("ошибка задачи")
+
+
+@pytest.fixture
+def queued_jobs(settings):
+    settings.JOBS_ALWAYS_EAGER = False
+    calls.clear()
+
+
+class Test01Jobs:
+    @pytest.mark.django_db
+    def test_01_eager(self):
+        """В тестовом режиме задача выполняется сразу."""
+        calls.clear()
+        assert enqueue(remember, value=1) is None
+        assert calls == [1]
+        assert not Job.objects.exists()
+
+    @pytest.mark.django_db
+    def test_02_eager_delayed(self):
+        """Отложенная задача и в тестовом режиме ждет своего срока."""
+        calls.clear()
+        run_at = timezone.now() + timedelta(hours=1)
+        item = enqueue(remember, run_at=run_at, value=1)
+        assert calls == []
+        assert item.status == Job.Status.PENDING
+        assert not claim_jobs(10)
+
+    @pytest.mark.django_db
+    def test_03_retry_and_dead(self, queued_jobs):
+        """Упавшая задача повторяется с задержкой, затем - статус dead."""
+        item = enqueue(fail)
+        delays = []
+        for attempt in range(1, JOB_MAX_ATTEMPTS + 1):
+            Job.objects.filter(pk=item.pk).update(run_at=timezone.now())
+            claimed = claim_jobs(10)
+            assert [job.pk for job in claimed] == [item.pk]
+            assert claimed[0].attempts == attempt
+            started = timezone.now()
+            run_job(claimed[0])
+            item.refresh_from_db()
+            delays.append(item.run_at - started)
+        assert item.status == Job.Status.DEAD
+        assert "ошибка задачи" in item.last_error
+        assert delays[1] > delays[0] * 1.9, "Задержка повтора не растет."
+        assert not claim_jobs(10)
+
+    @pytest.mark.django_db
+    def test_04_stale_lock(self, queued_jobs):
+        """Задача упавшего исполнителя выдается снова."""
+        item = enqueue(remember, value=2)
+        claim_jobs(10)
+        assert not claim_jobs(10), "Захваченная задача выдана повторно."
+        Job.objects.filter(pk=item.pk).update(
+            locked_at=timezone.now() - timedelta(days=1)
+        )
+        assert [job.pk for job in claim_jobs(10)] == [item.pk]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_worker(self, queued_jobs):
+        """Исполнитель выполняет очередь пачками в нескольких потоках."""
+        for value in range(10):
+            enqueue(remember, value=value)
+        call_command("run_jobs", "--once", "--concurrency", "3")
+        assert sorted(calls) == list(range(10))
+        assert Job.objects.filter(status=Job.Status.DONE).count() == 10
@@ -0,0 +1,57 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from apps.core.zoom import ZoomClient
+
+START = datetime(2030, 1, 1, 10, 0)
+
+
+@pytest.fixture
+def zoom_client(zoom_server):
+    client = ZoomClient(
+        auth_url=f"{zoom_server.url}/oauth/token",
+        api_url=f"{zoom_server.url}/v2",
+    )
+    yield client
+    client.session.close()
+
+
+class Test02Zoom:
+    def test_01_token_cache(self, zoom_server, zoom_client):
+        """Токен запрашивается один раз, соединение переиспользуется."""
+        links = [zoom_client.create_meeting(START) for _ in range(3)]
+        assert links[-1] == ("https://zoom/j/3", "https://zoom/s/3")
+        assert zoom_server.token_requests == 1
+        assert zoom_server.connections == 1, "Нет keep-alive соединения."
+
+    def test_02_token_expired(self, zoom_server, zoom_client):
+        """Токен, истекающий в пределах запаса, запрашивается заново."""
+        zoom_server.expires_in = 30
+        zoom_client.create_meeting(START)
+        zoom_client.create_meeting(START)
+        assert zoom_server.token_requests == 2
+
+    def test_03_token_revoked(self, zoom_server, zoom_client):
+        """Отозванный токен обновляется, встреча все равно создается."""
+        zoom_client.create_meeting(START)
+        zoom_server.tokens.clear()
+        assert zoom_client.create_meeting(START) == (
+            "https://zoom/j/2",
+            "https://zoom/s/2",
+        )
+        assert zoom_server.token_requests == 2
+
+    def test_04_threads(self, zoom_server, zoom_client):
+        """Параллельные потоки получают один общий токен."""
+        threads = [
+            threading.Thread(target=zoom_client.create_meeting, args=(START,))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert zoom_server.meetings == 8
+        assert zoom_server.token_requests == 1
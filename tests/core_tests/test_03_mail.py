@@ -0,0 +1,109 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time
+from http import HTTPStatus
+
+import pytest
+from rest_framework.reverse import reverse
+from templated_mail.mail import BaseEmailMessage
+
+from apps.core import email
+from apps.core.email import ConfirmationEmail, dispatcher, send_email
+from apps.core.jobs import get_job_name
+from apps.core.models import Job
+from apps.session.jobs import send_session_emails
+
+
+def message():
+    return ConfirmationEmail(context={"user": None})
+
+
+class Test03Mail:
+    def test_01_batch(self, smtp_server):
+        """Пачка писем уходит через одно соединение."""
+        dispatcher.send(
+            [(message(), ["client@mail.ru"]), (message(), ["psy@mail.ru"])]
+        )
+        assert smtp_server.messages == 2
+        assert smtp_server.connections == 1
+
+    def test_02_reuse_window(self, smtp_server, settings):
+        """Соединение переиспользуется только в пределах окна простоя."""
+        send_email(message(), ["client@mail.ru"])
+        send_email(message(), ["client@mail.ru"])
+        assert smtp_server.connections == 1
+        settings.EMAIL_CONNECTION_REUSE = 0
+        send_email(message(), ["client@mail.ru"])
+        assert smtp_server.messages == 3
+        assert smtp_server.connections == 2
+
+    def test_03_server_disconnect(self, smtp_server):
+        """Закрытое сервером соединение открывается заново."""
+        smtp_server.drop_after_message = True
+        send_email(message(), ["client@mail.ru"])
+        send_email(message(), ["client@mail.ru"])
+        assert smtp_server.messages == 2
+        assert smtp_server.connections == 2
+
+    def test_04_thread_connections(self, smtp_server, settings):
+        """
+        Потоки отправляют параллельно через свои соединения, простаивающие
+        соединения закрывает close_idle.
+        """
+        barrier = threading.Barrier(2)
+
+        def send(address):
+            barrier.wait()
+            send_email(message(), [address])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(send, ["client@mail.ru", "psy@mail.ru"]))
+            assert smtp_server.messages == 2
+            assert smtp_server.connections == 2
+
+            dispatcher.close_idle()
+            assert smtp_server.quits == 0
+            settings.EMAIL_CONNECTION_REUSE = 0
+            dispatcher.close_idle()
+            assert smtp_server.quits == 2
+
+    @pytest.mark.django_db
+    def test_05_session_emails(self, client_client, psychologist, smtp_server,
+                               zoom_stub, settings):
+        """Письма участникам о записи - одной задачей и одним соединением."""
+        response = client_client.post(
+            reverse("create_session"),
+            {"slot": psychologist.slots.first().id},
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.data
+        assert smtp_server.messages == 2
+        assert smtp_server.connections == 1
+
+        settings.JOBS_ALWAYS_EAGER = False
+        client_client.delete(
+            reverse("cancel_session", kwargs={"pk": response.data["id"]})
+        )
+        jobs = Job.objects.filter(name=get_job_name(send_session_emails))
+        assert jobs.count() == 1
+
+    def test_06_compiled_template(self, monkeypatch):
+        """Скомпилированный шаблон дает то же письмо без повторной загрузки."""
+        context = {
+            "psycho_name": "Психолог",
+            "date": date(2030, 1, 1),
+            "time": time(10, 0),
+            "domain": "sharewithme.site",
+        }
+        expected = email.ClientNewSessionEmail(context=dict(context))
+        BaseEmailMessage.render(expected)
+
+        monkeypatch.setattr(email, "get_template", None)
+        for _ in range(2):
+            message = email.ClientNewSessionEmail(context=dict(context))
+            message.render()
+            assert (message.subject, message.body) == (
+                expected.subject,
+                expected.body,
+            )
+            assert message.alternatives == expected.alternatives
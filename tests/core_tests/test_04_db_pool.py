@@ -0,0 +1,110 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from apps.core.db.postgresql_pool import base
+
+
+class FakeConnection:
+    """Соединение без сервера: считает проверочные запросы."""
+
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = True
+        self.pings = 0
+        self.info = type("Info", (), {})()
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def execute(self, sql):
+                connection.pings += 1
+
+        return Cursor()
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connects(monkeypatch):
+    created = []
+
+    def connect(**params):
+        created.append(FakeConnection())
+        return created[-1]
+
+    monkeypatch.setattr(base.psycopg2, "connect", connect)
+    return created
+
+
+class Test04DbPool:
+    def test_01_keeps_idle_connections(self, connects):
+        """Возвращенные соединения хранятся до max_size, а не закрываются."""
+        pool = base.ConnectionPool({}, max_size=3, timeout=1)
+        taken = [pool.getconn() for _ in range(3)]
+        for connection in taken:
+            pool.putconn(connection)
+        again = [pool.getconn() for _ in range(3)]
+        assert len(connects) == 3
+        assert sorted(map(id, again)) == sorted(map(id, taken))
+        assert not any(connection.closed for connection in connects)
+
+    def test_02_waits_for_connection(self, connects):
+        """Сверх max_size поток ждет освободившееся соединение."""
+        pool = base.ConnectionPool({}, max_size=1, timeout=2)
+        connection = pool.getconn()
+        timer = threading.Timer(0.1, pool.putconn, [connection])
+        timer.start()
+        assert pool.getconn() is connection
+        timer.join()
+
+        pool.timeout = 0.1
+        started = time.monotonic()
+        with pytest.raises(psycopg2.OperationalError):
+            pool.getconn()
+        assert time.monotonic() - started < 1
+
+    def test_03_checks_only_long_idle(self, connects):
+        """Проверочный запрос - только для долго простоявших соединений."""
+        pool = base.ConnectionPool({}, max_size=1, timeout=1, check_after=60)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        assert pool.getconn() is connection
+        assert connection.pings == 0
+
+        pool.check_after = 0
+        pool.putconn(connection)
+        assert pool.getconn() is connection
+        assert connection.pings == 1
+
+    def test_04_drops_broken_connections(self, connects):
+        pool = base.ConnectionPool({}, max_size=1, timeout=1)
+        connection = pool.getconn()
+        connection.closed = 2
+        pool.putconn(connection)
+        assert pool.getconn() is not connection
+
+    def test_05_close_pools(self, connects, monkeypatch):
+        """Перед fork пулы закрывают свободные соединения и удаляются."""
+        monkeypatch.setattr(base, "pools", {})
+        pool = base.pools["default"] = base.ConnectionPool(
+            {}, max_size=2, timeout=1
+        )
+        taken = [pool.getconn() for _ in range(2)]
+        for connection in taken:
+            pool.putconn(connection)
+        base.close_pools()
+        assert base.pools == {}
+        assert all(connection.closed for connection in connects)
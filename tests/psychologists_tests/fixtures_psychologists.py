@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.models import UploadFile
+from apps.psychologists.models import (
+    Approach,
+    Institute,
+    ProfilePsychologist,
+    PsychoEducation,
+    Theme,
+)
+from apps.psychologists.services import create_service
+from apps.session.models import Slot
+
+
+def create_psychologist(django_user_model, number, slots=3):
+    """Верифицированный психолог с услугой и свободными слотами."""
+    user = django_user_model.objects.create_user(
+        email=f"psycho_{number}@unexistingmail.ru",
+        password="zz11xx22cc33",
+        is_client=False,
+        is_psychologists=True,
+        is_active=True,
+    )
+    psychologist = ProfilePsychologist.objects.create(
+        user=user,
+        first_name=f"Психолог {number}",
+        last_name="Психологов",
+        birthday=date(1980, 1, 1),
+        gender="female",
+        started_working=date(2010, 1, 1),
+        about="О себе",
+        is_verified=True,
+    )
+    create_service(psychologist, 1000 + number)
+    start = timezone.now().replace(microsecond=0) + timedelta(hours=2)
+    for hour in range(slots):
+        Slot.objects.create(
+            psychologist=psychologist,
+            datetime_from=start + timedelta(hours=2 * hour),
+        )
+    return psychologist
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """
+    Кэши не должны переживать откат транзакции теста; вместе с версиями
+    справочников в общем кэше сбрасываются и их копии в памяти процесса.
+    """
+    cache.clear()
+
+
+@pytest.fixture
+def psychologists(django_user_model):
+    return [
+        create_psychologist(django_user_model, number)
+        for number in range(12)
+    ]
+
+
+@pytest.fixture
+def psychologist(django_user_model):
+    return create_psychologist(django_user_model, 100)
+
+
+@pytest.fixture
+def themes():
+    return [Theme.objects.create(title=f"Тема {i}") for i in range(5)]
+
+
+@pytest.fixture
+def approaches():
+    return [Approach.objects.create(title=f"Подход {i}") for i in range(3)]
+
+
+@pytest.fixture
+def education(psychologist):
+    """Два высших образования и один курс психолога."""
+    for number, is_higher in enumerate((True, True, False)):
+        PsychoEducation.objects.create(
+            psychologist=psychologist,
+            institute=Institute.objects.create(
+                title=f"Институт {number}", is_higher=is_higher
+            ),
+            speciality="Психолог",
+            graduation_year="2005",
+            document=UploadFile.objects.create(path=f"uploads/{number}.pdf"),
+        )
+    return psychologist.psychoeducation.all()
+
+
+@pytest.fixture
+def psycho_client(psychologist):
+    client = APIClient()
+    token = AccessToken.for_user(psychologist.user)
+    client.credentials(HTTP_AUTHORIZATION=f"JWT {token}")
+    return client
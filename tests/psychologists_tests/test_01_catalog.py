@@ -0,0 +1,134 @@
+from datetime import time, timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from apps.psychologists.services import create_service, update_service
+from apps.session.models import AvailabilityTemplate
+
+
+def count_slot_queries(queries):
+    return sum('"session_slot"' in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db()
+class Test01Catalog:
+    catalog_url = reverse("catalog")
+
+    @pytest.mark.parametrize("limit", (1, 5, 12))
+    def test_01_catalog_slots_single_query(
+        self, guest_client, psychologists, limit
+    ):
+        """Слоты страницы каталога загружаются одним запросом."""
+        with CaptureQueriesContext(connection) as context:
+            response = guest_client.get(self.catalog_url, {"limit": limit})
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data["results"]) == limit
+        assert count_slot_queries(context.captured_queries) == 1, (
+            "Слоты психологов в каталоге должны загружаться одним запросом "
+            f"на страницу, а не для каждой карточки (limit={limit})."
+        )
+        for card in response.data["results"]:
+            assert len(card["slots"]) == 3, (
+                "В карточке каталога отображаются не все свободные слоты."
+            )
+
+    def test_02_catalog_fixed_query_count(self, guest_client, psychologists):
+        """Число запросов каталога не зависит от размера страницы."""
+        counts = []
+        for limit in (1, 12):
+            with CaptureQueriesContext(connection) as context:
+                guest_client.get(self.catalog_url, {"limit": limit})
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            "Количество запросов к БД в каталоге растет вместе с размером "
+            f"страницы: {counts}."
+        )
+
+    def test_03_min_price_sync(self, guest_client, psychologist):
+        """Минимальная цена психолога обновляется вместе с услугами."""
+        create_service(psychologist, 500, type="personal")
+        psychologist.refresh_from_db()
+        assert psychologist.min_price == 500
+        update_service(psychologist, 5000, type="personal")
+        psychologist.refresh_from_db()
+        assert psychologist.min_price == 1100
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        assert guest_client.get(url).data["price"] == 1100
+
+    def test_04_catalog_price_filter_and_ordering(
+        self, guest_client, psychologists
+    ):
+        """Фильтрация каталога по диапазону цен и сортировка по цене."""
+        response = guest_client.get(
+            self.catalog_url,
+            {"price_min": 1003, "price_max": 1006, "ordering": "-price"},
+        )
+        assert response.status_code == HTTPStatus.OK
+        prices = [card["price"] for card in response.data["results"]]
+        assert prices == [1006, 1005, 1004, 1003], (
+            "Каталог неверно фильтруется или сортируется по цене."
+        )
+
+    def test_05_catalog_nearest_slot_ordering(
+        self, guest_client, psychologists
+    ):
+        """Психологи без свободных окон в конце сортировки."""
+        psychologists[0].slots.update(is_free=False)
+        response = guest_client.get(
+            self.catalog_url, {"ordering": "nearest_slot", "limit": 12}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["results"][-1]["id"] == str(psychologists[0].id)
+
+    def test_06_nearest_slot_templates(self, guest_client, psychologists):
+        """Слоты по шаблонам учитываются в сортировке, как в карточках."""
+        for psychologist in psychologists[:2]:
+            psychologist.slots.update(is_free=False)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        AvailabilityTemplate.objects.create(
+            psychologist=psychologists[0],
+            weekday=tomorrow.weekday(),
+            time_from=time(10),
+            valid_from=timezone.localdate(),
+        )
+        response = guest_client.get(
+            self.catalog_url, {"ordering": "nearest_slot", "limit": 12}
+        )
+        assert response.status_code == HTTPStatus.OK
+        ids = [card["id"] for card in response.data["results"]]
+        assert ids[-2:] == [str(psychologists[0].id), str(psychologists[1].id)]
+        card = response.data["results"][-2]
+        assert len(card["slots"]) == 1
+
+    def test_07_catalog_cursor_pagination(self, guest_client, psychologists):
+        """Курсорная пагинация обходит каталог без COUNT-запросов."""
+        ids = []
+        url, params = self.catalog_url, {"pagination": "cursor", "limit": 5}
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = guest_client.get(url, params)
+            assert response.status_code == HTTPStatus.OK
+            assert "count" not in response.data
+            assert not any(
+                "COUNT(" in query["sql"] for query in context.captured_queries
+            ), "Курсорная пагинация не должна считать общее количество."
+            ids.extend(card["id"] for card in response.data["results"])
+            url, params = response.data["next"], None
+        assert ids == sorted(str(obj.id) for obj in psychologists)
+
+        response = guest_client.get(
+            self.catalog_url, {"pagination": "cursor", "count": "true"}
+        )
+        assert response.data["count"] == len(psychologists)
+
+    def test_08_card_slots(self, guest_client, psychologist):
+        """В полной карточке отображаются свободные слоты."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        response = guest_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data["slots"]) == 3
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+
+@pytest.fixture
+def themed_psychologists(psychologists, themes):
+    """Первые 6 психологов работают со всеми темами, остальные - с одной."""
+    for psychologist in psychologists[:6]:
+        psychologist.themes.set(themes)
+    for psychologist in psychologists[6:]:
+        psychologist.themes.set(themes[:1])
+    return psychologists
+
+
+@pytest.mark.django_db()
+class Test02CatalogFilters:
+    catalog_url = reverse("catalog")
+
+    def test_01_themes_any_without_duplicates(
+        self, guest_client, themed_psychologists, themes
+    ):
+        """Выбор нескольких тем не размножает психологов в выдаче."""
+        titles = [theme.title for theme in themes]
+        response = guest_client.get(
+            self.catalog_url, {"themes": titles, "limit": 50}
+        )
+        assert response.status_code == HTTPStatus.OK
+        ids = [card["id"] for card in response.data["results"]]
+        assert response.data["count"] == len(themed_psychologists)
+        assert len(ids) == len(set(ids)), "Психологи в каталоге дублируются."
+
+    def test_02_themes_all(self, guest_client, themed_psychologists, themes):
+        """Режим match=all оставляет психологов со всеми темами."""
+        response = guest_client.get(
+            self.catalog_url,
+            {"themes": [theme.title for theme in themes], "match": "all"},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["count"] == 6
+
+        title = themes[1].title
+        response = guest_client.get(
+            self.catalog_url, {"themes": [title, title], "match": "all"}
+        )
+        assert response.data["count"] == 6, "Повтор темы не должен мешать."
+
+    def test_03_unknown_theme(self, guest_client, themed_psychologists):
+        """Несуществующая тема - ошибка валидации."""
+        response = guest_client.get(self.catalog_url, {"themes": ["Нет"]})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_constant_cost(
+        self, guest_client, themed_psychologists, themes
+    ):
+        """Стоимость фильтрации не растет с количеством выбранных тем."""
+        guest_client.get(self.catalog_url, {"themes": themes[0].title})
+        counts = []
+        for number in range(1, len(themes) + 1):
+            titles = [theme.title for theme in themes[:number]]
+            for match in ("any", "all"):
+                with CaptureQueriesContext(connection) as context:
+                    guest_client.get(
+                        self.catalog_url, {"themes": titles, "match": match}
+                    )
+                queries = context.captured_queries
+                counts.append(len(queries))
+                assert not any(
+                    '"psychologists_theme"' in query["sql"]
+                    for query in queries
+                ), "Названия тем должны переводиться в id без запросов."
+                assert all(
+                    query["sql"].count("JOIN") == 0 for query in queries
+                ), "Фильтр по темам не должен использовать JOIN."
+        assert len(set(counts)) == 1, (
+            f"Количество запросов зависит от числа выбранных тем: {counts}."
+        )
+
+    def test_05_search(self, guest_client, themed_psychologists, themes):
+        """Поиск по имени, тексту «о себе» и названию темы."""
+        psychologist = themed_psychologists[3]
+        psychologist.about = "Работаю с выгоранием"
+        psychologist.save()
+        cases = (
+            ("Психолог 1", {"Психолог 1", "Психолог 10", "Психолог 11"}),
+            ("выгоранием", {psychologist.first_name}),
+            (
+                themes[2].title,
+                {item.first_name for item in themed_psychologists[:6]},
+            ),
+        )
+        for text, expected in cases:
+            response = guest_client.get(
+                self.catalog_url, {"search": text, "limit": 50}
+            )
+            assert response.status_code == HTTPStatus.OK
+            names = {card["first_name"] for card in response.data["results"]}
+            assert names == expected, f"Поиск по «{text}»."
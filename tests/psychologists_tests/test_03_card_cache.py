@@ -0,0 +1,78 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+from apps.psychologists.services import update_service
+
+
+@pytest.mark.django_db()
+class Test03CardCache:
+    def test_01_cached_card_without_queries(self, guest_client, psychologist):
+        """Повторный запрос карточки не обращается к БД."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        first = guest_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = guest_client.get(url)
+        assert second.status_code == HTTPStatus.OK
+        assert second.data == first.data
+        assert len(context.captured_queries) == 0, (
+            "Закэшированная карточка психолога не должна обращаться к БД."
+        )
+
+    def test_02_slot_change_keeps_profile(self, guest_client, psychologist):
+        """Изменение слотов сбрасывает только кэш слотов."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        guest_client.get(url)
+        slot = psychologist.slots.first()
+        slot.is_free = False
+        slot.save()
+        with CaptureQueriesContext(connection) as context:
+            response = guest_client.get(url)
+        assert len(response.data["slots"]) == 2
+        assert not any(
+            "psychologists_" in query["sql"]
+            for query in context.captured_queries
+        ), "После изменения слота карточка должна перечитывать только слоты."
+
+    def test_03_invalidation(self, guest_client, psychologist, themes):
+        """Изменения профиля, услуг и тем сбрасывают кэш карточки."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        guest_client.get(url)
+        update_service(psychologist, 3000)
+        assert guest_client.get(url).data["price"] == 3000
+
+        psychologist.themes.add(themes[0])
+        assert len(guest_client.get(url).data["themes"]) == 1
+
+        psychologist.about = "Новое описание"
+        psychologist.save()
+        assert guest_client.get(url).data["about"] == "Новое описание"
+
+        last_slot = psychologist.slots.last()
+        psychologist.slots.create(
+            datetime_from=last_slot.datetime_from + timedelta(hours=2)
+        )
+        assert len(guest_client.get(url).data["slots"]) == 4
+
+    def test_04_not_found(self, guest_client, psychologist):
+        """Карточка несуществующего психолога - 404."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.user.id})
+        assert guest_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_title_invalidation(self, guest_client, psychologist, themes):
+        """Переименование и удаление темы сбрасывают кэш карточки."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        psychologist.themes.add(themes[0], themes[1])
+        guest_client.get(url)
+
+        themes[0].title = "Новое название"
+        themes[0].save()
+        titles = guest_client.get(url).data["themes"]
+        assert "Новое название" in str(titles)
+
+        themes[1].delete()
+        assert len(guest_client.get(url).data["themes"]) == 1
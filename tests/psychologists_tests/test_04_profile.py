@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+from apps.core.models import UploadFile
+from apps.psychologists.models import ProfilePsychologist
+from apps.psychologists.selectors import get_education
+
+
+def count_education_queries(queries):
+    return sum(
+        '"psychologists_psychoeducation"' in query["sql"] for query in queries
+    )
+
+
+@pytest.mark.django_db()
+class Test04Profile:
+    profile_url = reverse("profile_psychologist")
+
+    def test_01_profile_education_single_query(
+        self, psycho_client, education
+    ):
+        """ЛК психолога загружает образование одним запросом."""
+        with CaptureQueriesContext(connection) as context:
+            response = psycho_client.get(self.profile_url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data["institutes"]) == 2
+        assert len(response.data["courses"]) == 1
+        assert response.data["courses"][0]["document"].startswith("http")
+        assert count_education_queries(context.captured_queries) == 1
+
+    def test_02_card_education_single_query(
+        self, guest_client, psychologist, education
+    ):
+        """Карточка психолога загружает образование одним запросом."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        with CaptureQueriesContext(connection) as context:
+            response = guest_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert [item["title"] for item in response.data["courses"]] == [
+            "Институт 2"
+        ]
+        assert len(response.data["institutes"]) == 2
+        assert count_education_queries(context.captured_queries) == 1
+
+    def test_03_education_without_prefetch(self, psychologist, education):
+        """Без prefetch образование с институтами - одним запросом."""
+        profile = ProfilePsychologist.objects.get(pk=psychologist.pk)
+        with CaptureQueriesContext(connection) as context:
+            institutes = get_education(profile, True)
+        assert len(institutes) == 2
+        assert len(context.captured_queries) == 1
+
+    def test_04_update_keeps_education(self, psycho_client, education):
+        """PATCH с уже добавленным образованием не считается конфликтом."""
+        institutes = [
+            {
+                "title": item.institute.title,
+                "speciality": item.speciality,
+                "graduation_year": item.graduation_year,
+                "document": str(item.document_id),
+            }
+            for item in education
+            if item.institute.is_higher
+        ]
+        document = UploadFile.objects.create(path="uploads/new.pdf")
+        institutes.append(
+            {
+                "title": "Новый институт",
+                "speciality": "Психолог",
+                "graduation_year": "2010",
+                "document": str(document.id),
+            }
+        )
+        response = psycho_client.patch(
+            self.profile_url, {"institutes": institutes}, format="json"
+        )
+        assert response.status_code == HTTPStatus.OK, response.data
+        assert len(response.data["institutes"]) == 3
+        assert education.all().count() == 4
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+from apps.psychologists.dictionaries import TitleDictionary
+from apps.psychologists.models import Institute, Theme
+
+
+@pytest.mark.django_db()
+class Test05Dictionaries:
+    themes_url = reverse("theme-list")
+
+    def test_01_list_without_queries(self, guest_client, themes):
+        """Повторный запрос справочника не обращается к БД."""
+        first = guest_client.get(self.themes_url)
+        with CaptureQueriesContext(connection) as context:
+            response = guest_client.get(self.themes_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == first.json()
+        assert len(response.json()) == len(themes)
+        assert not context.captured_queries
+
+    def test_02_etag(self, guest_client, themes):
+        """Неизмененный справочник - 304, после изменения - новый ETag."""
+        etag = guest_client.get(self.themes_url)["ETag"]
+        response = guest_client.get(self.themes_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        for header in (f'"other", W/{etag}', "*"):
+            response = guest_client.get(
+                self.themes_url, HTTP_IF_NONE_MATCH=header
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+        response = guest_client.get(
+            self.themes_url, HTTP_IF_NONE_MATCH=f"{etag[:-1]}0{etag[-1]}"
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        Theme.objects.create(title="Новая тема")
+        response = guest_client.get(self.themes_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"] != etag
+        assert "Новая тема" in [item["title"] for item in response.json()]
+
+    def test_03_filters(self, guest_client, themes):
+        """Фильтры справочников применяются к кэшу процесса."""
+        Institute.objects.create(title="Институт А", is_higher=True)
+        Institute.objects.create(title="Курсы А", is_higher=False)
+        response = guest_client.get(self.themes_url, {"title": "тема 1"})
+        assert [item["title"] for item in response.json()] == ["Тема 1"]
+        response = guest_client.get(
+            reverse("institute-list"), {"is_higher": "false"}
+        )
+        assert [item["title"] for item in response.json()] == ["Курсы А"]
+
+    def test_04_other_process(self, themes):
+        """Изменение в другом процессе видно по версии в общем кэше."""
+        local, other = TitleDictionary(Theme), TitleDictionary(Theme)
+        assert len(local.load()) == len(themes)
+        Theme.objects.filter(pk=themes[0].pk).update(title="Переименована")
+        other.invalidate()
+        assert "Переименована" in local.load()
+
+    def test_05_profile_themes_without_queries(self, psycho_client, themes):
+        """Темы профиля находятся по справочнику без запросов к темам."""
+        titles = [theme.title for theme in themes[:2]]
+        psycho_client.get(self.themes_url)
+        with CaptureQueriesContext(connection) as context:
+            response = psycho_client.patch(
+                reverse("profile_psychologist"),
+                {"themes": [{"title": title} for title in titles]},
+                format="json",
+            )
+        assert response.status_code == HTTPStatus.OK, response.data
+        assert not any(
+            'WHERE "psychologists_theme"."title"' in query["sql"]
+            for query in context.captured_queries
+        ), "Темы не должны искаться по названию в БД."
+
+    def test_06_lost_invalidation(self, guest_client, psycho_client, themes):
+        """
+        Название, которого нет в памяти процесса (версия не дошла),
+        находится по БД, а не отбрасывается.
+        """
+        guest_client.get(self.themes_url)
+        Theme.objects.bulk_create([Theme(title="Новая тема")])
+
+        response = guest_client.get(
+            reverse("catalog"), {"themes": ["Новая тема"]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = guest_client.get(reverse("catalog"), {"themes": ["Нет"]})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        Theme.objects.bulk_create([Theme(title="Еще тема")])
+        response = psycho_client.patch(
+            reverse("profile_psychologist"),
+            {"themes": [{"title": "Еще тема"}]},
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.OK, response.data
+        titles = [theme["title"] for theme in response.data["themes"]]
+        assert titles == ["Еще тема"]
+
+    def test_07_unknown_title_no_reload(self, guest_client, themes):
+        """Неизвестное название не перечитывает справочник целиком."""
+        guest_client.get(self.themes_url)
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = guest_client.get(
+                    reverse("catalog"), {"themes": ["Нет"]}
+                )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            queries = [
+                query["sql"]
+                for query in context.captured_queries
+                if '"psychologists_theme"' in query["sql"]
+            ]
+            assert len(queries) == 1
+            assert '"title" IN' in queries[0]
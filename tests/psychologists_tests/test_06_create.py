@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+from apps.core.models import UploadFile
+from apps.psychologists.models import (
+    Approach,
+    Institute,
+    ProfilePsychologist,
+    PsychoEducation,
+)
+
+
+def get_education(number, size, prefix):
+    return [
+        {
+            "title": f"{prefix} {number}-{i}",
+            "speciality": "Психолог",
+            "graduation_year": "2005",
+            "document": str(
+                UploadFile.objects.create(path=f"uploads/{number}-{i}.pdf").id
+            ),
+        }
+        for i in range(size)
+    ]
+
+
+def get_payload(number, size):
+    return {
+        "email": f"new_psycho_{number}@unexistingmail.ru",
+        "first_name": "Психолог",
+        "last_name": "Новый",
+        "birthday": "01.01.1980",
+        "gender": "female",
+        "experience": 10,
+        "about": "О себе",
+        "price": 2000,
+        "themes": [],
+        "approaches": [
+            {"title": f"Подход {number}-{i}"} for i in range(size)
+        ],
+        "institutes": get_education(number, size, "Институт"),
+        "courses": get_education(number + 100, size, "Курсы"),
+    }
+
+
+@pytest.mark.django_db()
+class Test06Create:
+    create_url = reverse("create_psychologist")
+
+    def create(self, client, payload):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.create_url, payload, format="json")
+        assert response.status_code == HTTPStatus.CREATED, response.data
+        return len(context.captured_queries)
+
+    def test_01_constant_queries(self, guest_client):
+        """Число запросов создания профиля не зависит от размера анкеты."""
+        # первая анкета загружает справочники в память процесса
+        self.create(guest_client, get_payload(0, 1))
+        small = self.create(guest_client, get_payload(1, 1))
+        large = self.create(guest_client, get_payload(2, 6))
+        assert small == large
+        psychologist = ProfilePsychologist.objects.get(
+            user__email="new_psycho_2@unexistingmail.ru"
+        )
+        assert psychologist.approaches.count() == 6
+        assert psychologist.psychoeducation.count() == 12
+        assert Institute.objects.filter(is_higher=False).count() == 8
+
+    def test_02_existing_titles(self, guest_client):
+        """Существующие подходы и институты не создаются повторно."""
+        self.create(guest_client, get_payload(1, 2))
+        payload = get_payload(1, 2)
+        payload["email"] = "other_psycho@unexistingmail.ru"
+        self.create(guest_client, payload)
+        assert Approach.objects.count() == 2
+        assert Institute.objects.count() == 4
+        assert PsychoEducation.objects.count() == 8
+
+    def test_03_used_document(self, guest_client):
+        """Документ чужого образования не принимается."""
+        payload = get_payload(1, 1)
+        self.create(guest_client, payload)
+        payload["email"] = "other_psycho@unexistingmail.ru"
+        response = guest_client.post(self.create_url, payload, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "принадлежит другому" in response.data["document"]
+        assert not ProfilePsychologist.objects.filter(
+            user__email="other_psycho@unexistingmail.ru"
+        ).exists()
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APIRequestFactory
+
+from apps.api.v1.views.psychologist_async import (
+    AsyncFreeSlotsView,
+    AsyncPsychoCardCatalogView,
+    AsyncPsychoListCatalogView,
+    AsyncThemeViewSet,
+)
+
+
+def call(view, url, params=None, **kwargs):
+    """Асинхронное представление, вызванное как под ASGI."""
+    request = APIRequestFactory().get(url, params)
+    return async_to_sync(view)(request, **kwargs)
+
+
+# запросы идут из других потоков: данные теста должны быть зафиксированы
+@pytest.mark.django_db(transaction=True)
+class Test07Async:
+    def test_01_catalog(self, guest_client, psychologists):
+        """Асинхронный каталог совпадает с синхронным."""
+        url = reverse("catalog")
+        response = call(AsyncPsychoListCatalogView.as_view(), url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data == guest_client.get(url).data
+        results = response.data["results"]
+        assert all(len(item["slots"]) == 3 for item in results)
+
+    def test_02_card(self, guest_client, psychologist, education):
+        """Асинхронная карточка совпадает с синхронной, и из кэша тоже."""
+        url = reverse("psycho_card", kwargs={"id": psychologist.id})
+        view = AsyncPsychoCardCatalogView.as_view()
+        response = call(view, url, id=psychologist.id)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data["institutes"]) == 2
+        assert len(response.data["slots"]) == 3
+        assert response.data == guest_client.get(url).data
+        assert call(view, url, id=psychologist.id).data == response.data
+
+        missing = call(view, url, id=uuid4())
+        assert missing.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_free_slots(self, guest_client, psychologist):
+        """Свободные слоты: те же данные, неизвестный психолог - 404."""
+        url = reverse("free_slots", kwargs={"id": psychologist.id})
+        params = {"since": timezone.localdate().strftime("%d.%m.%Y")}
+        view = AsyncFreeSlotsView.as_view()
+        response = call(view, url, params, id=psychologist.id)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data) == 3
+        assert response.data == guest_client.get(url, params).data
+        assert call(view, url, params, id=uuid4()).status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        assert call(view, url, id=psychologist.id).status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+
+    def test_04_dictionary(self, themes):
+        """Справочник через асинхронный dispatch, ETag сохраняется."""
+        view = AsyncThemeViewSet.as_view({"get": "list"})
+        url = reverse("theme-list")
+        response = call(view, url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data) == len(themes)
+        request = APIRequestFactory().get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert async_to_sync(view)(request).status_code == (
+            HTTPStatus.NOT_MODIFIED
+        )
@@ -0,0 +1,13 @@
+import pytest
+
+from apps.session import jobs
+
+
+@pytest.fixture
+def zoom_stub(monkeypatch):
+    """Ссылки Zoom без сети."""
+    monkeypatch.setattr(
+        jobs,
+        "create_meeting",
+        lambda start_time: ("https://zoom/client", "https://zoom/psycho"),
+    )
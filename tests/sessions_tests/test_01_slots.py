@@ -0,0 +1,95 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from apps.session.models import Slot
+
+DATETIME_FORMAT = "%d.%m.%Y %H:%M"
+
+
+@pytest.mark.django_db()
+class Test01BulkSlots:
+    bulk_url = reverse("bulk_create_slots")
+
+    def test_01_bulk_datetimes(self, psycho_client, psychologist):
+        """Пачка слотов создается с ошибками по отдельным окнам."""
+        start = timezone.now().replace(second=0, microsecond=0)
+        start += timedelta(days=10)
+        datetimes = [start + timedelta(hours=2 * i) for i in range(200)]
+        datetimes.append(start + timedelta(minutes=30))
+        datetimes.append(start - timedelta(days=20))
+        data = {"datetimes": [d.strftime(DATETIME_FORMAT) for d in datetimes]}
+        with CaptureQueriesContext(connection) as context:
+            response = psycho_client.post(self.bulk_url, data, format="json")
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.data["created"]) == 200
+        assert len(response.data["errors"]) == 2
+        inserts = [
+            query for query in context.captured_queries
+            if query["sql"].startswith('INSERT INTO "session_slot"')
+        ]
+        fields = [
+            field for field in Slot._meta.concrete_fields
+            if not field.primary_key
+        ]
+        batch_size = connection.ops.bulk_batch_size(fields, datetimes)
+        batches = -(-200 // batch_size)
+        assert len(inserts) == batches, (
+            "Слоты должны создаваться пачками INSERT, а не по одному."
+        )
+        slot = Slot.objects.get(datetime_from=start)
+        assert slot.datetime_to == start + timedelta(minutes=50)
+
+    def test_02_bulk_rule(self, psycho_client, psychologist):
+        """Слоты создаются по недельному правилу."""
+        since = timezone.localdate() + timedelta(days=1)
+        response = psycho_client.post(
+            self.bulk_url,
+            {
+                "rule": {
+                    "since": since.strftime("%d.%m.%Y"),
+                    "until": (since + timedelta(days=27)).strftime("%d.%m.%Y"),
+                    "weekdays": [0, 2, 4],
+                    "times": ["10:00", "12:00", "18:30"],
+                }
+            },
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.data["created"]) == 4 * 3 * 3
+        assert response.data["errors"] == []
+
+    def test_03_bulk_rule_timezone(self, psycho_client, psychologist):
+        """Время правила - в переданном часовом поясе."""
+        since = timezone.localdate() + timedelta(days=1)
+        rule = {
+            "since": since.strftime("%d.%m.%Y"),
+            "until": since.strftime("%d.%m.%Y"),
+            "weekdays": list(range(7)),
+            "times": ["10:00"],
+            "tz": "Europe/Moscow",
+        }
+        response = psycho_client.post(
+            self.bulk_url, {"rule": rule}, format="json"
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        slot = Slot.objects.get(pk=response.data["created"][0]["id"])
+        assert slot.datetime_from.hour == 7, "10:00 МСК - 07:00 UTC"
+
+        rule["tz"] = "Марс/Олимп"
+        response = psycho_client.post(
+            self.bulk_url, {"rule": rule}, format="json"
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_invalid(self, psycho_client, client_client):
+        """Пустой запрос - ошибка, клиент не может создавать слоты."""
+        response = psycho_client.post(self.bulk_url, {}, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client_client.post(self.bulk_url, {}, format="json")
+        assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from apps.session.models import Session, Slot
+
+
+@pytest.fixture
+def template_day(psycho_client):
+    """Шаблон на день недели через 3 дня, 10:00 - 11:00 без окон в БД."""
+    day = timezone.localdate() + timedelta(days=3)
+    response = psycho_client.post(
+        reverse("add_and_list_psycho_templates"),
+        {
+            "weekday": day.weekday(),
+            "time_from": "10:00",
+            "valid_from": timezone.localdate().strftime("%d.%m.%Y"),
+        },
+        format="json",
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return day
+
+
+@pytest.mark.django_db()
+class Test02Templates:
+    def test_01_template_slots_in_free_slots(
+        self, guest_client, psychologist, template_day
+    ):
+        """Слоты по шаблону отдаются без создания строк в БД."""
+        slots_count = Slot.objects.count()
+        url = reverse("free_slots", kwargs={"id": psychologist.id})
+        response = guest_client.get(
+            url, {"since": timezone.localdate().strftime("%d.%m.%Y")}
+        )
+        assert response.status_code == HTTPStatus.OK
+        virtual = [slot for slot in response.data if slot["id"] is None]
+        assert len(virtual) == 2, "За 14 дней должно быть 2 слота по шаблону."
+        assert Slot.objects.count() == slots_count
+
+        card = guest_client.get(
+            reverse("psycho_card", kwargs={"id": psychologist.id})
+        )
+        assert sum(slot["id"] is None for slot in card.data["slots"]) == 1
+
+    def test_02_book_and_cancel_template_slot(
+        self, client_client, psychologist, template_day, zoom_stub
+    ):
+        """Слот по шаблону сохраняется при записи и удаляется при отмене."""
+        start = timezone.now().replace(
+            year=template_day.year,
+            month=template_day.month,
+            day=template_day.day,
+            hour=10,
+            minute=0,
+            second=0,
+            microsecond=0,
+        )
+        response = client_client.post(
+            reverse("create_session"),
+            {
+                "psychologist": str(psychologist.id),
+                "datetime_from": start.strftime("%d.%m.%Y %H:%M"),
+            },
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.data
+        slot = Slot.objects.get(pk=response.data["slot"])
+        assert slot.template_id is not None
+        assert not slot.is_free
+
+        response = client_client.delete(
+            reverse("cancel_session", kwargs={"pk": response.data["id"]})
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Slot.objects.filter(pk=slot.pk).exists()
+        assert not Session.objects.exists()
+        assert len(mail.outbox) == 4, "Письма о записи и отмене участникам."
+
+    def test_03_unknown_template_time(
+        self, client_client, psychologist, template_day
+    ):
+        """Запись на время вне шаблона - ошибка валидации."""
+        response = client_client.post(
+            reverse("create_session"),
+            {
+                "psychologist": str(psychologist.id),
+                "datetime_from": template_day.strftime("%d.%m.%Y 11:00"),
+            },
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_template_overlaps(
+        self, psycho_client, psychologist, template_day
+    ):
+        """Шаблон не может пересекаться с шаблонами и окнами из БД."""
+        url = reverse("add_and_list_psycho_templates")
+        data = {
+            "weekday": template_day.weekday(),
+            "time_from": "10:30",
+            "valid_from": timezone.localdate().strftime("%d.%m.%Y"),
+        }
+        response = psycho_client.post(url, data, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        data["time_from"] = "11:00"
+        response = psycho_client.post(url, data, format="json")
+        assert response.status_code == HTTPStatus.CREATED
+
+        slot = timezone.localtime(psychologist.slots.first().datetime_from)
+        data["weekday"] = slot.weekday()
+        data["time_from"] = slot.strftime("%H:%M")
+        response = psycho_client.post(url, data, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
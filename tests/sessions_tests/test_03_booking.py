@@ -0,0 +1,98 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.clients.models import Client
+from apps.session.models import Session
+
+THREADS = 8
+
+
+def create_clients(django_user_model, number):
+    clients = []
+    for index in range(number):
+        user = django_user_model.objects.create_user(
+            email=f"booking_{index}@unexistingmail.ru",
+            password="zz11xx22cc33",
+        )
+        Client.objects.create(
+            user=user, first_name="Клиент", birthday="1980-01-01"
+        )
+        api_client = APIClient()
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(user)}"
+        )
+        clients.append(api_client)
+    return clients
+
+
+@pytest.mark.django_db(transaction=True)
+class Test03Booking:
+    url = reverse("create_session")
+
+    def test_01_concurrent_booking(
+        self, django_user_model, psychologist, zoom_stub
+    ):
+        """Один слот из многих потоков: одна сессия, остальным - 409."""
+        slot = psychologist.slots.first()
+        clients = create_clients(django_user_model, THREADS)
+        barrier = threading.Barrier(THREADS)
+        statuses = []
+
+        def book(api_client):
+            try:
+                barrier.wait()
+                response = api_client.post(
+                    self.url, {"slot": slot.id}, format="json"
+                )
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=book, args=(api_client,))
+            for api_client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == sorted(
+            [HTTPStatus.CREATED] + [HTTPStatus.CONFLICT] * (THREADS - 1)
+        ), f"Неверные ответы при параллельной записи: {statuses}."
+        assert Session.objects.filter(slot=slot).count() == 1
+
+    def test_02_idempotency_key(
+        self, django_user_model, psychologist, zoom_stub
+    ):
+        """Повтор запроса с тем же ключом возвращает ту же сессию."""
+        slot = psychologist.slots.first()
+        api_client = create_clients(django_user_model, 1)[0]
+        responses = [
+            api_client.post(
+                self.url,
+                {"slot": slot.id},
+                format="json",
+                HTTP_IDEMPOTENCY_KEY="booking-1",
+            )
+            for _ in range(2)
+        ]
+        assert [r.status_code for r in responses] == [HTTPStatus.CREATED] * 2
+        assert responses[0].data == responses[1].data
+        assert Session.objects.count() == 1
+
+        other = psychologist.slots.exclude(pk=slot.pk).first()
+        response = api_client.post(
+            self.url,
+            {"slot": other.id},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="booking-1",
+        )
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert Session.objects.count() == 1
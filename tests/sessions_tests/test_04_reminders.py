@@ -0,0 +1,74 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from apps.core.jobs import claim_jobs, get_job_name, run_job
+from apps.core.models import Job
+from apps.session.models import Session
+from apps.session.jobs import send_session_reminder
+
+
+@pytest.mark.django_db
+class Test04Reminders:
+    def book(self, client_client, slot):
+        response = client_client.post(
+            reverse("create_session"), {"slot": slot.id}, format="json"
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.data
+        mail.outbox.clear()
+        return response.data["id"]
+
+    def run_due_jobs(self):
+        Job.objects.update(run_at=timezone.now())
+        for job in claim_jobs(10):
+            run_job(job)
+
+    def test_01_schedule(self, client_client, psychologist, zoom_stub,
+                         settings):
+        """Напоминания в будущем ставятся в очередь, прошедшие - нет."""
+        settings.SESSION_REMINDER_OFFSETS = [24, 3, 1]
+        slot = psychologist.slots.last()
+        self.book(client_client, slot)
+        run_at = sorted(
+            Job.objects.filter(
+                name=get_job_name(send_session_reminder)
+            ).values_list("run_at", flat=True)
+        )
+        assert run_at == [
+            slot.datetime_from - timedelta(hours=3),
+            slot.datetime_from - timedelta(hours=1),
+        ]
+
+    def test_02_send(self, client_client, psychologist, zoom_stub):
+        """Напоминание получают оба участника, клиент - со ссылкой Zoom."""
+        self.book(client_client, psychologist.slots.first())
+        self.run_due_jobs()
+        assert len(mail.outbox) == 2
+        client_message, psycho_message = mail.outbox
+        assert psycho_message.to == [psychologist.user.email]
+        assert "https://zoom/client" in client_message.body
+        assert "https://zoom/psycho" in psycho_message.body
+        assert not Job.objects.exclude(status=Job.Status.DONE).exists()
+
+    def test_03_cancelled(self, client_client, psychologist, zoom_stub):
+        """После отмены сессии напоминание не отправляется."""
+        session_id = self.book(client_client, psychologist.slots.first())
+        client_client.delete(
+            reverse("cancel_session", kwargs={"pk": session_id})
+        )
+        mail.outbox.clear()
+        self.run_due_jobs()
+        assert mail.outbox == []
+
+    def test_04_stale(self, client_client, psychologist, zoom_stub):
+        """Напоминание, задержанное до начала сессии, не отправляется."""
+        session_id = self.book(client_client, psychologist.slots.first())
+        Session.objects.filter(pk=session_id).update(
+            datetime_from=timezone.now() - timedelta(minutes=5)
+        )
+        self.run_due_jobs()
+        assert mail.outbox == []
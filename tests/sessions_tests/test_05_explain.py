@@ -0,0 +1,11 @@
+import pytest
+from django.core.management import call_command
+
+from apps.session.models import Slot
+
+
+@pytest.mark.django_db
+def test_explain_slot_queries():
+    """Запросы слотов идут по индексам; данные замера откатываются."""
+    call_command("explain_slot_queries", "--psychologists=30", "--slots=40")
+    assert not Slot.objects.exists()
@@ -6,3 +6,14 @@ from rest_framework.test import APIClient
 @pytest.fixture
 def guest_client():
     return APIClient()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Файловый кэш вместо кэша процесса: утверждения токена в работе."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
@@ -0,0 +1,144 @@
+from http import HTTPStatus
+from time import time
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import PROFILE_CLAIM, revoke_user_tokens
+from apps.users.models import CustomUser
+
+from .utils import get_client, login
+
+USER_TABLES = ("users_customuser", "psychologists_profilepsychologist")
+
+
+def freeze_revocation():
+    """Отзыв на минуту позже: токены теста выданы до него."""
+    return patch(
+        "apps.users.authentication.time.time", return_value=time() + 60
+    )
+
+
+def get_slots(client):
+    since = timezone.localdate().strftime("%d.%m.%Y")
+    return client.get(reverse("add_and_list_psycho_slots"), {"since": since})
+
+
+def get_user_queries(context):
+    """Запросы к таблицам пользователя и профиля психолога."""
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if any(table in query["sql"] for table in USER_TABLES)
+    ]
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("shared_cache")
+class Test01Tokens:
+    def test_01_claims(self, psychologist):
+        """Роль и профиль в токене: слоты ЛК без чтения пользователя."""
+        tokens = login(psychologist.user.email)
+        client = get_client(tokens["access"])
+        with CaptureQueriesContext(connection) as context:
+            response = get_slots(client)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data) == 3
+        assert get_user_queries(context) == []
+
+    def test_02_role_from_claims(self, client_user, psychologist):
+        """Права проверяются по роли из токена."""
+        tokens = login(client_user.email)
+        response = get_slots(get_client(tokens["access"]))
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_token_without_claims(self, psycho_client):
+        """Токены без утверждений проверяются по БД."""
+        response = get_slots(psycho_client)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data) == 3
+
+    def test_04_refresh_keeps_claims(self, psychologist):
+        tokens = login(psychologist.user.email)
+        response = APIClient().post(
+            reverse("jwt-refresh"), {"refresh": tokens["refresh"]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.data["access"])
+        assert token[PROFILE_CLAIM] == str(psychologist.pk)
+        assert token["is_psychologists"] is True
+
+    def test_05_password_change_revokes(
+        self, psychologist, django_capture_on_commit_callbacks
+    ):
+        """Смена пароля отзывает выданные токены, включая refresh."""
+        tokens = login(psychologist.user.email)
+        user = psychologist.user
+        user.set_password("new_password_123")
+        with freeze_revocation(), django_capture_on_commit_callbacks(
+            execute=True
+        ):
+            user.save()
+
+        response = get_slots(get_client(tokens["access"]))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = APIClient().post(
+            reverse("jwt-refresh"), {"refresh": tokens["refresh"]}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_06_other_changes_keep_tokens(
+        self, psychologist, django_capture_on_commit_callbacks
+    ):
+        tokens = login(psychologist.user.email)
+        user = psychologist.user
+        user.email = "renamed@unexistingmail.ru"
+        with freeze_revocation(), django_capture_on_commit_callbacks(
+            execute=True
+        ):
+            user.save()
+        response = get_slots(get_client(tokens["access"]))
+        assert response.status_code == HTTPStatus.OK
+
+    def test_07_revoke_legacy_token(self, psychologist, psycho_client):
+        with freeze_revocation():
+            revoke_user_tokens(psychologist.user.pk)
+        response = get_slots(psycho_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_08_process_cache(self, psychologist, settings):
+        """С кэшем процесса пользователь токена читается из БД."""
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            }
+        }
+        tokens = login(psychologist.user.email)
+        client = get_client(tokens["access"])
+        with CaptureQueriesContext(connection) as context:
+            response = get_slots(client)
+        assert response.status_code == HTTPStatus.OK
+        assert get_user_queries(context)
+
+        CustomUser.objects.filter(pk=psychologist.user.pk).update(
+            is_active=False
+        )
+        response = get_slots(client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_09_refresh_inactive(self, psychologist):
+        """update() не отзывает токены, но refresh проверяет пользователя."""
+        tokens = login(psychologist.user.email)
+        CustomUser.objects.filter(pk=psychologist.user.pk).update(
+            is_active=False
+        )
+        response = APIClient().post(
+            reverse("jwt-refresh"), {"refresh": tokens["refresh"]}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
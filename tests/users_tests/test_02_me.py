@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+
+from .utils import get_client, login
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("shared_cache")
+class Test02Me:
+    me_url = reverse("users-me")
+
+    def get_me(self, client, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.me_url, **headers)
+        return response, len(context.captured_queries)
+
+    def test_01_one_query(self, psychologist):
+        """Пользователь с профилем - один запрос, повтор - из кэша."""
+        client = get_client(login(psychologist.user.email)["access"])
+        response, queries = self.get_me(client)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data == {
+            "name": psychologist.first_name,
+            "is_psychologists": True,
+            "is_client": False,
+            "email": psychologist.user.email,
+        }
+        assert queries == 1
+
+        cached, queries = self.get_me(client)
+        assert cached.data == response.data
+        assert cached["ETag"] == response["ETag"]
+        assert queries == 0
+
+    def test_02_not_modified(self, client_user):
+        client = get_client(login(client_user.email)["access"])
+        response, _ = self.get_me(client)
+        etag = response["ETag"]
+
+        response, queries = self.get_me(client, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+        assert queries == 0
+
+        for header in (f'"stale", W/{etag}', "*"):
+            response, _ = self.get_me(client, HTTP_IF_NONE_MATCH=header)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        for header in ('"stale"', etag.strip('"'), f'"x{etag[1:]}'):
+            response, _ = self.get_me(client, HTTP_IF_NONE_MATCH=header)
+            assert response.status_code == HTTPStatus.OK
+
+    def test_03_profile_change(self, client_user):
+        """Изменение профиля сбрасывает кэш и меняет ETag."""
+        client = get_client(login(client_user.email)["access"])
+        response, _ = self.get_me(client)
+        etag = response["ETag"]
+
+        profile = client_user.client
+        profile.first_name = "Иван"
+        profile.save()
+        response, _ = self.get_me(client, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["name"] == "Иван"
+        assert response["ETag"] != etag
+
+    def test_04_guest(self, guest_client):
+        response = guest_client.get(self.me_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
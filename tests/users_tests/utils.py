@@ -0,0 +1,20 @@
+from http import HTTPStatus
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+PASSWORD = "zz11xx22cc33"
+
+
+def login(email, password=PASSWORD):
+    response = APIClient().post(
+        reverse("jwt-create"), {"email": email, "password": password}
+    )
+    assert response.status_code == HTTPStatus.OK
+    return response.data
+
+
+def get_client(access):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"JWT {access}")
+    return client